@@ -0,0 +1,175 @@
+"""Measure what yielding to the event loop costs `Lox.run_async`, and what it buys.
+
+First runs one loop-heavy script with the plain interpreter and with the async one at several
+yield intervals. Then runs several scripts concurrently on one event loop next to a task which
+wakes up every millisecond, reporting how late it woke up and how often the scripts' output
+switched between scripts, with the blocking `Lox.run` and with `Lox.run_async`. Before any of
+that, checks that two scripts run concurrently by one `Lox` take turns printing, share its global
+variables and keep their local ones apart. Run from the repository root with
+``python -m benchmarks.bench_async``.
+"""
+import asyncio
+import statistics
+import time
+
+import click
+
+from pylox.aio import AsyncInterpreter
+from pylox.exceptions import ExceptionList
+from pylox.interpreter import Interpreter
+from pylox.lexer import RegexLexer
+from pylox.lox import Lox
+from pylox.output import ListOutput, Output
+from pylox.parser import Parser
+from pylox.resolver import Resolver
+
+SOURCE = """\
+var total = 0;
+for (var i = 0; i < {n}; i = i + 1) {{
+    if (i > 10) total = total + i; else total = total - 1;
+    if (i - i / 1000 * 1000 == 0) print i;
+}}
+"""
+# yield intervals, in statements, and `None` for never yielding
+INTERVALS = (1, 10, 100, 1000, None)
+
+# run twice at once, counting in a global, and in local variables both scripts name alike
+SHARED = """\
+{{
+    var name = "{name}";
+    var total = 0;
+    for (var i = 0; i < {n}; i = i + 1) {{
+        var step = i * {scale};
+        total = total + step;
+        counter = counter + 1;
+        print name;
+    }}
+    print total;
+}}
+"""
+
+
+def parse(source: str) -> list:
+    exception_list = ExceptionList([])
+    stmts = Parser(RegexLexer(source, exception_list).scan(), exception_list).parse()
+    Resolver().resolve(stmts)
+    exception_list.raise_if_not_empty()
+    return stmts
+
+
+def measure_sync(source: str) -> float:
+    interpreter = Interpreter(ExceptionList([]), ListOutput())
+    stmts = parse(source)
+    start = time.perf_counter()
+    interpreter.interpret(stmts)
+    return time.perf_counter() - start
+
+
+def measure_async(source: str, yield_every: int | None) -> float:
+    # only yielding by statement count, so runs are comparable
+    interpreter = AsyncInterpreter(
+        ExceptionList([]), ListOutput(), yield_every or 2**62, time_slice=float("inf")
+    )
+    stmts = parse(source)
+    start = time.perf_counter()
+    asyncio.run(interpreter.interpret(stmts))
+    return time.perf_counter() - start
+
+
+class RecordingOutput(Output):
+    """Record which script printed each line, in order."""
+
+    def __init__(self, name: str, order: list[str]):
+        self.name = name
+        self.order = order
+
+    def write(self, value: object):
+        self.order.append(self.name)
+
+
+async def heartbeat(lags: list[float], done: asyncio.Event):
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - start - 0.001)
+
+
+async def run_concurrently(source: str, scripts: int, cooperative: bool) -> tuple[list, list]:
+    lags: list[float] = []
+    order: list[str] = []
+    done = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, done))
+    await asyncio.sleep(0)
+
+    async def run(name: str):
+        lox = Lox(output=RecordingOutput(name, order))
+        if cooperative:
+            await lox.run_async(source)
+        else:
+            lox.run(source)
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(run(str(i)) for i in range(scripts)))
+    done.set()
+    await beat
+    return lags, order
+
+
+def check_concurrent(iterations: int):
+    """Run two scripts at once on one `Lox`, checking what they print."""
+    lox = Lox(output=ListOutput())
+
+    async def run():
+        await lox.run_async("var counter = 0;")
+        await asyncio.gather(
+            lox.run_async(SHARED.format(name="a", n=iterations, scale=1), yield_every=1),
+            lox.run_async(SHARED.format(name="b", n=iterations, scale=2), yield_every=3),
+        )
+        await lox.run_async("print counter;")
+
+    asyncio.run(run())
+    assert not lox.exception_list, [str(e) for e in lox.exception_list]
+    *lines, counter = lox.output.lines
+    names = [line for line in lines if line in ("a", "b")]
+    totals = sorted(float(line) for line in lines if line not in ("a", "b"))
+    # each script sees only its own locals, so prints its own name and total
+    assert names.count("a") == names.count("b") == iterations, names
+    expected = iterations * (iterations - 1) // 2
+    assert totals == [expected, 2 * expected], totals
+    assert float(counter) == 2 * iterations, counter
+    switches = sum(a != b for a, b in zip(names, names[1:]))
+    assert switches > iterations // 2, f"output switched scripts only {switches} times"
+    click.echo(f"run_async, 2 scripts on one Lox: output switched scripts {switches} times")
+
+
+@click.command()
+@click.option("--iterations", default=50_000, show_default=True, help="Loop iterations.")
+@click.option("--scripts", default=4, show_default=True, help="Scripts run concurrently.")
+def main(iterations: int, scripts: int) -> None:
+    check_concurrent(1000)
+    source = SOURCE.format(n=iterations)
+
+    baseline = measure_sync(source)
+    click.echo(f"{'Interpreter':>34}: {baseline:.3f}s")
+    for interval in INTERVALS:
+        elapsed = measure_async(source, interval)
+        label = "never yielding" if interval is None else f"yield every {interval}"
+        click.echo(
+            f"{f'AsyncInterpreter, {label}':>34}: {elapsed:.3f}s ({elapsed / baseline:.2f}x)"
+        )
+
+    for cooperative in (False, True):
+        start = time.perf_counter()
+        lags, order = asyncio.run(run_concurrently(source, scripts, cooperative))
+        elapsed = time.perf_counter() - start
+        switches = sum(a != b for a, b in zip(order, order[1:]))
+        lags.sort()
+        click.echo(
+            f"{'run_async' if cooperative else 'run':>9}, {scripts} scripts: {elapsed:.3f}s, "
+            f"heartbeat lag median {statistics.median(lags) * 1000:.2f}ms, "
+            f"max {lags[-1] * 1000:.2f}ms, output switched scripts {switches} times"
+        )
+
+
+if __name__ == "__main__":
+    main()
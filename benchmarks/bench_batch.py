@@ -0,0 +1,91 @@
+"""Compare ways of running many small independent scripts, and how `Lox.run_many` scales.
+
+Runs a batch of generated scripts serially in one process and with `Lox.run_many` over a growing
+number of workers, and estimates starting ``pylox`` once per script from a sample. Speedup from
+more workers is bounded by the number of CPUs. Run from the repository root with
+``python -m benchmarks.bench_batch``.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import click
+
+from pylox.batch import run_source
+from pylox.lox import Lox
+
+SCRIPT = """\
+var total = 0;
+for (var i = 0; i < {n}; i = i + 1) {{
+    if (i >= {k}) total = total + i * 2;
+}}
+print total;
+"""
+
+
+def generate(scripts: int, iterations: int) -> list[str]:
+    return [SCRIPT.format(n=iterations, k=k % iterations) for k in range(scripts)]
+
+
+def measure_processes(sources: list[str]) -> float:
+    """Seconds to run each source with its own ``pylox`` process."""
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i, source in enumerate(sources):
+            paths.append(os.path.join(directory, f"script{i}.lox"))
+            with open(paths[-1], "w") as f:
+                f.write(source)
+
+        start = time.perf_counter()
+        for path in paths:
+            subprocess.run(
+                [sys.executable, "-m", "pylox", "--no-cache", path], capture_output=True, check=True
+            )
+        return time.perf_counter() - start
+
+
+def measure_serial(sources: list[str]) -> float:
+    start = time.perf_counter()
+    for i, source in enumerate(sources):
+        run_source("tree", i, source)
+    return time.perf_counter() - start
+
+
+def measure_pool(sources: list[str], workers: int, chunksize: int) -> float:
+    start = time.perf_counter()
+    for _ in Lox.run_many(sources, workers=workers, chunksize=chunksize):
+        pass
+    return time.perf_counter() - start
+
+
+@click.command()
+@click.option("--scripts", default=2000, show_default=True, help="Scripts in the batch.")
+@click.option("--iterations", default=200, show_default=True, help="Loop iterations per script.")
+@click.option("--chunksize", default=16, show_default=True, help="Scripts per task.")
+@click.option("--sample", default=50, show_default=True, help="Scripts run as processes.")
+def main(scripts: int, iterations: int, chunksize: int, sample: int) -> None:
+    sources = generate(scripts, iterations)
+    cpus = os.cpu_count() or 1
+    click.echo(f"{scripts} scripts, {cpus} CPUs")
+
+    per_process = measure_processes(sources[:sample]) / min(sample, scripts) * scripts
+    serial = measure_serial(sources)
+    click.echo(f"{'process per script':>20}: {per_process:.3f}s (estimated from {sample})")
+    click.echo(f"{'serial':>20}: {serial:.3f}s ({per_process / serial:.2f}x)")
+
+    workers = 1
+    while True:
+        elapsed = measure_pool(sources, workers, chunksize)
+        click.echo(
+            f"{f'run_many, {workers} workers':>20}: {elapsed:.3f}s "
+            f"({per_process / elapsed:.2f}x, {serial / elapsed:.2f}x serial)"
+        )
+        if workers >= cpus:
+            break
+        workers = min(workers * 2, cpus)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Measure what checking a `Budget` costs a run, and how soon a runaway script is stopped.
+
+Runs a loop-heavy script with the plain interpreter and with budgets which are never exceeded,
+then runs ``while (true) {}`` with a timeout and reports how far past the deadline it stopped.
+Run from the repository root with ``python -m benchmarks.bench_budget``.
+"""
+import time
+
+import click
+
+from pylox.budget import Budget, BudgetInterpreter
+from pylox.exceptions import BudgetExceededError, ExceptionList
+from pylox.interpreter import Interpreter
+from pylox.lexer import RegexLexer
+from pylox.output import ListOutput
+from pylox.parser import Parser
+from pylox.resolver import Resolver
+
+SOURCE = """\
+var total = 0;
+for (var i = 0; i < {n}; i = i + 1) {{
+    if (i > 10) total = total + i; else total = total - 1;
+    var j = 0;
+    while (j < 3) j = j + 1;
+}}
+print total;
+"""
+BUDGETS = {
+    "statements": Budget(max_statements=2**62),
+    "timeout": Budget(timeout=3600.0),
+    "depth": Budget(max_depth=1000),
+    "all": Budget(2**62, 3600.0, 1000),
+}
+
+
+def parse(source: str) -> list:
+    exception_list = ExceptionList([])
+    stmts = Parser(RegexLexer(source, exception_list).scan(), exception_list).parse()
+    Resolver().resolve(stmts)
+    exception_list.raise_if_not_empty()
+    return stmts
+
+
+def measure(interpreters: dict[str, Interpreter], stmts: list, repeat: int) -> dict[str, float]:
+    """Best time of each interpreter, taking turns so they see the same load on the machine."""
+    best = dict.fromkeys(interpreters, float("inf"))
+    for _ in range(repeat):
+        for name, interpreter in interpreters.items():
+            start = time.perf_counter()
+            interpreter.interpret(stmts)
+            best[name] = min(best[name], time.perf_counter() - start)
+            interpreter.exception_list.raise_if_not_empty()
+    return best
+
+
+@click.command()
+@click.option("--iterations", default=20_000, show_default=True, help="Loop iterations.")
+@click.option("--repeat", default=5, show_default=True, help="Runs per interpreter, best kept.")
+@click.option("--timeout", default=0.05, show_default=True, help="Timeout of the runaway script.")
+def main(iterations: int, repeat: int, timeout: float) -> None:
+    stmts = parse(SOURCE.format(n=iterations))
+
+    interpreters = {"Interpreter": Interpreter(ExceptionList([]), ListOutput())}
+    for name, budget in BUDGETS.items():
+        interpreters[f"BudgetInterpreter, {name}"] = BudgetInterpreter(
+            ExceptionList([]), ListOutput(), budget
+        )
+    times = measure(interpreters, stmts, repeat)
+    baseline = times["Interpreter"]
+    for name, elapsed in times.items():
+        click.echo(f"{name:>30}: {elapsed:.3f}s ({(elapsed / baseline - 1) * 100:+.1f}%)")
+
+    exception_list = ExceptionList([])
+    interpreter = BudgetInterpreter(exception_list, ListOutput(), Budget(timeout=timeout))
+    start = time.perf_counter()
+    interpreter.interpret(parse("while (true) {}"))
+    elapsed = time.perf_counter() - start
+    assert isinstance(exception_list[0], BudgetExceededError)
+    click.echo(
+        f"{'while (true) {}':>30}: stopped after {elapsed * 1000:.2f}ms, "
+        f"{(elapsed - timeout) * 1000:.3f}ms past the timeout, {interpreter.statements} statements"
+    )
+
+
+if __name__ == "__main__":
+    main()
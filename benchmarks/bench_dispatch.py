@@ -0,0 +1,84 @@
+"""Measure visitor dispatch, in visits per second, over a large synthetic expression tree.
+
+Run from the repository root with ``python -m benchmarks.bench_dispatch``.
+"""
+import random
+import time
+
+import click
+
+from pylox.expr import BaseExpr, BinaryExpr, GroupingExpr, LiteralExpr, UnaryExpr
+from pylox.token import Token, TokenType
+from pylox.visitor import ASTPrinter
+
+PLUS = Token(TokenType.PLUS, "+", None, 1)
+MINUS = Token(TokenType.MINUS, "-", None, 1)
+
+
+def generate(depth: int) -> BaseExpr:
+    if depth == 0:
+        return LiteralExpr(float(random.randint(0, 9)))
+
+    match random.randint(0, 3):
+        case 0:
+            return UnaryExpr(MINUS, generate(depth - 1))
+        case 1:
+            return GroupingExpr(generate(depth - 1))
+        case _:
+            return BinaryExpr(generate(depth - 1), PLUS, generate(depth - 1))
+
+
+class Counter:
+    """Count nodes, dispatching through `BaseExpr.accept`."""
+
+    def count(self, expr: BaseExpr) -> int:
+        return expr.accept(self)
+
+    def visitBinaryExpr(self, expr: BinaryExpr) -> int:
+        return 1 + self.count(expr.left) + self.count(expr.right)
+
+    def visitGroupingExpr(self, expr: GroupingExpr) -> int:
+        return 1 + self.count(expr.expression)
+
+    def visitUnaryExpr(self, expr: UnaryExpr) -> int:
+        return 1 + self.count(expr.right)
+
+    def visitLiteralExpr(self, expr: LiteralExpr) -> int:
+        return 1
+
+
+class UncachedCounter(Counter):
+    """Count nodes, looking the visitor method up by name on every visit."""
+
+    def count(self, expr: BaseExpr) -> int:
+        return getattr(self, f"visit{expr.__class__.__name__}")(expr)
+
+
+def measure(visit, tree: BaseExpr, nodes: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        visit(tree)
+        best = min(best, time.perf_counter() - start)
+    return nodes / best
+
+
+@click.command()
+@click.option("--depth", default=28, show_default=True, help="Depth of the generated tree.")
+@click.option("--repeat", default=5, show_default=True, help="Runs per visitor, best is kept.")
+def main(depth: int, repeat: int) -> None:
+    random.seed(depth)
+    tree = generate(depth)
+    nodes = Counter().count(tree)
+    click.echo(f"tree: {nodes:,} nodes")
+
+    uncached = measure(UncachedCounter().count, tree, nodes, repeat)
+    cached = measure(Counter().count, tree, nodes, repeat)
+    printer = measure(ASTPrinter().print, tree, nodes, repeat)
+    click.echo(f"getattr per visit: {uncached:,.0f} visits/s")
+    click.echo(f"   cached dispatch: {cached:,.0f} visits/s ({cached / uncached:.2f}x)")
+    click.echo(f"        ASTPrinter: {printer:,.0f} visits/s")
+
+
+if __name__ == "__main__":
+    main()
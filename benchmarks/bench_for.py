@@ -0,0 +1,76 @@
+"""Compare for loops run as a `ForStmt` with the same loops desugared into blocks and a while loop.
+
+Before `ForStmt`, every iteration of a loop with an increment ran a block around the body and
+the increment. Run from the repository root with ``python -m benchmarks.bench_for``.
+"""
+import time
+
+import click
+
+from pylox.closure import ClosureInterpreter
+from pylox.exceptions import ExceptionList
+from pylox.interpreter import Interpreter
+from pylox.lexer import RegexLexer
+from pylox.parser import Parser
+from pylox.resolver import Resolver
+from pylox.stmt import BaseStmt, BlockStmt, ExpressionStmt, ForStmt, WhileStmt
+from pylox.transpiler import PythonInterpreter
+from pylox.vm import VM
+
+SOURCE = """\
+var count = 0;
+for (var i = 0; i < {n}; i = i + 1) count = count + 1;
+"""
+ENGINES = (Interpreter, ClosureInterpreter, VM, PythonInterpreter)
+
+
+def desugar(stmt: BaseStmt) -> BaseStmt:
+    """Rewrite a top-level `ForStmt` the way the parser used to.
+
+    The parser put the bare increment expression in the block, which only the tree-walking
+    engines could run, so it is wrapped in an `ExpressionStmt` here.
+    """
+    if not isinstance(stmt, ForStmt):
+        return stmt
+
+    body = stmt.body
+    if stmt.increment is not None:
+        body = BlockStmt([body, ExpressionStmt(stmt.increment)])
+    body = WhileStmt(stmt.condition, body)
+    if stmt.initializer is not None:
+        body = BlockStmt([stmt.initializer, body])
+    return body
+
+
+def measure(engine: type, source: str, desugared: bool) -> float:
+    exception_list = ExceptionList([])
+    stmts = Parser(RegexLexer(source, exception_list).scan(), exception_list).parse()
+    if desugared:
+        stmts = [desugar(stmt) for stmt in stmts]
+    Resolver().resolve(stmts)
+
+    interpreter = engine(exception_list)
+    start = time.perf_counter()
+    interpreter.interpret(stmts)
+    elapsed = time.perf_counter() - start
+
+    exception_list.raise_if_not_empty()
+    return elapsed
+
+
+@click.command()
+@click.option("--iterations", default=100_000, show_default=True, help="Loop iterations.")
+@click.option("--repeat", default=3, show_default=True, help="Runs to take the fastest of.")
+def main(iterations: int, repeat: int) -> None:
+    source = SOURCE.format(n=iterations)
+    for engine in ENGINES:
+        before = min(measure(engine, source, desugared=True) for _ in range(repeat))
+        after = min(measure(engine, source, desugared=False) for _ in range(repeat))
+        click.echo(
+            f"{engine.__name__:>18}: desugared {before:.3f}s, ForStmt {after:.3f}s "
+            f"({before / after:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
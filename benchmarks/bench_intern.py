@@ -0,0 +1,106 @@
+"""Measure what interning lexemes and literals saves on a large generated script.
+
+Scans the script with the lexer's `Interner` and with one which shares nothing, as scanning did
+before, reporting the memory the tokens hold and how many variable lookups per second
+`Environment.get` does for the script's identifiers. Run from the repository root with
+``python -m benchmarks.bench_intern``.
+"""
+import random
+import time
+import tracemalloc
+
+import click
+
+from pylox.environment import Environment
+from pylox.exceptions import ExceptionList
+from pylox.lexer import RegexLexer
+from pylox.token import Interner, Token, TokenType
+
+
+class CopyingInterner(Interner):
+    """Gives every token its own lexeme and literal."""
+
+    def name(self, lexeme: str) -> str:
+        return lexeme
+
+    def number(self, lexeme: str) -> tuple[str, float]:
+        return lexeme, float(lexeme)
+
+    def string(self, lexeme: str) -> tuple[str, str]:
+        return lexeme, lexeme[1:-1]
+
+
+class CopyingLexer(RegexLexer):
+    interner_class = CopyingInterner
+
+
+def generate(lines: int, variables: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    names = [f"generated_variable_{i}" for i in range(variables)]
+    out = [f'var {name} = "initial value";' for name in names]
+    for _ in range(lines):
+        a, b, c = rng.sample(names, 3)
+        out.append(f"{a} = {b} + {c} * {rng.randrange(10)} - {rng.choice(['1.5', '2', '100'])};")
+    return "\n".join(out) + "\n"
+
+
+def scan(lexer_class: type, source: str) -> tuple[list[Token], int]:
+    """The tokens of `source`, and the bytes allocated for them."""
+    lexer = lexer_class(source, ExceptionList([]))
+    tracemalloc.start()
+    tokens = lexer.scan()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return tokens, retained
+
+
+def lookups(tokens: list[Token]) -> tuple[Environment, list[Token]]:
+    """Globals defined by the `var` statements, and every other identifier."""
+    environment = Environment()
+    identifiers = []
+    for i, token in enumerate(tokens):
+        if token.token_type is TokenType.IDENTIFIER:
+            if tokens[i - 1].token_type is TokenType.VAR:
+                environment.define(token.lexeme, None)
+            else:
+                identifiers.append(token)
+    return environment, identifiers
+
+
+def lookup_rates(token_lists: list[list[Token]], repeat: int) -> list[float]:
+    """Best lookups per second of the identifiers in each list, taking turns to even out noise."""
+    cases = [lookups(tokens) for tokens in token_lists]
+    best = [float("inf")] * len(cases)
+    for _ in range(repeat):
+        for i, (environment, identifiers) in enumerate(cases):
+            get = environment.get
+            start = time.perf_counter()
+            for token in identifiers:
+                get(token)
+            best[i] = min(best[i], time.perf_counter() - start)
+    return [len(identifiers) / elapsed for (_, identifiers), elapsed in zip(cases, best)]
+
+
+@click.command()
+@click.option("--lines", default=100_000, show_default=True, help="Assignments generated.")
+@click.option("--variables", default=1000, show_default=True, help="Distinct variables.")
+@click.option("--repeat", default=7, show_default=True, help="Lookup runs, best kept.")
+def main(lines: int, variables: int, repeat: int) -> None:
+    source = generate(lines, variables)
+    click.echo(f"source: {len(source):,} chars, {lines + variables:,} lines")
+
+    names = ["not interned", "interned"]
+    scans = [scan(lexer_class, source) for lexer_class in (CopyingLexer, RegexLexer)]
+    rates = lookup_rates([tokens for tokens, _ in scans], repeat)
+    for name, (tokens, retained), rate in zip(names, scans, rates):
+        lexemes = {id(token.lexeme) for token in tokens}
+        literals = {id(token.literal) for token in tokens if token.literal is not None}
+        click.echo(
+            f"{name:>12}: {retained / 1e6:7.1f}MB for {len(tokens):,} tokens "
+            f"({retained / len(tokens):.1f} bytes/token), {len(lexemes):,} distinct lexemes, "
+            f"{len(literals):,} distinct literals, {rate / 1e6:.2f}M lookups/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Compare the throughput, in tokens per second, of the lexer implementations.
+
+Run from the repository root with ``python -m benchmarks.bench_lexer``.
+"""
+import time
+
+import click
+
+from pylox.exceptions import ExceptionList
+from pylox.lexer import Lexer, RegexLexer
+
+SNIPPET = """\
+// accumulate a few values
+var total_{n} = 0;
+for (var i = 0; i < {n}; i = i + 1) {{
+    if (i >= 10 and i != 42 or !false) total_{n} = total_{n} + i * 2.5 / 3;
+    print "iteration" + " " + "done";
+}}
+"""
+
+
+def generate(lines: int) -> str:
+    return "".join(SNIPPET.format(n=n) for n in range(lines // SNIPPET.count("\n") + 1))
+
+
+def measure(lexer_cls: type, source: str, repeat: int) -> tuple[int, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tokens = lexer_cls(source, ExceptionList([])).scan()
+        best = min(best, time.perf_counter() - start)
+    return len(tokens), best
+
+
+@click.command()
+@click.option("--lines", default=100_000, show_default=True, help="Lines of generated source.")
+@click.option("--repeat", default=3, show_default=True, help="Runs per lexer, best is kept.")
+def main(lines: int, repeat: int) -> None:
+    source = generate(lines)
+    click.echo(f"source: {len(source):,} chars, {source.count(chr(10)):,} lines")
+
+    baseline = None
+    for lexer_cls in (Lexer, RegexLexer):
+        count, elapsed = measure(lexer_cls, source, repeat)
+        rate = count / elapsed
+        baseline = baseline or rate
+        click.echo(
+            f"{lexer_cls.__name__:>12}: {count:,} tokens in {elapsed:.3f}s "
+            f"({rate:,.0f} tokens/s, {rate / baseline:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Measure scanning with line numbers looked up lazily, against counting lines while scanning.
+
+Scans a large generated script with a copy of the scanner which matched every newline and gave
+each token its line as it went, and with `RegexLexer`, whose tokens find their line in a
+`LineIndex` only when asked, both from a string and from a memory-mapped file. Also reports the
+memory the tokens hold, and the time taken to then look up the line of every token, as if each
+one were in an error message. Run from the repository root with
+``python -m benchmarks.bench_lines``.
+"""
+import gc
+import mmap
+import os
+import re
+import tempfile
+import time
+import tracemalloc
+from typing import Iterator
+
+import click
+
+from benchmarks.bench_lexer import generate
+from pylox.exceptions import ExceptionList, LexicalError
+from pylox.lexer import KEYWORDS, MASTER_PATTERN, OPERATORS, RegexLexer
+from pylox.token import Token, TokenType
+
+LINE_COUNTING_PATTERN = re.compile(
+    MASTER_PATTERN.pattern.replace(r"[ \t\r\n]+)", "[ \\t\\r]+)\n    |(?P<NEWLINE>\\n)"),
+    re.VERBOSE | re.DOTALL,
+)
+
+
+class LineCountingLexer(RegexLexer):
+    """Counts the newlines in the source as it scans, as `RegexLexer` used to."""
+
+    def scan_buffer(self, buffer: str, final: bool = True) -> Iterator[Token]:
+        lineno = self._lineno
+        name, number, string = self.interner.name, self.interner.number, self.interner.string
+
+        for match in LINE_COUNTING_PATTERN.finditer(buffer):
+            kind = match.lastgroup
+            if kind == "WHITESPACE":
+                continue
+            elif kind == "IDENTIFIER":
+                lexeme = name(match.group())
+                yield Token(KEYWORDS.get(lexeme, TokenType.IDENTIFIER), lexeme, None, lineno)
+            elif kind == "OPERATOR":
+                lexeme = name(match.group())
+                yield Token(OPERATORS[lexeme], lexeme, None, lineno)
+            elif kind == "NEWLINE":
+                lineno += 1
+            elif kind == "NUMBER":
+                lexeme, value = number(match.group())
+                yield Token(TokenType.NUMBER, lexeme, value, lineno)
+            elif kind == "STRING":
+                lexeme, value = string(match.group())
+                lineno += lexeme.count("\n")
+                yield Token(TokenType.STRING, lexeme, value, lineno)
+            elif kind == "COMMENT":
+                continue
+            elif kind == "UNTERMINATED":
+                lineno += match.group().count("\n")
+                self.exception_list.append(LexicalError(lineno, "", "Unterminated string"))
+            else:
+                self.exception_list.append(LexicalError(lineno, "", "Unexpected character"))
+
+        self._lineno = lineno
+
+    def scan(self) -> list[Token]:
+        self.tokens.extend(self.scan_buffer(self.source))
+        self.tokens.append(Token(TokenType.EOF, "", None, self._lineno))
+        return self.tokens
+
+
+def scan(lexer_class: type, source: str | bytes) -> tuple[list[Token], float]:
+    """The tokens of `source`, and the seconds taken to scan them."""
+    lexer = lexer_class(source, ExceptionList([]))
+    # not counting collections of the tokens kept from earlier scans
+    gc.collect()
+    start = time.perf_counter()
+    tokens = lexer.scan()
+    return tokens, time.perf_counter() - start
+
+
+def retained(lexer_class: type, source: str | bytes) -> float:
+    """Bytes held per token scanned from `source`, traced separately as tracing slows scanning."""
+    lexer = lexer_class(source, ExceptionList([]))
+    tracemalloc.start()
+    tokens = lexer.scan()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / len(tokens)
+
+
+def look_up(tokens: list[Token]) -> tuple[list[int], float]:
+    """The line of every token, and the seconds taken to find them."""
+    start = time.perf_counter()
+    linenos = [token.lineno for token in tokens]
+    return linenos, time.perf_counter() - start
+
+
+@click.command()
+@click.option("--lines", default=200_000, show_default=True, help="Lines of generated source.")
+@click.option("--repeat", default=3, show_default=True, help="Scans per variant, best kept.")
+def main(lines: int, repeat: int) -> None:
+    source = generate(lines)
+    click.echo(f"source: {len(source):,} chars, {source.count(chr(10)):,} lines")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "script.lox")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(source)
+
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            variants = {
+                "counting": (LineCountingLexer, source),
+                "lazy": (RegexLexer, source),
+                "lazy, mmap": (RegexLexer, mapped),
+            }
+            # taking turns, so every variant sees the same load on the machine
+            best = dict.fromkeys(variants, float("inf"))
+            lookups = dict.fromkeys(variants, float("inf"))
+            linenos = {}
+            for _ in range(repeat):
+                for name, (lexer_class, variant_source) in variants.items():
+                    tokens, elapsed = scan(lexer_class, variant_source)
+                    linenos[name], lookup = look_up(tokens)
+                    best[name] = min(best[name], elapsed)
+                    lookups[name] = min(lookups[name], lookup)
+            del tokens
+            sizes = {name: retained(*variant) for name, variant in variants.items()}
+
+    assert linenos["counting"] == linenos["lazy"] == linenos["lazy, mmap"]
+
+    click.echo(f"{len(linenos['lazy']):,} tokens, then looking up the line of every one")
+    baseline = best["counting"]
+    for name, elapsed in best.items():
+        click.echo(
+            f"{name:>10}: scan {elapsed:.3f}s ({baseline / elapsed:.2f}x), "
+            f"lines {lookups[name]:.3f}s, {sizes[name]:.1f} bytes/token"
+        )
+
+
+if __name__ == "__main__":
+    main()
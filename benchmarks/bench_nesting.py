@@ -0,0 +1,135 @@
+"""Measure deeply nested programs, and the explicit-stack engine against the recursive one.
+
+Builds nested blocks, an ``else if`` chain, chains of binary and unary operators, parentheses and
+assignments, and a runtime error in the innermost of nested blocks, each `--depth` levels deep.
+It times scanning, parsing and resolving them and then running them, checking what they print
+and the lines of the errors they report. The stack engine must run every one, with or without
+`--optimize`. The other engines report a RecursionError where they run out of Python stack. A flat
+loop-heavy script compares the speed of the tree and stack engines. Run from the repository root
+with ``python -m benchmarks.bench_nesting``.
+"""
+import time
+
+import click
+
+from pylox.lox import ENGINES, Lox
+from pylox.output import ListOutput
+
+LOOP = """\
+var total = 0;
+for (var i = 0; i < {n}; i = i + 1) {{
+    if (i > 10 and i != 20) total = total + i; else total = total - 1;
+    var j = 0;
+    while (j < 3) j = j + 1;
+}}
+print total;
+"""
+
+# source, what it prints, and the type and line of each error it reports
+Shape = tuple[str, str, list[tuple[str, int]]]
+
+
+def nested_blocks(depth: int) -> Shape:
+    return "var x = 1;" + "{ var y = x;" * depth + "print y;" + "}" * depth, "1.0", []
+
+
+def else_if_chain(depth: int) -> Shape:
+    chain = " else ".join(f"if (x == {i}) print {i};" for i in range(depth))
+    return f"var x = {depth - 1};\n{chain}", str(float(depth - 1)), []
+
+
+def plus_chain(depth: int) -> Shape:
+    return "print " + " + ".join(["1"] * depth) + ";", str(float(depth)), []
+
+
+def minus_chain(depth: int) -> Shape:
+    return "print " + " - ".join(["1"] * depth) + ";", str(float(2 - depth)), []
+
+
+def unary_chain(depth: int) -> Shape:
+    return "print " + "-" * depth + "1;", str(float((-1) ** depth)), []
+
+
+def parentheses(depth: int) -> Shape:
+    return "print " + "(" * depth + "1" + ")" * depth + ";", "1.0", []
+
+
+def assignment_chain(depth: int) -> Shape:
+    return "var a;\n" + "a = " * depth + "1;\nprint a;", "1.0", []
+
+
+def runtime_error(depth: int) -> Shape:
+    # ends the innermost block, which recovers from it, and the rest of the program runs
+    source = "{" * depth + '\nprint -"x";\n' + "print 1;}" * depth + "\nprint 2;"
+    return source, "\n".join(["1.0"] * (depth - 1) + ["2.0"]), [("PyloxRuntimeError", 2)]
+
+
+SHAPES = {
+    "blocks": nested_blocks,
+    "else if": else_if_chain,
+    "+ chain": plus_chain,
+    "- chain": minus_chain,
+    "unary": unary_chain,
+    "parens": parentheses,
+    "assign": assignment_chain,
+    "error": runtime_error,
+}
+
+
+def run(engine: str, source: str, optimize: bool = False) -> tuple[float, float, str, list]:
+    """Seconds to parse, and to run, `source` with `engine`, what it prints and its errors."""
+    lox = Lox(engine, optimize, output=ListOutput())
+    start = time.perf_counter()
+    stmts = lox.parse(source)
+    parsed = time.perf_counter()
+    lox.exception_list.raise_if_not_empty()
+    lox.interpreter.interpret(stmts)
+    elapsed = time.perf_counter() - parsed
+    errors = [(type(e).__name__, e.token.lineno) for e in lox.exception_list]
+    return parsed - start, elapsed, lox.output.getvalue().strip(), errors
+
+
+@click.command()
+@click.option("--depth", default=100_000, show_default=True, help="Levels of nesting.")
+@click.option("--iterations", default=20_000, show_default=True, help="Flat loop iterations.")
+@click.option("--repeat", default=5, show_default=True, help="Flat runs per engine, best kept.")
+@click.option(
+    "--engines", default="tree,stack", show_default=True, help="Comma separated engines to run."
+)
+@click.option("--optimize", is_flag=True, help="Optimize the programs before running them.")
+def main(depth: int, iterations: int, repeat: int, engines: str, optimize: bool) -> None:
+    engines = engines.split(",")
+    for engine in engines:
+        if engine not in ENGINES:
+            raise click.BadParameter(f"unknown engine {engine!r}", param_hint="--engines")
+
+    for name, shape in SHAPES.items():
+        source, expected, expected_errors = shape(depth)
+        for engine in engines:
+            try:
+                parse, elapsed, printed, errors = run(engine, source, optimize)
+            except RecursionError:
+                if engine == "stack":
+                    raise
+                click.echo(f"{name:>8}, {engine:>7}: RecursionError")
+                continue
+            assert printed == expected, printed[-200:]
+            assert errors == expected_errors, errors
+            click.echo(f"{name:>8}, {engine:>7}: parse {parse:6.2f}s, run {elapsed:6.2f}s")
+
+    if "tree" not in engines or "stack" not in engines:
+        return
+
+    # taking turns, so both engines see the same load on the machine
+    source = LOOP.format(n=iterations)
+    best = {"tree": float("inf"), "stack": float("inf")}
+    for _ in range(repeat):
+        for engine in best:
+            best[engine] = min(best[engine], run(engine, source)[1])
+    for engine, elapsed in best.items():
+        ratio = elapsed / best["tree"]
+        click.echo(f"{'flat':>8}, {engine:>7}: run {elapsed:6.3f}s ({ratio:.2f}x the tree engine)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Compare printing through `click.echo` per line with the buffered output sink.
+
+Prints a million lines to the null device, both straight from a Python loop and from a Lox
+program. Run from the repository root with ``python -m benchmarks.bench_output``.
+"""
+import contextlib
+import os
+import time
+
+import click
+
+from pylox.exceptions import ExceptionList
+from pylox.interpreter import Interpreter
+from pylox.lexer import RegexLexer
+from pylox.output import BufferedOutput, FlushPolicy, Output
+from pylox.parser import Parser
+from pylox.resolver import Resolver
+from pylox.transpiler import PythonInterpreter
+
+SOURCE = "for (var i = 0; i < {n}; i = i + 1) print i;\n"
+
+
+class EchoOutput(Output):
+    """How every print was written before output sinks."""
+
+    def write(self, value: object):
+        click.echo(value)
+
+
+SINKS = {
+    "click.echo": EchoOutput,
+    "line": lambda: BufferedOutput(flush_policy=FlushPolicy.LINE),
+    "size": lambda: BufferedOutput(flush_policy=FlushPolicy.SIZE),
+    "exit": lambda: BufferedOutput(flush_policy=FlushPolicy.EXIT),
+}
+
+
+def measure_writes(output: Output, lines: int) -> float:
+    write = output.write
+    start = time.perf_counter()
+    for i in range(lines):
+        write(float(i))
+    output.flush()
+    return time.perf_counter() - start
+
+
+def measure_program(engine: type, output: Output, source: str) -> float:
+    exception_list = ExceptionList([])
+    stmts = Parser(RegexLexer(source, exception_list).scan(), exception_list).parse()
+    Resolver().resolve(stmts)
+
+    interpreter = engine(exception_list, output)
+    start = time.perf_counter()
+    interpreter.interpret(stmts)
+    output.flush()
+    elapsed = time.perf_counter() - start
+
+    exception_list.raise_if_not_empty()
+    return elapsed
+
+
+@click.command()
+@click.option("--lines", default=1_000_000, show_default=True, help="Lines to print.")
+@click.option("--tree", is_flag=True, help="Also run the program with the tree-walking engine.")
+def main(lines: int, tree: bool) -> None:
+    source = SOURCE.format(n=lines)
+    engines = (PythonInterpreter, Interpreter) if tree else (PythonInterpreter,)
+
+    results = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for name, sink in SINKS.items():
+            results.append((name, "writes", measure_writes(sink(), lines)))
+            for engine in engines:
+                results.append((name, engine.__name__, measure_program(engine, sink(), source)))
+
+    baselines = {run: elapsed for name, run, elapsed in results if name == "click.echo"}
+    for name, run, elapsed in sorted(results, key=lambda result: result[1]):
+        click.echo(f"{run:>17} {name:>10}: {elapsed:.3f}s ({baselines[run] / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
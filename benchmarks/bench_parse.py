@@ -0,0 +1,190 @@
+"""Measure parsing throughput on large arithmetic expressions.
+
+Compares the table-driven precedence climbing of `Parser.expression` with the recursive descent
+through one method per precedence level it replaced, checking that both build the same trees.
+Run from the repository root with ``python -m benchmarks.bench_parse``.
+"""
+import random
+import time
+
+import click
+
+from pylox.exceptions import ExceptionList, SyntacticalError
+from pylox.expr import (
+    AssignExpr,
+    BaseExpr,
+    BinaryExpr,
+    GroupingExpr,
+    LogicalExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from pylox.lexer import RegexLexer
+from pylox.parser import Parser
+from pylox.token import Token, TokenType
+
+
+class RecursiveDescentParser(Parser):
+    """Parses expressions with a method per precedence level, each calling the next."""
+
+    def expression(self, token: Token) -> BaseExpr:
+        return self.assignment(token)
+
+    def assignment(self, token: Token) -> BaseExpr:
+        expr = self.or_(token)
+
+        if (next_token := self.peek()).token_type is TokenType.EQUAL:
+            equals = self.consume()
+            value = self.assignment(self.consume())
+
+            if isinstance(expr, VariableExpr):
+                name = expr.name
+                return AssignExpr(name, value)
+
+            raise SyntacticalError(equals, "Invalid assignment target.")
+
+        return expr
+
+    def or_(self, token: Token) -> BaseExpr:
+        expr = self.and_(token)
+
+        while (self.peek()).token_type is TokenType.OR:
+            operator = self.consume()
+            right = self.and_(self.consume())
+            expr = LogicalExpr(expr, operator, right)
+
+        return expr
+
+    def and_(self, token: Token) -> BaseExpr:
+        expr = self.equality(token)
+
+        while (self.peek()).token_type is TokenType.AND:
+            operator = self.consume()
+            right = self.equality(self.consume())
+            expr = LogicalExpr(expr, operator, right)
+
+        return expr
+
+    def equality(self, token: Token) -> BaseExpr:
+        expr = self.comparison(token)
+
+        while self.peek().token_type in [TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL]:
+            operator = self.consume()
+            right = self.comparison(self.consume())
+            expr = BinaryExpr(expr, operator, right)
+
+        return expr
+
+    def comparison(self, token: Token) -> BaseExpr:
+        expr = self.term(token)
+
+        while self.peek().token_type in [
+            TokenType.GREATER,
+            TokenType.GREATER_EQUAL,
+            TokenType.LESS,
+            TokenType.LESS_EQUAL,
+        ]:
+            operator = self.consume()
+            right = self.term(self.consume())
+            expr = BinaryExpr(expr, operator, right)
+
+        return expr
+
+    def term(self, token: Token) -> BaseExpr:
+        expr = self.factor(token)  # 4
+
+        while self.peek().token_type in [TokenType.MINUS, TokenType.PLUS]:
+            # token under the cursor is a '+' or '-' operator
+            operator = self.consume()
+            right = self.factor(self.consume())
+            expr = BinaryExpr(expr, operator, right)
+
+        return expr
+
+    def factor(self, token: Token) -> BaseExpr:
+        expr = self.unary(token)
+
+        while self.peek().token_type in [TokenType.SLASH, TokenType.STAR]:
+            # token under the cursor is a '/' or '*' operator
+            operator = self.consume()
+            right = self.unary(self.consume())
+            expr = BinaryExpr(expr, operator, right)
+
+        return expr
+
+    def unary(self, token: Token) -> BaseExpr:
+        if token.token_type in [TokenType.BANG, TokenType.MINUS]:
+            # token is an '!' or '-' operator
+            right = self.unary(self.consume())
+            return UnaryExpr(token, right)
+
+        # token is not an operator so must be a primary
+        return self.primary(token)
+
+    def primary(self, token: Token) -> BaseExpr:
+        if token.token_type is not TokenType.LEFT_PAREN:
+            return super().primary(token)
+
+        expr = self.expression(self.consume())
+        if (next_token := self.peek()).token_type is not TokenType.RIGHT_PAREN:
+            raise SyntacticalError(next_token, "Expected ')' after expression.")
+        self._current += 1  # consume the ')'
+        return GroupingExpr(expr)
+
+
+def generate(statements: int, operands: int, seed: int = 0) -> str:
+    """Statements assigning arithmetic on `operands` numbers and variables, some parenthesized."""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(statements):
+        parts = []
+        for i in range(operands):
+            operand = rng.choice(["x", "y", "z", str(rng.randrange(100)), f"{rng.random():.3f}"])
+            if rng.random() < 0.1:
+                operand = f"-{operand}"
+            if i:
+                parts.append(rng.choice(["+", "-", "*", "/"]))
+            parts.append(f"({operand}" if rng.random() < 0.1 else operand)
+        expression = " ".join(parts) + ")" * sum(part.startswith("(") for part in parts)
+        lines.append(f"x = {expression};")
+    return "\n".join(lines) + "\n"
+
+
+def parse(parser_class: type, tokens: list) -> tuple[list, float]:
+    exception_list = ExceptionList([])
+    start = time.perf_counter()
+    stmts = parser_class(tokens, exception_list).parse()
+    elapsed = time.perf_counter() - start
+    exception_list.raise_if_not_empty()
+    return stmts, elapsed
+
+
+@click.command()
+@click.option("--statements", default=2000, show_default=True, help="Statements generated.")
+@click.option("--operands", default=50, show_default=True, help="Operands per expression.")
+@click.option("--repeat", default=5, show_default=True, help="Parses per parser, best kept.")
+def main(statements: int, operands: int, repeat: int) -> None:
+    source = generate(statements, operands)
+    tokens = RegexLexer(source, ExceptionList([])).scan()
+    click.echo(f"source: {len(source):,} chars, {len(tokens):,} tokens")
+
+    parsers = {"recursive descent": RecursiveDescentParser, "precedence climbing": Parser}
+    # taking turns, so both parsers see the same load on the machine
+    best = dict.fromkeys(parsers, float("inf"))
+    trees = {}
+    for _ in range(repeat):
+        for name, parser_class in parsers.items():
+            trees[name], elapsed = parse(parser_class, tokens)
+            best[name] = min(best[name], elapsed)
+    assert trees["recursive descent"] == trees["precedence climbing"]
+
+    baseline = best["recursive descent"]
+    for name, elapsed in best.items():
+        click.echo(
+            f"{name:>19}: {elapsed:.3f}s, {len(tokens) / elapsed / 1e6:.2f}M tokens/s "
+            f"({baseline / elapsed:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
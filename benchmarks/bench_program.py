@@ -0,0 +1,66 @@
+"""Compare the per-call latency of `Lox.run` with running a `Program` compiled once.
+
+Runs a small script, the kind a service would run per request, many times. `Lox.run` has to be
+given the input in the source, a `Program` is given it as a global. Run from the repository root
+with ``python -m benchmarks.bench_program``.
+"""
+import statistics
+import time
+
+import click
+
+from pylox.lox import ENGINES, Lox
+from pylox.output import ListOutput
+
+SCRIPT = """\
+var total = 0;
+var i = 0;
+while (i < 10) {
+    if (i * input > 25 or i == 3) total = total + i * input; else total = total - 1;
+    i = i + 1;
+}
+print total;
+"""
+
+
+def summarize(latencies: list[float]) -> str:
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99)]
+    return (
+        f"mean {statistics.mean(latencies) * 1e6:8.1f}us, "
+        f"p50 {statistics.median(latencies) * 1e6:8.1f}us, p99 {p99 * 1e6:8.1f}us"
+    )
+
+
+def measure_run(engine: str, calls: int) -> list[float]:
+    latencies = []
+    for call in range(calls):
+        start = time.perf_counter()
+        Lox(engine, output=ListOutput()).run(f"var input = {call};\n{SCRIPT}")
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def measure_program(engine: str, calls: int) -> list[float]:
+    program = Lox(engine).compile(SCRIPT)
+    latencies = []
+    for call in range(calls):
+        start = time.perf_counter()
+        program.run(globals={"input": float(call)}, output=ListOutput())
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+@click.command()
+@click.option("--calls", default=2000, show_default=True, help="Runs per engine and API.")
+def main(calls: int) -> None:
+    for engine in ENGINES:
+        before = measure_run(engine, calls)
+        after = measure_program(engine, calls)
+        speedup = statistics.median(before) / statistics.median(after)
+        click.echo(f"{engine:>8} Lox.run:     {summarize(before)}")
+        click.echo(f"{engine:>8} Program.run: {summarize(after)} ({speedup:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Compare interpreting a loop-heavy script with and without the resolver pass.
+
+Run from the repository root with ``python -m benchmarks.bench_resolver``.
+"""
+import time
+
+import click
+
+from pylox.exceptions import ExceptionList
+from pylox.interpreter import Interpreter
+from pylox.lexer import RegexLexer
+from pylox.parser import Parser
+from pylox.resolver import Resolver
+
+SOURCE = """\
+var total = 0;
+for (var i = 0; i < {n}; i = i + 1) {{
+    var square = i * i;
+    {{
+        var j = 0;
+        while (j < 3) {{
+            if (square > j) total = total + square - j;
+            j = j + 1;
+        }}
+    }}
+}}
+"""
+
+
+def measure(source: str, resolve: bool) -> float:
+    exception_list = ExceptionList([])
+    stmts = Parser(RegexLexer(source, exception_list).scan(), exception_list).parse()
+    if resolve:
+        Resolver().resolve(stmts)
+
+    interpreter = Interpreter(exception_list)
+    start = time.perf_counter()
+    interpreter.interpret(stmts)
+    elapsed = time.perf_counter() - start
+
+    exception_list.raise_if_not_empty()
+    return elapsed
+
+
+@click.command()
+@click.option("--iterations", default=20_000, show_default=True, help="Outer loop iterations.")
+def main(iterations: int) -> None:
+    source = SOURCE.format(n=iterations)
+
+    baseline = measure(source, resolve=False)
+    resolved = measure(source, resolve=True)
+    click.echo(f"  dynamic lookup: {baseline:.3f}s")
+    click.echo(f"resolved (d, s): {resolved:.3f}s ({baseline / resolved:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Measure how long pylox takes to start, and check it against a recorded budget.
+
+Each import is timed with ``python -X importtime`` in a fresh interpreter, and running a one-line
+script is timed from outside, taking the fastest of several runs. Run from the repository root
+with ``python -m benchmarks.bench_startup``, which fails when a time goes over its baseline by
+more than the tolerance, or with ``--record`` to store the current times as the baseline.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import click
+
+BASELINE = Path(__file__).with_name("startup_baseline.json")
+# separates the imports done at interpreter startup from the ones being measured
+MARKER = "-- pylox startup --"
+IMPORTS = {
+    "library": "from pylox import Lox",
+    "cli": "import pylox.__main__",
+}
+SCRIPT = 'print "hello";\n'
+
+
+def measure_import(statement: str) -> float:
+    """Milliseconds spent importing modules for `statement`."""
+    code = f"import sys; print({MARKER!r}, file=sys.stderr); {statement}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    total = 0
+    lines = result.stderr.splitlines()
+    for line in lines[lines.index(MARKER) + 1 :]:
+        # "import time: self [us] | cumulative | imported package", nested imports are indented
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  "):
+            total += int(cumulative)
+    return total / 1000
+
+
+def measure_run(script: str) -> float:
+    """Milliseconds to run a script from the command line, including interpreter startup."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "pylox", "--no-cache", script], capture_output=True, check=True
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def measure(repeat: int) -> dict[str, float]:
+    results = {
+        name: min(measure_import(statement) for _ in range(repeat))
+        for name, statement in IMPORTS.items()
+    }
+
+    fd, script = tempfile.mkstemp(suffix=".lox")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(SCRIPT)
+        results["run"] = min(measure_run(script) for _ in range(repeat))
+    finally:
+        os.unlink(script)
+    return results
+
+
+@click.command()
+@click.option("--repeat", default=10, show_default=True, help="Runs to take the fastest of.")
+@click.option("--record", is_flag=True, help="Store the measured times as the new baseline.")
+@click.option(
+    "--tolerance",
+    default=0.25,
+    show_default=True,
+    help="Fraction a time may exceed its baseline by before failing.",
+)
+def main(repeat: int, record: bool, tolerance: float) -> None:
+    results = measure(repeat)
+
+    if record:
+        baseline = {name: round(elapsed, 1) for name, elapsed in results.items()}
+        BASELINE.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        for name, elapsed in results.items():
+            click.echo(f"{name:>8}: {elapsed:.1f}ms (recorded)")
+        return
+
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    failed = False
+    for name, elapsed in results.items():
+        if name not in baseline:
+            click.echo(f"{name:>8}: {elapsed:.1f}ms (no baseline)")
+            continue
+
+        budget = baseline[name] * (1 + tolerance)
+        status = "ok" if elapsed <= budget else "OVER BUDGET"
+        failed |= elapsed > budget
+        click.echo(f"{name:>8}: {elapsed:.1f}ms, baseline {baseline[name]:.1f}ms ({status})")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Measure building a long string a piece at a time, with ropes and with plain concatenation.
+
+Runs ``s = s + piece;`` in a loop until the string reaches each size, and prints it once at the
+end, on every engine. Plain concatenation copies the string on every append, so it is quadratic
+and is only run up to `--plain-limit`. Run from the repository root with
+``python -m benchmarks.bench_strings``.
+"""
+import math
+import time
+import tracemalloc
+
+import click
+
+from pylox import rope
+from pylox.lox import ENGINES, Lox
+from pylox.output import ListOutput
+
+SOURCE = """\
+var piece = "{piece}";
+var s = "";
+for (var i = 0; i < {n}; i = i + 1) s = s + piece;
+print s;
+"""
+PIECE = "0123456789" * 10
+
+
+def measure(engine: str, size: int, plain: bool) -> tuple[float, int]:
+    """Seconds to build and print a string of `size` characters, and the peak memory in bytes.
+
+    Memory is traced in a second run, since tracing slows the run down.
+    """
+    program = Lox(engine).compile(SOURCE.format(piece=PIECE, n=size // len(PIECE)))
+    threshold = rope.MIN_ROPE_LENGTH
+    if plain:
+        rope.MIN_ROPE_LENGTH = math.inf
+    try:
+        output = ListOutput()
+        start = time.perf_counter()
+        program.run(output=output)
+        elapsed = time.perf_counter() - start
+        assert len(output.getvalue()) == size + 1
+
+        tracemalloc.start()
+        program.run(output=ListOutput())
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        rope.MIN_ROPE_LENGTH = threshold
+    return elapsed, peak
+
+
+@click.command()
+@click.option("--size", default=10_000_000, show_default=True, help="Characters built.")
+@click.option(
+    "--plain-limit", default=1_000_000, show_default=True, help="Largest size built plainly."
+)
+def main(size: int, plain_limit: int) -> None:
+    sizes = [size // 100, size // 10, size]
+    for engine in ENGINES:
+        for n in sizes:
+            elapsed, peak = measure(engine, n, plain=False)
+            line = f"{engine:>8} {n / 1e6:6.2f}MB: ropes {elapsed:7.3f}s, peak {peak / 1e6:6.1f}MB"
+            if n <= plain_limit:
+                plain, plain_peak = measure(engine, n, plain=True)
+                line += (
+                    f"; plain {plain:7.3f}s, peak {plain_peak / 1e6:6.1f}MB "
+                    f"({plain / elapsed:.1f}x)"
+                )
+            click.echo(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""Time each stage of running a set of representative Lox programs, and flag regressions.
+
+Scanning, parsing, resolving and interpreting are timed separately, as is a whole `Lox.run`,
+taking the fastest and the median of several runs. Run from the repository root with
+``python -m benchmarks.bench_suite run``, which prints the results as JSON, and
+``python -m benchmarks.bench_suite compare`` to run the suite again and compare it with a stored
+baseline, failing when any stage got slower by more than the threshold. Record a new baseline
+with ``python -m benchmarks.bench_suite run --output benchmarks/suite_baseline.json``.
+"""
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+import click
+
+from pylox import __version__
+from pylox.exceptions import ExceptionList
+from pylox.lexer import RegexLexer
+from pylox.lox import ENGINES, Lox, load_engine
+from pylox.output import Output
+from pylox.parser import Parser
+from pylox.resolver import Resolver
+
+BASELINE = Path(__file__).with_name("suite_baseline.json")
+STAGES = ("scan", "parse", "resolve", "interpret", "end_to_end")
+
+ARITHMETIC = """\
+var x = 0;
+for (var i = 0; i < {n}; i = i + 1) {{
+    x = x + i * 3 - 7 / 2 * 0.5 + -i / 4 + 1 - 2 * 4 + 8 * x / 1000;
+    if (x > 1000000 or x < -1000000) x = 0;
+}}
+print x;
+"""
+STRINGS = """\
+var s = "";
+var line = "";
+for (var i = 0; i < {n}; i = i + 1) {{
+    line = line + "ab";
+    if (line == "abababababababababab") {{
+        s = s + line + ", ";
+        line = "";
+    }}
+}}
+print s;
+"""
+
+
+def nesting(n: int) -> str:
+    """A loop around blocks and if statements nested 40 deep, each declaring a variable."""
+    depth = 40
+    opening = "".join(f"{{ var v{d} = v{d - 1} + 1; if (v{d} > 0) " for d in range(1, depth + 1))
+    closing = "}" * depth
+    body = f"{{ var v0 = i; {opening}total = total + v{depth}; {closing}}}"
+    return f"var total = 0;\nfor (var i = 0; i < {n // 40}; i = i + 1) {body}\nprint total;\n"
+
+
+def variables(n: int) -> str:
+    """Hundreds of globals and locals read and written in a loop."""
+    count = 200
+    globals_ = "".join(f"var g{k} = {k};\n" for k in range(count))
+    locals_ = "".join(f"    var l{k} = g{k} * 2;\n" for k in range(count))
+    updates = "".join(f"        total = total + l{k} - g{k};\n" for k in range(count))
+    return (
+        f"{globals_}var total = 0;\n{{\n{locals_}"
+        f"    for (var i = 0; i < {n // 200}; i = i + 1) {{\n{updates}    }}\n}}\nprint total;\n"
+    )
+
+
+def generated(n: int) -> str:
+    """A long straight-line script, dominated by scanning and parsing."""
+    snippet = """\
+// statement group {k}
+var a{k} = {k} * 2 + 1;
+if (a{k} > 10 and a{k} != 42 or !false) a{k} = a{k} - 1; else a{k} = a{k} + 1;
+{{ var b = a{k} / 3; print "value" + " of " + "b"; }}
+"""
+    return "".join(snippet.format(k=k) for k in range(n // 4))
+
+
+PROGRAMS: dict[str, Callable[[int], str]] = {
+    "arithmetic": lambda n: ARITHMETIC.format(n=n),
+    "nesting": nesting,
+    "strings": lambda n: STRINGS.format(n=n),
+    "variables": variables,
+    "generated": generated,
+}
+
+
+class NullOutput(Output):
+    """Discard printed values, so printing to a terminal isn't measured."""
+
+    def write(self, value: object):
+        pass
+
+
+def timed(function: Callable, *args) -> tuple[object, float]:
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def measure_once(engine: str, source: str) -> dict[str, float]:
+    exception_list = ExceptionList([])
+    times = {}
+
+    tokens, times["scan"] = timed(RegexLexer(source, exception_list).scan)
+    stmts, times["parse"] = timed(Parser(tokens, exception_list).parse)
+    _, times["resolve"] = timed(Resolver().resolve, stmts)
+    interpreter = load_engine(engine)(exception_list, NullOutput())
+    _, times["interpret"] = timed(interpreter.interpret, stmts)
+    exception_list.raise_if_not_empty()
+
+    lox = Lox(engine, output=NullOutput())
+    _, times["end_to_end"] = timed(lox.run, source)
+    lox.exception_list.raise_if_not_empty()
+
+    return times
+
+
+def run_suite(engine: str, repeat: int, scale: int, programs: tuple[str, ...]) -> dict:
+    results = {}
+    for name in programs:
+        source = PROGRAMS[name](scale)
+        runs = [measure_once(engine, source) for _ in range(repeat)]
+        results[name] = {
+            stage: {
+                "min": min(run[stage] for run in runs),
+                "median": statistics.median(run[stage] for run in runs),
+            }
+            for stage in STAGES
+        }
+
+    return {
+        "pylox": __version__,
+        "python": platform.python_version(),
+        "engine": engine,
+        "repeat": repeat,
+        "scale": scale,
+        "results": results,
+    }
+
+
+@click.group()
+def main() -> None:
+    """Time each stage of running representative Lox programs."""
+
+
+@main.command()
+@click.option("--engine", type=click.Choice(list(ENGINES)), default="tree", show_default=True)
+@click.option("--repeat", default=5, show_default=True, help="Runs of each program.")
+@click.option("--scale", default=20_000, show_default=True, help="Size of each program.")
+@click.option(
+    "--program",
+    "programs",
+    multiple=True,
+    type=click.Choice(list(PROGRAMS)),
+    help="Program to run.",
+)
+@click.option("--output", type=click.File("w"), default="-", help="File to write the JSON to.")
+def run(engine: str, repeat: int, scale: int, programs: tuple[str, ...], output) -> None:
+    """Run the suite and print its results as JSON."""
+    report = run_suite(engine, repeat, scale, programs or tuple(PROGRAMS))
+    output.write(json.dumps(report, indent=2) + "\n")
+
+
+@main.command()
+@click.option(
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False),
+    default=str(BASELINE),
+    show_default=True,
+    help="Results to compare against.",
+)
+@click.option(
+    "--current",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Results to compare, instead of running the suite with the baseline's settings.",
+)
+@click.option(
+    "--threshold",
+    default=0.2,
+    show_default=True,
+    help="Fraction a stage may slow down by before it is flagged.",
+)
+@click.option(
+    "--min-delta",
+    default=0.002,
+    show_default=True,
+    help="Seconds a stage must change by to be flagged, since short stages are noisy.",
+)
+def compare(baseline: str, current: Optional[str], threshold: float, min_delta: float) -> None:
+    """Compare results with a baseline, failing if any stage regressed."""
+    before = json.loads(Path(baseline).read_text())
+    if current is None:
+        after = run_suite(
+            before["engine"], before["repeat"], before["scale"], tuple(before["results"])
+        )
+    else:
+        after = json.loads(Path(current).read_text())
+
+    for setting in ("engine", "scale"):
+        if before[setting] != after[setting]:
+            click.echo(f"warning: {setting} differs, {before[setting]} != {after[setting]}")
+
+    regressions = 0
+    for name, stages in after["results"].items():
+        if name not in before["results"]:
+            continue
+        for stage, timing in stages.items():
+            old, new = before["results"][name][stage]["min"], timing["min"]
+            change = new / old - 1
+            status = ""
+            if abs(new - old) < min_delta:
+                pass
+            elif change > threshold:
+                regressions += 1
+                status = " REGRESSION"
+            elif change < -threshold:
+                status = " improvement"
+            click.echo(f"{name:>10} {stage:>10}: {old:.4f}s -> {new:.4f}s ({change:+.1%}){status}")
+
+    if regressions:
+        click.echo(f"{regressions} stage(s) regressed by more than {threshold:.0%}.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
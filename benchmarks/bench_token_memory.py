@@ -0,0 +1,43 @@
+"""Compare the memory, in bytes per token, of a token list and a compact `TokenArray`.
+
+Run from the repository root with ``python -m benchmarks.bench_token_memory``.
+"""
+import time
+import tracemalloc
+
+import click
+
+from benchmarks.bench_lexer import generate
+from pylox.exceptions import ExceptionList
+from pylox.lexer import RegexLexer
+
+
+def measure(source: str, compact: bool) -> tuple[int, int, int, float]:
+    lexer = RegexLexer(source, ExceptionList([]))
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    tokens = lexer.scan_compact() if compact else lexer.scan()
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return len(tokens), retained, peak, elapsed
+
+
+@click.command()
+@click.option("--lines", default=100_000, show_default=True, help="Lines of generated source.")
+def main(lines: int) -> None:
+    source = generate(lines)
+    click.echo(f"source: {len(source):,} chars, {source.count(chr(10)):,} lines")
+
+    for name, compact in (("list[Token]", False), ("TokenArray", True)):
+        count, retained, peak, elapsed = measure(source, compact)
+        click.echo(
+            f"{name:>12}: {count:,} tokens, {retained / count:.1f} bytes/token retained, "
+            f"{peak / count:.1f} bytes/token peak, {elapsed:.3f}s (traced)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Compare the execution engines with the tree-walking interpreter on loops and arithmetic.
+
+Run from the repository root with ``python -m benchmarks.bench_vm``.
+"""
+import time
+
+import click
+
+from pylox.closure import ClosureInterpreter
+from pylox.exceptions import ExceptionList
+from pylox.interpreter import Interpreter
+from pylox.lexer import RegexLexer
+from pylox.parser import Parser
+from pylox.resolver import Resolver
+from pylox.transpiler import PythonInterpreter
+from pylox.vm import VM
+
+PROGRAMS = {
+    "loops": """\
+var count = 0;
+for (var i = 0; i < {n}; i = i + 1) {{
+    var j = 0;
+    while (j < 10) {{
+        if (j >= 5 and i > 0) count = count + 1;
+        j = j + 1;
+    }}
+}}
+""",
+    "arithmetic": """\
+var x = 0;
+for (var i = 0; i < {n}; i = i + 1) {{
+    x = x + i * 3 - 7 / 2 * 0.5 + -i / i + 1 - 2 * 4 + 8 * x / 1000;
+}}
+""",
+}
+ENGINES = (Interpreter, ClosureInterpreter, VM, PythonInterpreter)
+
+
+def measure(engine: type, source: str) -> float:
+    exception_list = ExceptionList([])
+    stmts = Parser(RegexLexer(source, exception_list).scan(), exception_list).parse()
+    Resolver().resolve(stmts)
+
+    interpreter = engine(exception_list)
+    start = time.perf_counter()
+    interpreter.interpret(stmts)
+    elapsed = time.perf_counter() - start
+
+    exception_list.raise_if_not_empty()
+    return elapsed
+
+
+@click.command()
+@click.option("--iterations", default=20_000, show_default=True, help="Outer loop iterations.")
+def main(iterations: int) -> None:
+    for name, program in PROGRAMS.items():
+        source = program.format(n=iterations)
+        baseline = None
+        for engine in ENGINES:
+            elapsed = measure(engine, source)
+            baseline = baseline or elapsed
+            click.echo(
+                f"{name:>10} {engine.__name__:>18}: {elapsed:.3f}s ({baseline / elapsed:.2f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,10 @@
-from pylox.lox import Lox  # noqa: F401
+__version__ = "0.1.0"
+
+
+def __getattr__(name: str) -> object:
+    # `Lox` pulls in most of the package, so it is only imported once it is used
+    if name == "Lox":
+        from pylox.lox import Lox
+
+        return Lox
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
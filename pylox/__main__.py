@@ -1,14 +1,230 @@
-from typing import Optional, TextIO
+import json
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, TextIO
 
 import click
 
-from pylox import Lox
+from pylox.constants import ENGINES, FlushPolicy
 
+if TYPE_CHECKING:
+    from pylox.budget import Budget
 
-@click.command()
+
+class DefaultGroup(click.Group):
+    """Group which runs `default_command` when not given the name of one of its commands."""
+
+    def __init__(self, *args, default_command: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_command = default_command
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if not args or (args[0] not in self.commands and args[0] != "--help"):
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
+
+engine_option = click.option(
+    "--engine",
+    type=click.Choice(list(ENGINES)),
+    default="tree",
+    show_default=True,
+    help="Execution engine to run the script with.",
+)
+
+max_statements_option = click.option(
+    "--max-statements",
+    type=click.IntRange(min=1),
+    help="End a run after this many statements, counting each loop iteration as one.",
+)
+timeout_option = click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    help="End a run after this many seconds.",
+)
+max_depth_option = click.option(
+    "--max-depth",
+    type=click.IntRange(min=0),
+    help="End a run which nests blocks deeper than this.",
+)
+
+
+def make_budget(
+    max_statements: Optional[int], timeout: Optional[float], max_depth: Optional[int]
+) -> Optional["Budget"]:
+    if max_statements is None and timeout is None and max_depth is None:
+        return None
+
+    from pylox.budget import Budget
+
+    return Budget(max_statements, timeout, max_depth)
+
+
+@click.group(cls=DefaultGroup, default_command="run")
+def main() -> None:
+    """Run a Lox script, or the interactive prompt without one.
+
+    `pylox [OPTIONS] [SCRIPT]` is short for `pylox run [OPTIONS] [SCRIPT]`.
+    """
+
+
+@main.command()
 @click.argument("script", type=click.File(), required=False)
-def main(script: Optional[TextIO]) -> None:
-    Lox.main(script)
+@engine_option
+@click.option(
+    "--disassemble", is_flag=True, help="Print the script's bytecode instead of running it."
+)
+@click.option(
+    "--dump-python", is_flag=True, help="Print the Python source the script transpiles to."
+)
+@click.option(
+    "--optimize",
+    is_flag=True,
+    help="Fold constants and remove dead code before running, reporting the nodes removed.",
+)
+@click.option(
+    "--flush",
+    type=click.Choice([policy.value for policy in FlushPolicy]),
+    default=FlushPolicy.SIZE.value,
+    show_default=True,
+    help="When printed output is written: once enough is buffered, every line, or at exit.",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    help="Directory to cache parsed scripts in. [default: ~/.cache/pylox]",
+)
+@click.option(
+    "--no-cache", is_flag=True, help="Neither read nor write the cache of parsed scripts."
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Report the lines the script spent the most time on, on stderr.",
+)
+@click.option(
+    "--profile-json",
+    type=click.File("w"),
+    help="Write hits and times for every line of the script to a JSON file.",
+)
+@click.option(
+    "--stats",
+    is_flag=True,
+    help="Report counts of nodes evaluated, scopes created and variable lookups, on stderr.",
+)
+@max_statements_option
+@timeout_option
+@max_depth_option
+def run(
+    script: Optional[TextIO],
+    engine: str,
+    disassemble: bool,
+    dump_python: bool,
+    optimize: bool,
+    flush: str,
+    cache_dir: Optional[str],
+    no_cache: bool,
+    profile: bool,
+    profile_json: Optional[TextIO],
+    stats: bool,
+    max_statements: Optional[int],
+    timeout: Optional[float],
+    max_depth: Optional[int],
+) -> None:
+    """Run a Lox script, or the interactive prompt without one."""
+    # the interpreter is only imported once the options are known to be valid
+    from pylox.cache import default_cache_dir
+    from pylox.lox import Lox
+
+    profiling = profile or profile_json is not None
+    budget = make_budget(max_statements, timeout, max_depth)
+    if (profiling or stats or budget is not None) and engine != "tree":
+        raise click.BadOptionUsage(
+            "profile", "Only the tree engine can be profiled, counted or given limits."
+        )
+    if profiling + stats + (budget is not None) > 1:
+        raise click.BadOptionUsage(
+            "stats", "Profiling, --stats and limits on a run can't be combined."
+        )
+    if no_cache:
+        cache_dir = None
+    elif cache_dir is None:
+        cache_dir = str(default_cache_dir())
+    Lox.main(
+        script,
+        engine,
+        disassemble,
+        dump_python,
+        optimize,
+        flush,
+        cache_dir,
+        profile,
+        profile_json,
+        stats,
+        budget,
+    )
+
+
+@main.command()
+@click.argument("scripts", nargs=-1, type=click.Path(exists=True, dir_okay=False))
+@engine_option
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Number of worker processes. [default: number of CPUs]",
+)
+@click.option(
+    "--chunksize",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of scripts sent to a worker at a time.",
+)
+@click.option("--unordered", is_flag=True, help="Report scripts as they finish, not in order.")
+@click.option("--json", "as_json", is_flag=True, help="Print a JSON object per script.")
+@max_statements_option
+@timeout_option
+@max_depth_option
+def batch(
+    scripts: tuple[str, ...],
+    engine: str,
+    workers: Optional[int],
+    chunksize: int,
+    unordered: bool,
+    as_json: bool,
+    max_statements: Optional[int],
+    timeout: Optional[float],
+    max_depth: Optional[int],
+) -> None:
+    """Run many independent scripts in parallel, each in a fresh interpreter.
+
+    Each script's output is printed under its name, and its errors to stderr. Exits with status 1
+    if any script had errors, including going over a limit, which only ends that script.
+    """
+    from pylox.lox import Lox
+
+    budget = make_budget(max_statements, timeout, max_depth)
+    if budget is not None and engine != "tree":
+        raise click.BadOptionUsage("engine", "Only the tree engine can be given limits.")
+    sources = (Path(script).read_text() for script in scripts)
+    failed = False
+    results = Lox.run_many(sources, engine, workers, chunksize, not unordered, budget)
+    for result in results:
+        script = scripts[result.index]
+        failed |= bool(result.errors)
+        if as_json:
+            errors = [f"{type(exc).__name__}: {exc}" for exc in result.errors]
+            line = {"script": script, "output": result.output, "errors": errors}
+            click.echo(json.dumps(line))
+            continue
+
+        click.echo(f"==> {script} <==")
+        click.echo(result.output, nl=False)
+        for exc in result.errors:
+            click.echo(f"{script}: {type(exc).__name__}: {exc}", err=True)
+
+    if failed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,126 @@
+import asyncio
+from time import perf_counter
+from typing import Iterable, Optional
+
+from pylox.environment import Environment, Frame
+from pylox.exceptions import ExceptionList, PyloxRuntimeError
+from pylox.interpreter import Interpreter
+from pylox.output import Output
+from pylox.stmt import BaseStmt, BlockStmt, ForStmt, IfStmt, WhileStmt
+
+
+class AsyncInterpreter(Interpreter):
+    """Tree-walking interpreter running as a coroutine, so scripts can share an event loop.
+
+    Before executing a statement it yields to the event loop if `yield_every` statements have run,
+    or `time_slice` seconds have passed, since it last did. Statements which contain statements
+    are executed by coroutines, everything else, including evaluating expressions, is the same as
+    `Interpreter`, since nothing else can run for long.
+    """
+
+    def __init__(
+        self,
+        exception_list: ExceptionList,
+        output: Optional[Output] = None,
+        yield_every: int = 1000,
+        time_slice: float = 0.001,
+    ):
+        super().__init__(exception_list, output)
+        self.yield_every = yield_every
+        self.time_slice = time_slice
+        self._countdown = yield_every
+        self._deadline = 0.0
+
+    async def interpret(self, stmts: Iterable[BaseStmt]):
+        self._start_slice()
+        try:
+            for stmt in stmts:
+                await self.execute(stmt)
+        except PyloxRuntimeError as e:
+            self.exception_list.append(e)
+
+    def _start_slice(self):
+        self._countdown = self.yield_every
+        self._deadline = perf_counter() + self.time_slice
+
+    async def execute(self, stmt: BaseStmt):
+        self._countdown -= 1
+        if self._countdown <= 0 or perf_counter() >= self._deadline:
+            await asyncio.sleep(0)
+            self._start_slice()
+
+        # only the visitors of statements containing statements are coroutines
+        if (coroutine := stmt.accept(self)) is not None:
+            await coroutine
+
+    async def visitBlockStmt(self, stmt: BlockStmt):
+        if stmt.slots is None:
+            await self.execute_block(stmt.statements, self.environment_class(self.environment))
+        elif stmt.slots:
+            await self.execute_frame(stmt.statements, Frame(self.frame, stmt.slots))
+        else:
+            await self.execute_frame(stmt.statements, self.frame)
+
+    async def execute_block(self, stmts: list[BaseStmt], environment: Environment):
+        prev_environment = self.environment
+        try:
+            self.environment = environment
+            for stmt in stmts:
+                await self.execute(stmt)
+        except PyloxRuntimeError as e:
+            self.recover(e)
+        finally:
+            self.environment = prev_environment
+
+    async def execute_frame(self, stmts: list[BaseStmt], frame: Optional[Frame]):
+        prev_frame = self.frame
+        try:
+            self.frame = frame
+            for stmt in stmts:
+                await self.execute(stmt)
+        except PyloxRuntimeError as e:
+            self.recover(e)
+        finally:
+            self.frame = prev_frame
+
+    async def visitIfStmt(self, stmt: IfStmt):
+        if self.is_truthy(self.evaluate(stmt.condition)):
+            await self.execute(stmt.then_branch)
+        elif stmt.else_branch is not None:
+            await self.execute(stmt.else_branch)
+
+    async def visitWhileStmt(self, stmt: WhileStmt):
+        while self.is_truthy(self.evaluate(stmt.condition)):
+            await self.execute(stmt.body)
+
+    async def visitForStmt(self, stmt: ForStmt):
+        if stmt.initializer is None:
+            await self.execute_loop(stmt)
+            return
+
+        prev_environment, prev_frame = self.environment, self.frame
+        try:
+            if stmt.slots is None:
+                self.environment = self.environment_class(prev_environment)
+            elif stmt.slots:
+                self.frame = Frame(prev_frame, stmt.slots)
+
+            await self.execute(stmt.initializer)
+            await self.execute_loop(stmt)
+        except PyloxRuntimeError as e:
+            self.recover(e)
+        finally:
+            self.environment, self.frame = prev_environment, prev_frame
+
+    async def execute_loop(self, stmt: ForStmt):
+        body, increment = stmt.body, stmt.increment
+        while self.is_truthy(self.evaluate(stmt.condition)):
+            if increment is None:
+                await self.execute(body)
+                continue
+
+            try:
+                await self.execute(body)
+                self.evaluate(increment)
+            except PyloxRuntimeError as e:
+                self.recover(e)
@@ -0,0 +1,94 @@
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from pylox.budget import Budget
+from pylox.exceptions import PyloxException
+from pylox.lox import Lox
+from pylox.output import ListOutput
+
+# chunks each worker may have submitted, and not yet yielded, at a time, so a worker has its next
+# chunk waiting when it finishes one
+CHUNKS_PER_WORKER = 2
+
+
+class RunResult(NamedTuple):
+    # position of the source in the batch
+    index: int
+    output: str
+    errors: list[PyloxException]
+
+
+def run_source(engine: str, index: int, source: str, budget: Optional[Budget] = None) -> RunResult:
+    """Run one source in a fresh `Lox`, capturing its output and errors."""
+    output = ListOutput()
+    lox = Lox(engine, output=output, budget=budget)
+    try:
+        lox.run(source)
+    except Exception as e:
+        # e.g. a RecursionError, which isn't necessarily picklable, so it is only described
+        lox.exception_list.append(PyloxException(f"{type(e).__name__}: {e}"))
+    return RunResult(index, output.getvalue(), list(lox.exception_list))
+
+
+def run_chunk(
+    engine: str, start: int, sources: list[str], budget: Optional[Budget] = None
+) -> list[RunResult]:
+    return [run_source(engine, start + i, source, budget) for i, source in enumerate(sources)]
+
+
+def chunks(sources: Iterable[str], chunksize: int) -> Iterator[tuple[int, list[str]]]:
+    """Consecutive lists of `chunksize` sources, each with the index of its first source."""
+    chunk: list[str] = []
+    start = 0
+    for source in sources:
+        chunk.append(source)
+        if len(chunk) == chunksize:
+            yield start, chunk
+            start, chunk = start + len(chunk), []
+    if chunk:
+        yield start, chunk
+
+
+def run_many(
+    sources: Iterable[str],
+    engine: str = "tree",
+    workers: Optional[int] = None,
+    chunksize: int = 1,
+    ordered: bool = True,
+    budget: Optional[Budget] = None,
+) -> Iterator[RunResult]:
+    """Run every source in its own `Lox`, spread over a pool of `workers` processes.
+
+    Sources are sent to the workers `chunksize` at a time, and results are yielded in the order
+    of `sources` if `ordered`, and otherwise as soon as their chunk is done. Each source gets its
+    own `budget`, if one is given, so a runaway source can't hold up a worker for long.
+
+    Only `CHUNKS_PER_WORKER` chunks per worker are in flight at a time, and another is submitted
+    as each one is yielded, so sources are read, and results held, only a little ahead of the
+    results consumed.
+    """
+    pending = chunks(sources, chunksize)
+    window = CHUNKS_PER_WORKER * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+
+        def submit(count: int) -> Iterator[Future]:
+            for start, chunk in islice(pending, count):
+                yield executor.submit(run_chunk, engine, start, chunk, budget)
+
+        if ordered:
+            queue = deque(submit(window))
+            while queue:
+                results = queue.popleft().result()
+                queue.extend(submit(1))
+                yield from results
+            return
+
+        not_done = set(submit(window))
+        while not_done:
+            done, not_done = wait(not_done, return_when=FIRST_COMPLETED)
+            not_done.update(submit(len(done)))
+            for future in done:
+                yield from future.result()
@@ -0,0 +1,137 @@
+import math
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Iterable, Iterator, Optional
+
+from pylox.exceptions import BudgetExceededError, ExceptionList, PyloxRuntimeError
+from pylox.interpreter import Interpreter
+from pylox.output import Output
+from pylox.stmt import BaseStmt, BlockStmt, ForStmt, WhileStmt, statement_token
+from pylox.token import Token
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Limits on a single run, each unlimited if None."""
+
+    # statements executed, counting each iteration of a loop as one more statement
+    max_statements: Optional[int] = None
+    # seconds from the start of the run
+    timeout: Optional[float] = None
+    # blocks nested inside each other
+    max_depth: Optional[int] = None
+
+
+class BudgetInterpreter(Interpreter):
+    """Tree-walking interpreter which stops a run once it goes over its `Budget`.
+
+    Statements are charged a block at a time and once per loop iteration, by counting down. Only
+    when `CHECK_EVERY` statements have been charged, or the budget of statements is used up, are
+    the limits checked and the clock read. Going over a limit raises `BudgetExceededError`, which
+    no block or loop recovers from. Only this subclass pays for the checks, `Interpreter` is
+    unchanged.
+    """
+
+    # statements charged between reading the clock
+    CHECK_EVERY = 256
+
+    def __init__(
+        self,
+        exception_list: ExceptionList,
+        output: Optional[Output] = None,
+        budget: Budget = Budget(),
+    ):
+        super().__init__(exception_list, output)
+        self.budget = budget
+        self.depth = 0
+        # statements charged up to the last check, and charged since then out of `_window`
+        self._checked = 0
+        self._window = self._countdown = 0
+        self._max_statements: float = math.inf
+        self._max_depth: float = math.inf
+        self._deadline = math.inf
+
+    @property
+    def statements(self) -> int:
+        """Statements charged so far in this run."""
+        return self._checked + self._window - self._countdown
+
+    def interpret(self, stmts: Iterable[BaseStmt]):
+        budget = self.budget
+        self.depth = self._checked = self._window = self._countdown = 0
+        self._max_statements = _or_inf(budget.max_statements)
+        self._max_depth = _or_inf(budget.max_depth)
+        self._deadline = math.inf if budget.timeout is None else perf_counter() + budget.timeout
+        super().interpret(self.charge_each(stmts))
+
+    def charge_each(self, stmts: Iterable[BaseStmt]) -> Iterator[BaseStmt]:
+        for stmt in stmts:
+            self._countdown -= 1
+            if self._countdown < 0:
+                self.check(statement_token(stmt))
+            yield stmt
+
+    def check(self, token: Optional[Token]):
+        """Fail if too many statements have been charged or time is up, else start a new window."""
+        self._checked += self._window - self._countdown
+        self._window = self._countdown = 0
+        if self._checked > self._max_statements:
+            raise BudgetExceededError(
+                token, f"Exceeded the budget of {self.budget.max_statements} statements."
+            )
+        if perf_counter() > self._deadline:
+            raise BudgetExceededError(
+                token, f"Exceeded the timeout of {self.budget.timeout} seconds."
+            )
+        # the window ends early enough to catch the statement which is one too many
+        self._window = self._countdown = int(
+            min(self.CHECK_EVERY, self._max_statements - self._checked)
+        )
+
+    def recover(self, error: PyloxRuntimeError):
+        if isinstance(error, BudgetExceededError):
+            raise error
+        super().recover(error)
+
+    def visitWhileStmt(self, stmt: WhileStmt):
+        while self.is_truthy(self.evaluate(stmt.condition)):
+            self._countdown -= 1
+            if self._countdown < 0:
+                self.check(stmt.keyword)
+            self.execute(stmt.body)
+
+    def execute_loop(self, stmt: ForStmt):
+        body, increment = stmt.body, stmt.increment
+        while self.is_truthy(self.evaluate(stmt.condition)):
+            self._countdown -= 1
+            if self._countdown < 0:
+                self.check(stmt.keyword)
+            if increment is None:
+                self.execute(body)
+                continue
+
+            try:
+                self.execute(body)
+                self.evaluate(increment)
+            except PyloxRuntimeError as e:
+                self.recover(e)
+
+    def visitBlockStmt(self, stmt: BlockStmt):
+        # charged all at once, as a check per statement costs far more than the statements
+        # themselves, so a block which goes over the budget is stopped before it starts
+        self._countdown -= len(stmt.statements)
+        if self._countdown < 0:
+            self.check(stmt.brace)
+        if self.depth >= self._max_depth:
+            raise BudgetExceededError(
+                stmt.brace, f"Exceeded the limit of {self.budget.max_depth} nested blocks."
+            )
+        self.depth += 1
+        try:
+            super().visitBlockStmt(stmt)
+        finally:
+            self.depth -= 1
+
+
+def _or_inf(limit: Optional[int]) -> float:
+    return math.inf if limit is None else limit
@@ -0,0 +1,113 @@
+import gc
+import hashlib
+import os
+import pickle
+import zlib
+from pathlib import Path
+from typing import Optional
+
+from pylox import __version__
+from pylox.stmt import BaseStmt
+
+# bump whenever the pickled form of the syntax tree changes, e.g. a node gains a field
+FORMAT_VERSION = 4
+SUFFIX = ".ast"
+
+
+def default_cache_dir() -> Path:
+    """`$XDG_CACHE_HOME/pylox`, or `~/.cache/pylox`."""
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "pylox"
+
+
+class ASTCache:
+    """Parsed statement lists stored on disk, keyed by a hash of their source.
+
+    Entries are compressed pickles named by the SHA-256 of the pylox version, the format version
+    and the source, so a new version of either never loads an old entry. Entries are written
+    atomically, and once the directory holds more than `max_size` bytes the least recently used
+    ones are removed. Any entry which can't be read is treated as missing.
+    """
+
+    def __init__(self, directory: str | os.PathLike, max_size: int = 64 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_size = max_size
+
+    @staticmethod
+    def key(source: str | bytes) -> str:
+        digest = hashlib.sha256(f"{__version__}\0{FORMAT_VERSION}\0".encode())
+        # the UTF-8 bytes of a memory-mapped script are hashed as they are
+        digest.update(
+            source.encode("utf-8", "surrogatepass") if isinstance(source, str) else source
+        )
+        return digest.hexdigest()
+
+    def path(self, source: str | bytes) -> Path:
+        return self.directory / f"{self.key(source)}{SUFFIX}"
+
+    def load(self, source: str | bytes) -> Optional[list[BaseStmt]]:
+        path = self.path(source)
+        # the cyclic garbage collector would run over and over on all the nodes being created,
+        # and there are no cycles among them, this makes loading several times faster
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            stmts = pickle.loads(zlib.decompress(path.read_bytes()))
+        except Exception:
+            # missing, or truncated, corrupted or from an incompatible tree
+            return None
+        finally:
+            if gc_enabled:
+                gc.enable()
+        if not isinstance(stmts, list):
+            return None
+
+        try:
+            # mark the entry as recently used for eviction
+            os.utime(path)
+        except OSError:
+            # e.g. a read-only cache, or the entry was evicted meanwhile, which doesn't make it
+            # any less valid
+            pass
+        return stmts
+
+    def store(self, source: str | bytes, stmts: list[BaseStmt]):
+        try:
+            data = zlib.compress(pickle.dumps(stmts, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        except RecursionError:
+            # too deeply nested to pickle, it is parsed every time instead
+            return
+
+        # only needed on a cache miss, and slow to import
+        import tempfile
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, self.path(source))
+            except BaseException:
+                os.unlink(tmp)
+                raise
+            self.evict()
+        except OSError:
+            # the cache is an optimization, running without it is always fine
+            pass
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in `max_size`."""
+        entries = []
+        for path in self.directory.glob(f"*{SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        size = sum(size for _, size, _ in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
@@ -0,0 +1,138 @@
+import bisect
+import enum
+from array import array
+
+
+class OpCode(enum.IntEnum):
+    """Instructions understood by `pylox.vm.VM`.
+
+    Instructions are one byte, optionally followed by a two byte big-endian operand.
+    """
+
+    CONSTANT = 0  # push constants[operand]
+    NIL = 1
+    TRUE = 2
+    FALSE = 3
+    POP = 4
+    DEFINE_GLOBAL = 5  # pop a value into the global named constants[operand]
+    GET_GLOBAL = 6
+    SET_GLOBAL = 7  # assign the value on top of the stack, leaving it there
+    DEFINE_LOCAL = 8  # pop a value into local slot operand
+    GET_LOCAL = 9
+    SET_LOCAL = 10
+    EQUAL = 11
+    NOT_EQUAL = 12
+    GREATER = 13
+    GREATER_EQUAL = 14
+    LESS = 15
+    LESS_EQUAL = 16
+    ADD = 17
+    SUBTRACT = 18
+    MULTIPLY = 19
+    DIVIDE = 20
+    NOT = 21
+    NEGATE = 22
+    PRINT = 23
+    JUMP = 24  # jump forward operand bytes
+    JUMP_IF_FALSE = 25  # as JUMP if the top of the stack is falsey, leaving it there
+    JUMP_IF_TRUE = 26
+    POP_JUMP_IF_FALSE = 27  # as JUMP if the popped top of the stack is falsey
+    LOOP = 28  # jump backward operand bytes
+    RETURN = 29
+
+
+# instructions followed by a two byte operand
+OPERAND_OPCODES = frozenset(
+    {
+        OpCode.CONSTANT,
+        OpCode.DEFINE_GLOBAL,
+        OpCode.GET_GLOBAL,
+        OpCode.SET_GLOBAL,
+        OpCode.DEFINE_LOCAL,
+        OpCode.GET_LOCAL,
+        OpCode.SET_LOCAL,
+        OpCode.JUMP,
+        OpCode.JUMP_IF_FALSE,
+        OpCode.JUMP_IF_TRUE,
+        OpCode.POP_JUMP_IF_FALSE,
+        OpCode.LOOP,
+    }
+)
+# instructions with a jump offset as their operand, and the direction of the jump
+JUMP_OPCODES = {
+    OpCode.JUMP: 1,
+    OpCode.JUMP_IF_FALSE: 1,
+    OpCode.JUMP_IF_TRUE: 1,
+    OpCode.POP_JUMP_IF_FALSE: 1,
+    OpCode.LOOP: -1,
+}
+
+
+class Chunk:
+    """A compiled sequence of bytecode instructions.
+
+    Besides the code and its constant pool, a chunk carries a run-length encoded line table,
+    mapping instruction offsets to source line numbers for runtime errors, and a handler table
+    of the code ranges compiled from blocks, which recover from runtime errors.
+    """
+
+    def __init__(self):
+        self.code = array("B")
+        self.constants: list[object] = []
+        # offsets at which the line number changes, and the line number from there on
+        self.line_offsets = array("I")
+        self.line_numbers = array("I")
+        # (start, end) offsets of each block, a runtime error raised in between is recorded
+        # and execution resumes at end
+        self.handlers: list[tuple[int, int]] = []
+        # number of local variable slots needed to run the chunk
+        self.local_count = 0
+
+        self._constant_index: dict[tuple[type, object], int] = {}
+
+    def write(self, byte: int, lineno: int):
+        if not self.line_numbers or self.line_numbers[-1] != lineno:
+            self.line_offsets.append(len(self.code))
+            self.line_numbers.append(lineno)
+        self.code.append(byte)
+
+    def add_constant(self, value: object) -> int:
+        # equal values of different types (1.0 and true) or signs (0.0 and -0.0) must not
+        # share an entry
+        key = (type(value), repr(value) if isinstance(value, float) else value)
+        if (idx := self._constant_index.get(key)) is None:
+            idx = self._constant_index[key] = len(self.constants)
+            self.constants.append(value)
+        return idx
+
+    def lineno(self, offset: int) -> int:
+        """Line number of the instruction at `offset`."""
+        return self.line_numbers[bisect.bisect_right(self.line_offsets, offset) - 1]
+
+    def disassemble(self, name: str = "chunk") -> str:
+        """Human readable listing of the instructions in the chunk."""
+        lines = [f"== {name} =="]
+        offset, prev_lineno = 0, None
+        while offset < len(self.code):
+            opcode = OpCode(self.code[offset])
+            lineno = self.lineno(offset)
+            line = f"{offset:04d} {'   |' if lineno == prev_lineno else f'{lineno:4d}'} "
+            line += f"{opcode.name:<17}"
+            prev_lineno = lineno
+
+            if opcode in OPERAND_OPCODES:
+                operand = self.code[offset + 1] << 8 | self.code[offset + 2]
+                offset += 3
+                if opcode in JUMP_OPCODES:
+                    line += f" {operand:4d} -> {offset + JUMP_OPCODES[opcode] * operand}"
+                elif opcode in (OpCode.DEFINE_LOCAL, OpCode.GET_LOCAL, OpCode.SET_LOCAL):
+                    line += f" {operand:4d}"
+                else:
+                    line += f" {operand:4d} {self.constants[operand]!r}"
+            else:
+                offset += 1
+            lines.append(line)
+
+        for start, end in self.handlers:
+            lines.append(f"handler {start:04d}-{end:04d}")
+        return "\n".join(lines)
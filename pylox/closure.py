@@ -0,0 +1,353 @@
+import math
+from operator import ge, gt, le, lt, mul, sub
+from typing import Callable, Iterable, Optional
+
+from pylox.environment import Environment, Frame
+from pylox.exceptions import ExceptionList, PyloxRuntimeError
+from pylox.expr import (
+    AssignExpr,
+    BaseExpr,
+    BinaryExpr,
+    GroupingExpr,
+    LiteralExpr,
+    LogicalExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from pylox.output import BufferedOutput, FlushPolicy, Output
+from pylox.rope import concat
+from pylox.stmt import (
+    BaseStmt,
+    BlockStmt,
+    ExpressionStmt,
+    ForStmt,
+    IfStmt,
+    PrintStmt,
+    VarStmt,
+    WhileStmt,
+)
+from pylox.token import TokenType
+
+Thunk = Callable[[], object]
+
+# operators which only apply to numbers
+ARITHMETIC = {
+    TokenType.GREATER: gt,
+    TokenType.GREATER_EQUAL: ge,
+    TokenType.LESS: lt,
+    TokenType.LESS_EQUAL: le,
+    TokenType.MINUS: sub,
+    TokenType.STAR: mul,
+}
+
+
+class ClosureInterpreter:
+    """Execute statements by first compiling them into a tree of Python closures.
+
+    Each node is visited once, producing a closure specialised for its kind (and operator) with
+    its operands already compiled, so running the program involves no visitor dispatch and no
+    operator matching. Behaves exactly like `pylox.interpreter.Interpreter`.
+    """
+
+    def __init__(self, exception_list: ExceptionList, output: Optional[Output] = None):
+        self.environment = Environment()
+        self.frame: Optional[Frame] = None
+        self.exception_list = exception_list
+        self.output = output or BufferedOutput(flush_policy=FlushPolicy.LINE)
+
+    def interpret(self, stmts: Iterable[BaseStmt]):
+        try:
+            for stmt in stmts:
+                self.compile(stmt)()
+        except PyloxRuntimeError as e:
+            self.exception_list.append(e)
+
+    def set_globals(self, values: dict[str, object]):
+        self.environment.values = values
+
+    def compile(self, node: BaseStmt | BaseExpr) -> Thunk:
+        return node.accept(self)
+
+    def visitExpressionStmt(self, stmt: ExpressionStmt) -> Thunk:
+        return self.compile(stmt.expression)
+
+    def visitPrintStmt(self, stmt: PrintStmt) -> Thunk:
+        expression, write = self.compile(stmt.expression), self.output.write
+
+        def print_():
+            write(expression())
+
+        return print_
+
+    def visitVarStmt(self, stmt: VarStmt) -> Thunk:
+        initializer = (lambda: None) if stmt.initializer is None else self.compile(stmt.initializer)
+
+        if stmt.slot is None:
+            name = stmt.name.lexeme
+
+            def define():
+                self.environment.define(name, initializer())
+
+        else:
+            slot = stmt.slot
+
+            def define():
+                self.frame.values[slot] = initializer()
+
+        return define
+
+    def visitBlockStmt(self, stmt: BlockStmt) -> Thunk:
+        body = tuple(self.compile(s) for s in stmt.statements)
+        exception_list = self.exception_list
+
+        if stmt.slots is None:
+
+            def block():
+                prev_environment = self.environment
+                try:
+                    self.environment = Environment(prev_environment)
+                    for s in body:
+                        s()
+                except PyloxRuntimeError as e:
+                    exception_list.append(e)
+                finally:
+                    self.environment = prev_environment
+
+        elif stmt.slots:
+            slots = stmt.slots
+
+            def block():
+                prev_frame = self.frame
+                try:
+                    self.frame = Frame(prev_frame, slots)
+                    for s in body:
+                        s()
+                except PyloxRuntimeError as e:
+                    exception_list.append(e)
+                finally:
+                    self.frame = prev_frame
+
+        else:
+
+            def block():
+                try:
+                    for s in body:
+                        s()
+                except PyloxRuntimeError as e:
+                    exception_list.append(e)
+
+        return block
+
+    def visitIfStmt(self, stmt: IfStmt) -> Thunk:
+        condition = self.compile(stmt.condition)
+        then_branch = self.compile(stmt.then_branch)
+
+        if stmt.else_branch is None:
+
+            def if_():
+                if (value := condition()) is not None and value is not False:
+                    then_branch()
+
+        else:
+            else_branch = self.compile(stmt.else_branch)
+
+            def if_():
+                if (value := condition()) is not None and value is not False:
+                    then_branch()
+                else:
+                    else_branch()
+
+        return if_
+
+    def visitWhileStmt(self, stmt: WhileStmt) -> Thunk:
+        condition = self.compile(stmt.condition)
+        body = self.compile(stmt.body)
+
+        def while_():
+            while (value := condition()) is not None and value is not False:
+                body()
+
+        return while_
+
+    def visitForStmt(self, stmt: ForStmt) -> Thunk:
+        condition = self.compile(stmt.condition)
+        body = self.compile(stmt.body)
+        exception_list = self.exception_list
+
+        if stmt.increment is None:
+
+            def loop():
+                while (value := condition()) is not None and value is not False:
+                    body()
+
+        else:
+            increment = self.compile(stmt.increment)
+
+            def loop():
+                while (value := condition()) is not None and value is not False:
+                    try:
+                        body()
+                        increment()
+                    except PyloxRuntimeError as e:
+                        exception_list.append(e)
+
+        if stmt.initializer is None:
+            return loop
+
+        initializer = self.compile(stmt.initializer)
+        slots = stmt.slots
+
+        def for_():
+            prev_environment, prev_frame = self.environment, self.frame
+            try:
+                if slots is None:
+                    self.environment = Environment(prev_environment)
+                elif slots:
+                    self.frame = Frame(prev_frame, slots)
+                initializer()
+                loop()
+            except PyloxRuntimeError as e:
+                exception_list.append(e)
+            finally:
+                self.environment, self.frame = prev_environment, prev_frame
+
+        return for_
+
+    def visitLiteralExpr(self, expr: LiteralExpr) -> Thunk:
+        value = expr.value
+        return lambda: value
+
+    def visitGroupingExpr(self, expr: GroupingExpr) -> Thunk:
+        return self.compile(expr.expression)
+
+    def visitVariableExpr(self, expr: VariableExpr) -> Thunk:
+        if expr.slot is None:
+            name = expr.name
+            return lambda: self.environment.get(name)
+
+        depth, slot = expr.depth, expr.slot
+        match depth:
+            case 0:
+                return lambda: self.frame.values[slot]
+            case 1:
+                return lambda: self.frame.enclosing.values[slot]
+            case _:
+
+                def get():
+                    frame = self.frame
+                    for _ in range(depth):
+                        frame = frame.enclosing
+                    return frame.values[slot]
+
+                return get
+
+    def visitAssignExpr(self, expr: AssignExpr) -> Thunk:
+        value_ = self.compile(expr.value)
+
+        if expr.slot is None:
+            name = expr.name
+
+            def assign():
+                value = value_()
+                self.environment.assign(name, value)
+                return value
+
+            return assign
+
+        depth, slot = expr.depth, expr.slot
+
+        def assign():
+            value = value_()
+            frame = self.frame
+            for _ in range(depth):
+                frame = frame.enclosing
+            frame.values[slot] = value
+            return value
+
+        return assign
+
+    def visitLogicalExpr(self, expr: LogicalExpr) -> Thunk:
+        left, right = self.compile(expr.left), self.compile(expr.right)
+
+        if expr.operator.token_type is TokenType.OR:
+
+            def logical():
+                if (value := left()) is not None and value is not False:
+                    return value
+                return right()
+
+        else:
+
+            def logical():
+                if (value := left()) is None or value is False:
+                    return value
+                return right()
+
+        return logical
+
+    def visitUnaryExpr(self, expr: UnaryExpr) -> Thunk:
+        operator, right = expr.operator, self.compile(expr.right)
+
+        match operator.token_type:
+            case TokenType.MINUS:
+
+                def unary():
+                    if type(value := right()) is not float:
+                        raise PyloxRuntimeError(operator, "Operand must be a number.")
+                    return -value
+
+            case TokenType.BANG:
+
+                def unary():
+                    return (value := right()) is None or value is False
+
+            case _:
+
+                def unary():
+                    right()
+
+        return unary
+
+    def visitBinaryExpr(self, expr: BinaryExpr) -> Thunk:
+        operator = expr.operator
+        left, right = self.compile(expr.left), self.compile(expr.right)
+
+        match operator.token_type:
+            case TokenType.BANG_EQUAL:
+                return lambda: left() != right()
+            case TokenType.EQUAL_EQUAL:
+                return lambda: left() == right()
+            case TokenType.PLUS:
+
+                def binary():
+                    a, b = left(), right()
+                    if type(a) is float and type(b) is float:
+                        return a + b
+                    return concat(a, b)
+
+            case TokenType.SLASH:
+
+                def binary():
+                    a, b = left(), right()
+                    if type(a) is not float or type(b) is not float:
+                        raise PyloxRuntimeError(operator, "Operand must be a number.")
+                    try:
+                        return a / b
+                    except ZeroDivisionError:
+                        return math.inf * a * b
+
+            case token_type if token_type in ARITHMETIC:
+                op = ARITHMETIC[token_type]
+
+                def binary():
+                    a, b = left(), right()
+                    if type(a) is float and type(b) is float:
+                        return op(a, b)
+                    raise PyloxRuntimeError(operator, "Operand must be a number.")
+
+            case _:
+
+                def binary():
+                    left(), right()
+
+        return binary
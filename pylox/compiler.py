@@ -0,0 +1,243 @@
+from typing import Iterable, Optional
+
+from pylox.chunk import Chunk, OpCode
+from pylox.exceptions import PyloxException
+from pylox.expr import (
+    AssignExpr,
+    BinaryExpr,
+    GroupingExpr,
+    LiteralExpr,
+    LogicalExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from pylox.stmt import (
+    BaseStmt,
+    BlockStmt,
+    ExpressionStmt,
+    ForStmt,
+    IfStmt,
+    PrintStmt,
+    VarStmt,
+    WhileStmt,
+)
+from pylox.token import TokenType
+
+BINARY_OPCODES = {
+    TokenType.BANG_EQUAL: OpCode.NOT_EQUAL,
+    TokenType.EQUAL_EQUAL: OpCode.EQUAL,
+    TokenType.GREATER: OpCode.GREATER,
+    TokenType.GREATER_EQUAL: OpCode.GREATER_EQUAL,
+    TokenType.LESS: OpCode.LESS,
+    TokenType.LESS_EQUAL: OpCode.LESS_EQUAL,
+    TokenType.MINUS: OpCode.SUBTRACT,
+    TokenType.PLUS: OpCode.ADD,
+    TokenType.SLASH: OpCode.DIVIDE,
+    TokenType.STAR: OpCode.MULTIPLY,
+}
+UNARY_OPCODES = {
+    TokenType.BANG: OpCode.NOT,
+    TokenType.MINUS: OpCode.NEGATE,
+}
+MAX_OPERAND = 0xFFFF
+
+
+class Compiler:
+    """Lower statements into a bytecode `Chunk` run by `pylox.vm.VM`.
+
+    Variables declared in blocks are given a slot in a flat array of locals, slots are reused
+    by sibling blocks once the block declaring them ends. Top-level declarations are globals.
+    """
+
+    def __init__(self):
+        self.chunk = Chunk()
+        # variables declared so far in each enclosing block, mapped to their slot
+        self.scopes: list[dict[str, int]] = []
+        self.local_count = 0
+        # line of the most recently compiled token, attributed to the instructions emitted
+        self.lineno = 1
+
+    def compile(self, stmts: Iterable[BaseStmt]) -> Chunk:
+        for stmt in stmts:
+            stmt.accept(self)
+        self.emit(OpCode.RETURN)
+        return self.chunk
+
+    def emit(self, opcode: OpCode, operand: Optional[int] = None):
+        self.chunk.write(opcode, self.lineno)
+        if operand is not None:
+            if operand > MAX_OPERAND:
+                raise PyloxException(f"Too many constants or locals in one chunk ({operand}).")
+            self.chunk.write(operand >> 8, self.lineno)
+            self.chunk.write(operand & 0xFF, self.lineno)
+
+    def emit_jump(self, opcode: OpCode) -> int:
+        """Emit a forward jump, returning the offset to patch its target in at."""
+        self.emit(opcode, 0)
+        return len(self.chunk.code) - 2
+
+    def patch_jump(self, offset: int):
+        """Point the jump whose operand is at `offset` to the next instruction."""
+        if (jump := len(self.chunk.code) - offset - 2) > MAX_OPERAND:
+            raise PyloxException("Too much code to jump over.")
+        self.chunk.code[offset] = jump >> 8
+        self.chunk.code[offset + 1] = jump & 0xFF
+
+    def emit_loop(self, loop_start: int):
+        if (jump := len(self.chunk.code) + 3 - loop_start) > MAX_OPERAND:
+            raise PyloxException("Loop body too large.")
+        self.emit(OpCode.LOOP, jump)
+
+    def resolve_local(self, name: str) -> Optional[int]:
+        for scope in reversed(self.scopes):
+            if (slot := scope.get(name)) is not None:
+                return slot
+        return None
+
+    def visitExpressionStmt(self, stmt: ExpressionStmt):
+        stmt.expression.accept(self)
+        self.emit(OpCode.POP)
+
+    def visitPrintStmt(self, stmt: PrintStmt):
+        stmt.expression.accept(self)
+        self.emit(OpCode.PRINT)
+
+    def visitVarStmt(self, stmt: VarStmt):
+        if stmt.initializer is None:
+            self.emit(OpCode.NIL)
+        else:
+            stmt.initializer.accept(self)
+
+        self.lineno = stmt.name.lineno
+        name = stmt.name.lexeme
+        if not self.scopes:
+            self.emit(OpCode.DEFINE_GLOBAL, self.chunk.add_constant(name))
+            return
+
+        # redeclaring a variable in the same block reuses its slot
+        scope = self.scopes[-1]
+        if (slot := scope.get(name)) is None:
+            slot = scope[name] = self.local_count
+            self.local_count += 1
+            self.chunk.local_count = max(self.chunk.local_count, self.local_count)
+        self.emit(OpCode.DEFINE_LOCAL, slot)
+
+    def visitBlockStmt(self, stmt: BlockStmt):
+        start = len(self.chunk.code)
+        self.scopes.append({})
+        for s in stmt.statements:
+            s.accept(self)
+        self.local_count -= len(self.scopes.pop())
+
+        if start != len(self.chunk.code):
+            self.chunk.handlers.append((start, len(self.chunk.code)))
+
+    def visitIfStmt(self, stmt: IfStmt):
+        stmt.condition.accept(self)
+        then_jump = self.emit_jump(OpCode.POP_JUMP_IF_FALSE)
+        stmt.then_branch.accept(self)
+
+        if stmt.else_branch is None:
+            self.patch_jump(then_jump)
+            return
+
+        else_jump = self.emit_jump(OpCode.JUMP)
+        self.patch_jump(then_jump)
+        stmt.else_branch.accept(self)
+        self.patch_jump(else_jump)
+
+    def visitWhileStmt(self, stmt: WhileStmt):
+        loop_start = len(self.chunk.code)
+        stmt.condition.accept(self)
+        exit_jump = self.emit_jump(OpCode.POP_JUMP_IF_FALSE)
+        stmt.body.accept(self)
+        self.emit_loop(loop_start)
+        self.patch_jump(exit_jump)
+
+    def visitForStmt(self, stmt: ForStmt):
+        start = len(self.chunk.code)
+        self.scopes.append({})
+        if stmt.initializer is not None:
+            stmt.initializer.accept(self)
+
+        loop_start = len(self.chunk.code)
+        stmt.condition.accept(self)
+        exit_jump = self.emit_jump(OpCode.POP_JUMP_IF_FALSE)
+
+        body_start = len(self.chunk.code)
+        stmt.body.accept(self)
+        if stmt.increment is not None:
+            stmt.increment.accept(self)
+            self.emit(OpCode.POP)
+            # an error in the body or increment resumes at the jump back to the condition
+            self.chunk.handlers.append((body_start, len(self.chunk.code)))
+
+        self.emit_loop(loop_start)
+        self.patch_jump(exit_jump)
+        self.local_count -= len(self.scopes.pop())
+
+        if stmt.initializer is not None:
+            self.chunk.handlers.append((start, len(self.chunk.code)))
+
+    def visitLiteralExpr(self, expr: LiteralExpr):
+        if expr.value is None:
+            self.emit(OpCode.NIL)
+        elif expr.value is True:
+            self.emit(OpCode.TRUE)
+        elif expr.value is False:
+            self.emit(OpCode.FALSE)
+        else:
+            self.emit(OpCode.CONSTANT, self.chunk.add_constant(expr.value))
+
+    def visitGroupingExpr(self, expr: GroupingExpr):
+        expr.expression.accept(self)
+
+    def visitVariableExpr(self, expr: VariableExpr):
+        self.lineno = expr.name.lineno
+        if (slot := self.resolve_local(expr.name.lexeme)) is not None:
+            self.emit(OpCode.GET_LOCAL, slot)
+        else:
+            self.emit(OpCode.GET_GLOBAL, self.chunk.add_constant(expr.name.lexeme))
+
+    def visitAssignExpr(self, expr: AssignExpr):
+        expr.value.accept(self)
+
+        self.lineno = expr.name.lineno
+        if (slot := self.resolve_local(expr.name.lexeme)) is not None:
+            self.emit(OpCode.SET_LOCAL, slot)
+        else:
+            self.emit(OpCode.SET_GLOBAL, self.chunk.add_constant(expr.name.lexeme))
+
+    def visitLogicalExpr(self, expr: LogicalExpr):
+        expr.left.accept(self)
+
+        self.lineno = expr.operator.lineno
+        if expr.operator.token_type is TokenType.OR:
+            end_jump = self.emit_jump(OpCode.JUMP_IF_TRUE)
+        else:
+            end_jump = self.emit_jump(OpCode.JUMP_IF_FALSE)
+        self.emit(OpCode.POP)
+        expr.right.accept(self)
+        self.patch_jump(end_jump)
+
+    def visitUnaryExpr(self, expr: UnaryExpr):
+        expr.right.accept(self)
+
+        self.lineno = expr.operator.lineno
+        if (opcode := UNARY_OPCODES.get(expr.operator.token_type)) is not None:
+            self.emit(opcode)
+        else:
+            self.emit(OpCode.POP)
+            self.emit(OpCode.NIL)
+
+    def visitBinaryExpr(self, expr: BinaryExpr):
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+        self.lineno = expr.operator.lineno
+        if (opcode := BINARY_OPCODES.get(expr.operator.token_type)) is not None:
+            self.emit(opcode)
+        else:
+            self.emit(OpCode.POP)
+            self.emit(OpCode.POP)
+            self.emit(OpCode.NIL)
@@ -0,0 +1,19 @@
+# choices the command line accepts, kept apart from the modules they select so that parsing its
+# options, or printing its help, doesn't import the interpreter
+import enum
+
+# execution engines, keyed by the name accepted by `pylox --engine`, as "module:class" paths so
+# only the engine which is used gets imported
+ENGINES = {
+    "tree": "pylox.interpreter:Interpreter",
+    "stack": "pylox.stack:StackInterpreter",
+    "closure": "pylox.closure:ClosureInterpreter",
+    "vm": "pylox.vm:VM",
+    "python": "pylox.transpiler:PythonInterpreter",
+}
+
+
+class FlushPolicy(enum.Enum):
+    SIZE = "size"  # once the buffer holds `buffer_size` characters
+    LINE = "line"  # after every line, like `click.echo`
+    EXIT = "exit"  # only when explicitly flushed, at the end of a run
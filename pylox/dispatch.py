@@ -0,0 +1,22 @@
+class DispatchTable(dict):
+    """Visitor methods for one node class, keyed by visitor class.
+
+    Entries are looked up with `getattr` on first use by each visitor class, following the
+    `visit<NodeClassName>` naming contract, and reused for every visit after that. A visitor class
+    without the method, whose instances provide it, e.g. by assigning it in `__init__` or from
+    `__getattr__`, gets an entry which looks it up on the visitor at every visit instead.
+    """
+
+    def __init__(self, node_name: str):
+        self.method_name = f"visit{node_name}"
+
+    def __missing__(self, visitor_cls: type):
+        method = getattr(visitor_cls, self.method_name, None)
+        if method is None:
+            method_name = self.method_name
+
+            def method(visitor: object, node: object) -> object:
+                return getattr(visitor, method_name)(node)
+
+        self[visitor_cls] = method
+        return method
@@ -5,18 +5,18 @@ from pylox.token import Token
 
 
 class Environment:
-    def __init__(self, enclosing: Optional[dict] = None):
+    def __init__(self, enclosing: Optional["Environment"] = None):
         self.enclosing = enclosing
         self.values = {}
 
     def assign(self, name: Token, value: object):
-        if name.lexeme in self.values:
-            self.values[name.lexeme] = value
-            return
-
-        if self.enclosing is not None:
-            self.enclosing.assign(name, value)
-            return
+        # walks the chain in a loop, so deeply nested scopes don't use up the Python stack
+        environment = self
+        while environment is not None:
+            if name.lexeme in environment.values:
+                environment.values[name.lexeme] = value
+                return
+            environment = environment.enclosing
 
         raise PyloxRuntimeError(name, f"Undefined variable '{name.lexeme}'.")
 
@@ -24,10 +24,20 @@ class Environment:
         self.values[name] = value
 
     def get(self, name: Token) -> object:
-        if name.lexeme in self.values:
-            return self.values[name.lexeme]
-
-        if self.enclosing is not None:
-            return self.enclosing.get(name)
+        environment = self
+        while environment is not None:
+            if name.lexeme in environment.values:
+                return environment.values[name.lexeme]
+            environment = environment.enclosing
 
         raise PyloxRuntimeError(name, f"Undefined variable '{name.lexeme}'.")
+
+
+class Frame:
+    """Fixed-size storage for the variables declared in a resolved block."""
+
+    __slots__ = ("enclosing", "values")
+
+    def __init__(self, enclosing: Optional["Frame"], size: int):
+        self.enclosing = enclosing
+        self.values: list[object] = [None] * size
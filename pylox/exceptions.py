@@ -1,4 +1,5 @@
 from collections import UserList
+from typing import Optional
 
 from pylox.token import Token, TokenType
 
@@ -51,3 +52,19 @@ class PyloxRuntimeError(PyloxException):
     def __init__(self, token: Token, msg: str):
         self.token = token
         self.msg = msg
+
+
+class BudgetExceededError(PyloxRuntimeError):
+    """Raised when a run goes over one of the limits of its `pylox.budget.Budget`.
+
+    Unlike other runtime errors it isn't caught by the enclosing block, it ends the run.
+    """
+
+    def __init__(self, token: Optional[Token], msg: str):
+        self.token = token
+        self.msg = msg
+
+    def __str__(self) -> str:
+        if self.token is None:
+            return f"Error: {self.msg}"
+        return f"[Line {self.token.lineno}] Error: {self.msg}"
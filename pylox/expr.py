@@ -1,12 +1,19 @@
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Optional
 
+from pylox.dispatch import DispatchTable
 from pylox.token import Token
 
 
 class BaseExpr:
+    _dispatch: DispatchTable
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = DispatchTable(cls.__name__)
+
     def accept(self, visitor: type) -> Any:
-        return getattr(visitor, f"visit{self.__class__.__name__}")(self)
+        return self._dispatch[visitor.__class__](visitor, self)
 
 
 @dataclass(slots=True)
@@ -35,12 +42,17 @@ class UnaryExpr(BaseExpr):
 @dataclass(slots=True)
 class VariableExpr(BaseExpr):
     name: Token
+    # set by the resolver for block-local variables, see `pylox.resolver.Resolver`
+    depth: Optional[int] = None
+    slot: Optional[int] = None
 
 
 @dataclass(slots=True)
 class AssignExpr(BaseExpr):
     name: Token
     value: BaseExpr
+    depth: Optional[int] = None
+    slot: Optional[int] = None
 
 
 @dataclass(slots=True)
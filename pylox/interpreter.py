@@ -1,8 +1,7 @@
 import math
+from typing import Iterable, Optional
 
-import click
-
-from pylox.environment import Environment
+from pylox.environment import Environment, Frame
 from pylox.exceptions import ExceptionList, PyloxRuntimeError
 from pylox.expr import (
     AssignExpr,
@@ -14,22 +13,52 @@ from pylox.expr import (
     UnaryExpr,
     VariableExpr,
 )
-from pylox.stmt import BaseStmt, BlockStmt, ExpressionStmt, IfStmt, PrintStmt, VarStmt, WhileStmt
+from pylox.output import BufferedOutput, FlushPolicy, Output
+from pylox.rope import concat
+from pylox.stmt import (
+    BaseStmt,
+    BlockStmt,
+    ExpressionStmt,
+    ForStmt,
+    IfStmt,
+    PrintStmt,
+    VarStmt,
+    WhileStmt,
+)
 from pylox.token import Token, TokenType
 
 
 class Interpreter:
-    def __init__(self, exception_list: ExceptionList):
-        self.environment = Environment()
+    # creates the scopes of unresolved variables, see `pylox.stats.CountingInterpreter`
+    environment_class = Environment
+
+    def __init__(self, exception_list: ExceptionList, output: Optional[Output] = None):
+        self.environment = self.environment_class()
+        # variables of resolved blocks, see `pylox.resolver.Resolver`
+        self.frame: Optional[Frame] = None
         self.exception_list = exception_list
+        # unbuffered by default, a caller passing a buffered sink flushes it
+        self.output = output or BufferedOutput(flush_policy=FlushPolicy.LINE)
 
-    def interpret(self, stmts: list[BaseStmt]):
+    def interpret(self, stmts: Iterable[BaseStmt]):
         try:
             for stmt in stmts:
                 self.execute(stmt)
         except PyloxRuntimeError as e:
             self.exception_list.append(e)
 
+    def recover(self, error: PyloxRuntimeError):
+        """Record an error caught by a block or loop, which then carries on with the next statement.
+
+        Overridden to let errors which should end the whole run propagate instead, see
+        `pylox.budget.BudgetInterpreter`.
+        """
+        self.exception_list.append(error)
+
+    def set_globals(self, values: dict[str, object]):
+        """Use `values` as the global variables, which running statements then updates."""
+        self.environment.values = values
+
     def visitLogicalExpr(self, expr: LogicalExpr) -> object:
         left = self.evaluate(expr.left)
 
@@ -46,6 +75,40 @@ class Interpreter:
         while self.is_truthy(self.evaluate(stmt.condition)):
             self.execute(stmt.body)
 
+    def visitForStmt(self, stmt: ForStmt):
+        if stmt.initializer is None:
+            self.execute_loop(stmt)
+            return
+
+        # the initializer is scoped to the loop, and a runtime error ends the loop only
+        prev_environment, prev_frame = self.environment, self.frame
+        try:
+            if stmt.slots is None:
+                self.environment = self.environment_class(prev_environment)
+            elif stmt.slots:
+                self.frame = Frame(prev_frame, stmt.slots)
+
+            self.execute(stmt.initializer)
+            self.execute_loop(stmt)
+        except PyloxRuntimeError as e:
+            self.recover(e)
+        finally:
+            self.environment, self.frame = prev_environment, prev_frame
+
+    def execute_loop(self, stmt: ForStmt):
+        body, increment = stmt.body, stmt.increment
+        while self.is_truthy(self.evaluate(stmt.condition)):
+            if increment is None:
+                self.execute(body)
+                continue
+
+            # a runtime error in the body skips the increment, but not the next iteration
+            try:
+                self.execute(body)
+                self.evaluate(increment)
+            except PyloxRuntimeError as e:
+                self.recover(e)
+
     def visitIfStmt(self, stmt: IfStmt):
         if self.is_truthy(self.evaluate(stmt.condition)):
             self.execute(stmt.then_branch)
@@ -54,28 +117,50 @@ class Interpreter:
 
     def visitAssignExpr(self, expr: AssignExpr) -> object:
         value = self.evaluate(expr.value)
-        self.environment.assign(expr.name, value)
+        if expr.slot is None:
+            self.environment.assign(expr.name, value)
+            return value
+
+        frame = self.frame
+        for _ in range(expr.depth):
+            frame = frame.enclosing
+        frame.values[expr.slot] = value
         return value
 
     def visitBlockStmt(self, stmt: BlockStmt):
-        self.execute_block(stmt.statements, Environment(self.environment))
+        if stmt.slots is None:
+            self.execute_block(stmt.statements, self.environment_class(self.environment))
+        elif stmt.slots:
+            self.execute_frame(stmt.statements, Frame(self.frame, stmt.slots))
+        else:
+            # nothing is declared in the block, so it can share the enclosing frame
+            self.execute_frame(stmt.statements, self.frame)
 
     def visitVarStmt(self, stmt: VarStmt):
         value = None
         if stmt.initializer is not None:
             value = self.evaluate(stmt.initializer)
 
-        self.environment.define(stmt.name.lexeme, value)
+        if stmt.slot is None:
+            self.environment.define(stmt.name.lexeme, value)
+        else:
+            self.frame.values[stmt.slot] = value
 
     def visitPrintStmt(self, stmt: PrintStmt):
         value = self.evaluate(stmt.expression)
-        click.echo(value)
+        self.output.write(value)
 
     def visitExpressionStmt(self, stmt: ExpressionStmt):
         self.evaluate(stmt.expression)
 
     def visitVariableExpr(self, expr: VariableExpr) -> object:
-        return self.environment.get(expr.name)
+        if expr.slot is None:
+            return self.environment.get(expr.name)
+
+        frame = self.frame
+        for _ in range(expr.depth):
+            frame = frame.enclosing
+        return frame.values[expr.slot]
 
     def visitLiteralExpr(self, expr: LiteralExpr) -> object:
         return expr.value
@@ -129,8 +214,7 @@ class Interpreter:
                 if isinstance(left, float) and isinstance(right, float):
                     self.check_number_operands(expr.operator, left, right)
                     return left + right
-                elif isinstance(left, str) and isinstance(right, str):
-                    return left + right
+                return concat(left, right)
             case TokenType.SLASH:
                 # need to handle division by zero
                 try:
@@ -156,10 +240,22 @@ class Interpreter:
             for stmt in stmts:
                 self.execute(stmt)
         except PyloxRuntimeError as e:
-            self.exception_list.append(e)
+            self.recover(e)
         finally:
             self.environment = prev_environment
 
+    def execute_frame(self, stmts: list[BaseStmt], frame: Optional[Frame]):
+        prev_frame = self.frame
+        try:
+            self.frame = frame
+
+            for stmt in stmts:
+                self.execute(stmt)
+        except PyloxRuntimeError as e:
+            self.recover(e)
+        finally:
+            self.frame = prev_frame
+
     @staticmethod
     def is_truthy(obj: object) -> bool:
         match obj:
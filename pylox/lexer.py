@@ -1,22 +1,97 @@
+import re
 import string
+from typing import Iterator, Optional, TextIO
 
 from pylox.exceptions import ExceptionList, LexicalError
-from pylox.token import RESERVED_TOKENS, Token, TokenType
+from pylox.token import (
+    KEYWORDS,
+    RESERVED_TOKENS,
+    BytesInterner,
+    Interner,
+    LineIndex,
+    Token,
+    TokenArray,
+    TokenType,
+)
+
+# single and double character operators, keyed by their lexeme
+OPERATORS = {
+    "(": TokenType.LEFT_PAREN,
+    ")": TokenType.RIGHT_PAREN,
+    "{": TokenType.LEFT_BRACE,
+    "}": TokenType.RIGHT_BRACE,
+    ",": TokenType.COMMA,
+    ".": TokenType.DOT,
+    "-": TokenType.MINUS,
+    "+": TokenType.PLUS,
+    ";": TokenType.SEMICOLON,
+    "*": TokenType.STAR,
+    "/": TokenType.SLASH,
+    "!": TokenType.BANG,
+    "!=": TokenType.BANG_EQUAL,
+    "=": TokenType.EQUAL,
+    "==": TokenType.EQUAL_EQUAL,
+    "<": TokenType.LESS,
+    "<=": TokenType.LESS_EQUAL,
+    ">": TokenType.GREATER,
+    ">=": TokenType.GREATER_EQUAL,
+}
+
+# every position in the source is matched by exactly one of these alternatives, the order
+# matters: comments must be tried before the '/' operator, and a terminated string before
+# an unterminated one. '\0' terminates comments and strings just like the EOF sentinel used
+# by `Lexer.peek`. Newlines are whitespace, line numbers are found from offsets when needed.
+MASTER_PATTERN = re.compile(
+    r"""
+    (?P<WHITESPACE>[ \t\r\n]+)
+    |(?P<IDENTIFIER>[A-Za-z_][A-Za-z0-9_]*)
+    |(?P<COMMENT>//[^\n\0]*)
+    |(?P<OPERATOR>[!=<>]=?|[(){},.\-+;*/])
+    |(?P<NUMBER>[0-9]+(?:\.[0-9]+)?)
+    |(?P<STRING>"[^"\0]*")
+    |(?P<UNTERMINATED>"[^"\0]*)
+    |(?P<ERROR>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+# the same for UTF-8 bytes, where an unexpected character may take several bytes
+BYTES_MASTER_PATTERN = re.compile(
+    MASTER_PATTERN.pattern.replace(
+        "(?P<ERROR>.)", r"(?P<ERROR>[\xc0-\xff][\x80-\xbf]*|.)"
+    ).encode(),
+    re.VERBOSE | re.DOTALL,
+)
+BYTES_KEYWORDS = {word.encode(): token_type for word, token_type in KEYWORDS.items()}
+BYTES_OPERATORS = {lexeme.encode(): token_type for lexeme, token_type in OPERATORS.items()}
 
 
 class Lexer:
     """Scan source code capturing valid tokens."""
 
-    def __init__(self, source: str, exception_list: ExceptionList):
+    # shares lexemes and literals between the tokens, see `pylox.token.Interner`
+    interner_class = Interner
+    bytes_interner_class = BytesInterner
+
+    def __init__(self, source: str | bytes, exception_list: ExceptionList):
         self.source = source
         self.tokens: list[Token] = []
         self.exception_list = exception_list
+        if isinstance(source, str):
+            self.interner = self.interner_class()
+        else:
+            self.interner = self.bytes_interner_class()
+        # line numbers of the tokens, looked up from their offsets when needed, built by the scan
+        # so bytes, which are indexed right away, are only searched for newlines once
+        self.lines: Optional[LineIndex] = None
 
         self._current = 0
         self._start = 0
+        # line the source starts on, for one scanned in pieces
         self._lineno = 1
 
     def scan(self) -> list[Token]:
+        self.lines = LineIndex(self.source)
+
         # loop through source scanning for tokens
         while self._current < len(self.source):
             self._start = self._current
@@ -27,7 +102,7 @@ class Lexer:
 
         # the last token should be the EOF
         if len(self.tokens) != 0 and self.tokens[-1].token_type is not TokenType.EOF:
-            eof_token = Token(TokenType.EOF, "", None, self._lineno)
+            eof_token = Token(TokenType.EOF, "", None, None, len(self.source), self.lines)
             self.tokens.append(eof_token)
 
         return self.tokens
@@ -57,12 +132,9 @@ class Lexer:
                 self.add_token(TokenType.SEMICOLON)
             case "*":
                 self.add_token(TokenType.STAR)
-            case " " | "\r" | "\t":
+            case " " | "\r" | "\t" | "\n":
                 # skip whitespace
                 pass
-            case "\n":
-                # newline increment line number
-                self._lineno += 1
             # one or two character tokens
             case "!":
                 # default to single character token
@@ -104,11 +176,9 @@ class Lexer:
                     self.add_token(TokenType.SLASH)
             case '"':
                 # string is a sequence of chars between double quotes
-                while (next_char := self.peek()) not in ['"', "\0"]:
+                while self.peek() not in ['"', "\0"]:
                     # peek at the char under the cursor if it isn't EOF or end '"'
-                    # we increment the cursor (also handle newline chars)
-                    if next_char == "\n":
-                        self._lineno += 1
+                    # we increment the cursor
                     self._current += 1
 
                 # we've consumed all the chars, check that the char under the cursor
@@ -116,7 +186,7 @@ class Lexer:
                 if self.peek() == "\0":
                     # handle unterminated string
                     # throw an error
-                    raise LexicalError(self._lineno, "", "Unterminated string")
+                    raise LexicalError(self.lines.lineno(self._current), "", "Unterminated string")
 
                 # increment the cursor, and add the string token to list of tokens
                 self._current += 1
@@ -148,7 +218,7 @@ class Lexer:
                     self.add_token(token_type)
                 else:
                     # raise error for unexpected characters
-                    raise LexicalError(self._lineno, "", "Unexpected character")
+                    raise LexicalError(self.lines.lineno(self._start), "", "Unexpected character")
 
     @staticmethod
     def is_alpha(char: str) -> bool:
@@ -172,5 +242,153 @@ class Lexer:
         return "\0"
 
     def add_token(self, token_type: TokenType, literal: object = None):
-        token = Token(token_type, self.source[self._start : self._current], literal, self._lineno)
-        self.tokens.append(token)
+        lexeme = self.source[self._start : self._current]
+        match token_type:
+            case TokenType.NUMBER:
+                lexeme, literal = self.interner.number(lexeme)
+            case TokenType.STRING:
+                lexeme, literal = self.interner.string(lexeme)
+            case _:
+                lexeme = self.interner.name(lexeme)
+        self.tokens.append(Token(token_type, lexeme, literal, None, self._start, self.lines))
+
+
+class RegexLexer(Lexer):
+    """Scan source code using a single compiled master regex.
+
+    Produces the same tokens and lexical errors as `Lexer`, but dispatches on whole lexemes
+    matched by `MASTER_PATTERN` rather than on one character at a time. The source may also be
+    UTF-8 bytes, such as a memory-mapped file, which is matched by `BYTES_MASTER_PATTERN`.
+    """
+
+    def scan(self) -> list[Token]:
+        self.tokens.extend(self.scan_buffer(self.source))
+        self._current = len(self.source)
+
+        # the last token should be the EOF
+        if len(self.tokens) != 0 and self.tokens[-1].token_type is not TokenType.EOF:
+            eof_token = Token(TokenType.EOF, "", None, None, len(self.source), self.lines)
+            self.tokens.append(eof_token)
+
+        return self.tokens
+
+    def scan_compact(self) -> TokenArray:
+        """Scan the source into a `TokenArray` rather than a list of `Token`s."""
+        source = self.source
+        tokens = TokenArray(source, self.interner)
+        lines = tokens.lines
+        if isinstance(source, str):
+            pattern, keywords, operators = MASTER_PATTERN, KEYWORDS, OPERATORS
+        else:
+            pattern, keywords, operators = BYTES_MASTER_PATTERN, BYTES_KEYWORDS, BYTES_OPERATORS
+
+        for match in pattern.finditer(source):
+            kind = match.lastgroup
+            if kind == "WHITESPACE":
+                continue
+            elif kind == "IDENTIFIER":
+                token_type = keywords.get(match.group(), TokenType.IDENTIFIER)
+            elif kind == "OPERATOR":
+                token_type = operators[match.group()]
+            elif kind == "NUMBER":
+                token_type = TokenType.NUMBER
+            elif kind == "STRING":
+                token_type = TokenType.STRING
+            elif kind == "COMMENT":
+                continue
+            elif kind == "UNTERMINATED":
+                lineno = lines.lineno(match.end())
+                self.exception_list.append(LexicalError(lineno, "", "Unterminated string"))
+                continue
+            else:
+                lineno = lines.lineno(match.start())
+                self.exception_list.append(LexicalError(lineno, "", "Unexpected character"))
+                continue
+
+            tokens.append(token_type, match.start(), match.end())
+
+        self._start = self._current = len(source)
+
+        # the last token should be the EOF
+        if len(tokens) != 0:
+            tokens.append(TokenType.EOF, len(source), len(source))
+
+        return tokens
+
+    def scan_buffer(self, buffer: str, final: bool = True) -> Iterator[Token]:
+        """Yield the tokens in `buffer`, leaving `_start` where scanning stopped.
+
+        Unless `final`, scanning stops before the first lexeme which more input could still
+        extend (e.g. an identifier, or a number missing its fractional part), so the caller
+        can prepend `buffer[_start:]` to the next chunk of input.
+        """
+        # a lexeme reaching the end of the buffer may continue in the next chunk, and so may a
+        # number one char short of it ("1." followed by "5")
+        limit = len(buffer) + 1 if final else len(buffer) - 1
+        self.lines = lines = LineIndex(buffer, self._lineno)
+        name, number, string = self.interner.name, self.interner.number, self.interner.string
+        pattern = MASTER_PATTERN if isinstance(buffer, str) else BYTES_MASTER_PATTERN
+
+        self._start = len(buffer)
+        for match in pattern.finditer(buffer):
+            kind = match.lastgroup
+            if (end := match.end()) >= limit and (end > limit or kind == "NUMBER"):
+                self._start = match.start()
+                break
+
+            if kind == "WHITESPACE":
+                continue
+            elif kind == "IDENTIFIER":
+                lexeme = name(match.group())
+                token_type = KEYWORDS.get(lexeme, TokenType.IDENTIFIER)
+                yield Token(token_type, lexeme, None, None, match.start(), lines)
+            elif kind == "OPERATOR":
+                lexeme = name(match.group())
+                yield Token(OPERATORS[lexeme], lexeme, None, None, match.start(), lines)
+            elif kind == "NUMBER":
+                lexeme, value = number(match.group())
+                yield Token(TokenType.NUMBER, lexeme, value, None, match.start(), lines)
+            elif kind == "STRING":
+                lexeme, value = string(match.group())
+                yield Token(TokenType.STRING, lexeme, value, None, match.start(), lines)
+            elif kind == "COMMENT":
+                continue
+            elif kind == "UNTERMINATED":
+                lineno = lines.lineno(match.end())
+                self.exception_list.append(LexicalError(lineno, "", "Unterminated string"))
+            else:
+                lineno = lines.lineno(match.start())
+                self.exception_list.append(LexicalError(lineno, "", "Unexpected character"))
+
+
+class StreamingLexer(RegexLexer):
+    """Scan source code incrementally as it is read from a text stream."""
+
+    def __init__(self, script: TextIO, exception_list: ExceptionList, chunk_size: int = 65536):
+        super().__init__("", exception_list)
+        self.script = script
+        self.chunk_size = chunk_size
+
+    def stream(self) -> Iterator[Token]:
+        """Yield tokens as soon as the input read so far determines them."""
+        emitted = False
+        # reading up to a newline hands over input as it arrives on a pipe, while the size
+        # limit bounds the buffer when a script contains very long lines
+        while chunk := self.script.readline(self.chunk_size):
+            self.source = self.source[self._start :] + chunk
+            for token in self.scan_buffer(self.source, final=False):
+                emitted = True
+                yield token
+            # indexing the newlines of each chunk right away lets go of it, and finds the line
+            # the input left over for the next one starts on
+            self._lineno = self.lines.lineno(self._start)
+
+        rest = self.source[self._start :]
+        for token in self.scan_buffer(rest):
+            emitted = True
+            yield token
+        self.source = ""
+
+        # the last token should be the EOF
+        if emitted:
+            yield Token(TokenType.EOF, "", None, None, len(rest), self.lines)
@@ -1,23 +1,112 @@
-from typing import Optional, TextIO
-
-import click
+import codecs
+import importlib
+import mmap
+import os
+from functools import partial
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, TextIO
 
+from pylox.constants import ENGINES
 from pylox.exceptions import ExceptionList
-from pylox.interpreter import Interpreter
-from pylox.lexer import Lexer
-from pylox.parser import Parser
+from pylox.output import BufferedOutput, FlushPolicy, Output
+from pylox.resolver import Resolver
+from pylox.stmt import BaseStmt
+
+if TYPE_CHECKING:
+    from pylox.batch import RunResult
+    from pylox.budget import Budget
+    from pylox.cache import ASTCache
+    from pylox.program import Program
+
+# script files at least this large are memory-mapped and scanned as bytes, rather than read into
+# a string first
+MMAP_MIN_SIZE = 16 * 1024 * 1024
+
+
+def load_engine(name: str) -> type:
+    module, _, attr = ENGINES[name].partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+def map_script(script: TextIO) -> Optional[mmap.mmap]:
+    """Memory-map a large UTF-8 script file, or None if it should be read as text.
+
+    The bytes of the file are only the same source as its text when no newlines need translating,
+    so files containing a carriage return are read as text instead.
+    """
+    try:
+        fileno = script.fileno()
+    except OSError:
+        # not backed by a file
+        return None
+    if os.fstat(fileno).st_size < MMAP_MIN_SIZE or codecs.lookup(script.encoding).name != "utf-8":
+        return None
+
+    mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    if mapped.find(b"\r") != -1:
+        mapped.close()
+        return None
+    return mapped
 
 
 class Lox:
     """Lox interpreter"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        engine: str = "tree",
+        optimize: bool = False,
+        output: Optional[Output] = None,
+        cache: Optional["ASTCache"] = None,
+        profile: bool = False,
+        stats: bool = False,
+        budget: Optional["Budget"] = None,
+    ):
         self.exception_list = ExceptionList([])
-        self.interpreter = Interpreter(self.exception_list)
+        # printed lines are buffered, and flushed at the latest when a run ends
+        self.output = output or BufferedOutput()
+        # runtime counters, see `pylox.stats.RuntimeStats`, only kept if `stats`
+        self.stats = None
+        # limits on each run, see `pylox.budget.Budget`
+        self.budget = budget
+        if (profile or stats or budget is not None) and engine != "tree":
+            raise ValueError("Only the tree engine can be profiled, counted or given a budget.")
+        if profile + stats + (budget is not None) > 1:
+            raise ValueError("Profiling, counting and budgets can't be combined.")
+
+        if profile:
+            from pylox.profiler import ProfilingInterpreter
+
+            # per-line statistics are in `interpreter.stats`
+            self.interpreter = ProfilingInterpreter(self.exception_list, self.output)
+        elif stats:
+            from pylox.stats import CountingInterpreter
+
+            self.interpreter = CountingInterpreter(self.exception_list, self.output)
+            self.stats = self.interpreter.stats
+        elif budget is not None:
+            from pylox.budget import BudgetInterpreter
+
+            self.interpreter = BudgetInterpreter(self.exception_list, self.output, budget)
+        else:
+            self.interpreter = load_engine(engine)(self.exception_list, self.output)
+        self.optimizer = None
+        if optimize:
+            from pylox.optimizer import Optimizer
+
+            self.optimizer = Optimizer()
+        # parsed scripts, see `run_script`
+        self.cache = cache
+        # global variables of the scripts run by `run_async`
+        self.async_globals: dict[str, object] = {}
 
     def run_prompt(self):
         """Run the pylox interactive prompt."""
+        # click, and the modules only some commands need, are imported where they are used so
+        # embedding or running a script doesn't pay for them at startup
+        import click
+
         while True:
+            # output is flushed after each line
             self.run(input("> "))
             for exc in self.exception_list:
                 click.echo(exc)
@@ -25,22 +114,208 @@ class Lox:
 
     def run_script(self, script: TextIO):
         """Run a script file."""
-        self.run(script.read())
+        if not script.seekable():
+            # pipes are executed as they arrive rather than read into memory up front
+            self.run_stream(script)
+        elif (mapped := map_script(script)) is not None:
+            with mapped:
+                self.run(mapped, cached=True)
+        else:
+            self.run(script.read(), cached=True)
+        self.exception_list.raise_if_not_empty()
+
+    def run_stream(self, script: TextIO):
+        """Run each top-level statement of a script as soon as it has been read."""
+        from pylox.lexer import StreamingLexer
+        from pylox.parser import Parser, TokenStream
+
+        lexer = StreamingLexer(script, self.exception_list)
+
+        parser = Parser(TokenStream(lexer.stream()), self.exception_list)
+        stmts = (stmt for stmt in parser.iter_parse() if stmt is not None)
+        if self.optimizer is not None:
+            stmts = self.optimizer.iter_optimize(stmts)
+        stmts = Resolver().iter_resolve(stmts)
+
+        try:
+            self.interpreter.interpret(stmts)
+        finally:
+            self.output.flush()
+        # a runtime error stops execution, the rest of the script is still checked for errors
+        for _ in stmts:
+            pass
+
+    def disassemble_script(self, script: TextIO):
+        """Print the bytecode a script file compiles to."""
+        import click
+
+        from pylox.compiler import Compiler
+
+        stmts = self.parse(script.read(), cached=True)
+        self.exception_list.raise_if_not_empty()
+
+        for i, stmt in enumerate(stmts):
+            click.echo(Compiler().compile([stmt]).disassemble(f"statement {i}"))
+
+    def transpile_script(self, script: TextIO):
+        """Print the Python source a script file transpiles to."""
+        import click
+
+        from pylox.transpiler import Transpiler
+
+        stmts = self.parse(script.read(), cached=True)
         self.exception_list.raise_if_not_empty()
 
-    def run(self, source: str):
-        lexer = Lexer(source, self.exception_list)
-        tokens = lexer.scan()
+        for i, stmt in enumerate(stmts):
+            click.echo(f"# statement {i}")
+            click.echo(Transpiler().transpile([stmt]))
+
+    def run(self, source: str | bytes, cached: bool = False):
+        try:
+            self.interpreter.interpret(self.parse(source, cached))
+        finally:
+            self.output.flush()
+
+    async def run_async(self, source: str, yield_every: int = 1000, time_slice: float = 0.001):
+        """Run source code as a coroutine, yielding to the event loop as it goes.
+
+        Control is given back every `yield_every` statements or `time_slice` seconds, whichever
+        comes first. Always uses the tree-walking interpreter, with its own global variables which
+        are kept between `run_async` calls but aren't shared with `run`.
+
+        Each call runs on a new `AsyncInterpreter` sharing only the global variables, so calls can
+        run concurrently on one event loop, each with its own scopes and yield intervals.
+        """
+        from pylox.aio import AsyncInterpreter
+
+        interpreter = AsyncInterpreter(self.exception_list, self.output, yield_every, time_slice)
+        interpreter.set_globals(self.async_globals)
+        try:
+            await interpreter.interpret(self.parse(source))
+        finally:
+            self.output.flush()
+
+    def compile(self, source: str) -> "Program":
+        """Scan, parse and resolve source code once, to run it many times.
+
+        Raises the scanning and parsing errors, if there are any. Each run of the program gets the
+        budget of this `Lox`, if it has one.
+        """
+        from pylox.program import Program
+
+        stmts = self.parse(source)
+        try:
+            self.exception_list.raise_if_not_empty()
+        finally:
+            self.exception_list.clear()
+        engine = type(self.interpreter)
+        if self.budget is not None:
+            engine = partial(engine, budget=self.budget)
+        return Program(stmts, engine)
+
+    @staticmethod
+    def run_many(
+        sources: Iterable[str],
+        engine: str = "tree",
+        workers: Optional[int] = None,
+        chunksize: int = 1,
+        ordered: bool = True,
+        budget: Optional["Budget"] = None,
+    ) -> Iterator["RunResult"]:
+        """Run independent sources across a pool of processes, see `pylox.batch.run_many`."""
+        from pylox.batch import run_many
+
+        return run_many(sources, engine, workers, chunksize, ordered, budget)
 
-        parser = Parser(tokens, self.exception_list)
-        stmts = [stmt for stmt in parser.parse() if stmt is not None]
+    def parse(self, source: str | bytes, cached: bool = False) -> list[BaseStmt]:
+        """Scan, parse and resolve source code, collecting any errors.
 
-        self.interpreter.interpret(stmts)
+        If `cached`, scanning and parsing are skipped when the statements are in the AST cache,
+        and otherwise the statements are stored there, provided there were no errors.
+        """
+        cache = self.cache if cached else None
+        if cache is None or (stmts := cache.load(source)) is None:
+            from pylox.lexer import RegexLexer
+            from pylox.parser import Parser
+
+            errors = len(self.exception_list)
+            lexer = RegexLexer(source, self.exception_list)
+            tokens = lexer.scan()
+
+            parser = Parser(tokens, self.exception_list)
+            stmts = [stmt for stmt in parser.parse() if stmt is not None]
+            if cache is not None and len(self.exception_list) == errors:
+                cache.store(source, stmts)
+
+        if self.optimizer is not None:
+            stmts = self.optimizer.optimize(stmts)
+        Resolver().resolve(stmts)
+
+        return stmts
 
     @classmethod
-    def main(cls, script: Optional[TextIO]):
-        """Run either the interactive prompt or a file."""
-        if script is None:
-            cls().run_prompt()
-        else:
-            cls().run_script(script)
+    def main(
+        cls,
+        script: Optional[TextIO],
+        engine: str = "tree",
+        disassemble: bool = False,
+        dump_python: bool = False,
+        optimize: bool = False,
+        flush: str = FlushPolicy.SIZE.value,
+        cache_dir: Optional[str] = None,
+        profile: bool = False,
+        profile_json: Optional[TextIO] = None,
+        stats: bool = False,
+        budget: Optional["Budget"] = None,
+    ):
+        """Run either the interactive prompt or a file, caching parsed files in `cache_dir`.
+
+        If `profile`, a report of the hottest lines is printed to stderr afterwards, and if
+        `profile_json` is given the full profile is written to it. If `stats`, the runtime
+        counters are printed to stderr afterwards. Each run is limited by `budget`, if given.
+        """
+        import click
+
+        from pylox.cache import ASTCache
+
+        output = BufferedOutput(flush_policy=FlushPolicy(flush))
+        cache = ASTCache(cache_dir) if cache_dir is not None else None
+        lox = cls(
+            engine, optimize, output, cache, profile or profile_json is not None, stats, budget
+        )
+        try:
+            if script is None:
+                lox.run_prompt()
+            elif disassemble:
+                lox.disassemble_script(script)
+            elif dump_python:
+                lox.transpile_script(script)
+            else:
+                lox.run_script(script)
+        finally:
+            if lox.optimizer is not None:
+                click.echo(f"Optimizer removed {lox.optimizer.removed} nodes.", err=True)
+            if profile or profile_json is not None:
+                lox.report_profile(script, profile, profile_json)
+            if lox.stats is not None:
+                from pylox.stats import format_stats
+
+                click.echo(format_stats(lox.stats), err=True)
+
+    def report_profile(self, script: Optional[TextIO], show: bool, json_file: Optional[TextIO]):
+        import json
+
+        import click
+
+        from pylox.profiler import format_profile, profile_to_dict
+
+        stats = self.interpreter.stats
+        if show:
+            source = None
+            if script is not None and script.seekable():
+                script.seek(0)
+                source = script.read()
+            click.echo(format_profile(stats, source), err=True)
+        if json_file is not None:
+            json.dump(profile_to_dict(stats), json_file, indent=2)
+            json_file.write("\n")
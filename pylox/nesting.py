@@ -0,0 +1,43 @@
+from typing import Generator, Optional
+
+# a recursive step which yields the step of each nested call, and is sent back its result
+Nested = Generator[Optional["Nested"], object, object]
+
+
+def run_nested(step: Optional[Nested]) -> object:
+    """Run a recursive step, and all the steps nested in it, on an explicit stack.
+
+    A step written as a generator calls another with ``result = yield other(...)`` rather than
+    ``result = other(...)``, so nesting is only limited by memory and not by the Python stack.
+    An exception raised by a nested step is thrown into the step which yielded it, where it can be
+    caught as it would be around a call. Yielding None, which is what a call which doesn't
+    recurse returns, is sent back None.
+    """
+    if step is None:
+        return None
+
+    stack = [step]
+    value = error = None
+    while stack:
+        try:
+            if error is None:
+                nested = stack[-1].send(value)
+            else:
+                thrown, error = error, None
+                nested = stack[-1].throw(thrown)
+        except StopIteration as stop:
+            stack.pop()
+            value = stop.value
+            continue
+        except Exception as e:
+            stack.pop()
+            error = e
+            continue
+
+        value = None
+        if nested is not None:
+            stack.append(nested)
+
+    if error is not None:
+        raise error
+    return value
@@ -0,0 +1,226 @@
+import dataclasses
+from types import GeneratorType
+from typing import Iterable, Iterator, Optional
+
+from pylox.exceptions import ExceptionList, PyloxRuntimeError
+from pylox.expr import (
+    AssignExpr,
+    BaseExpr,
+    BinaryExpr,
+    GroupingExpr,
+    LiteralExpr,
+    LogicalExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from pylox.interpreter import Interpreter
+from pylox.nesting import Nested, run_nested
+from pylox.rope import flatten
+from pylox.stmt import (
+    BaseStmt,
+    BlockStmt,
+    ExpressionStmt,
+    ForStmt,
+    IfStmt,
+    PrintStmt,
+    VarStmt,
+    WhileStmt,
+    statement_token,
+)
+from pylox.token import TokenType
+
+# fields holding the operands of each kind of expression, which are optimized before it
+OPERANDS = {
+    AssignExpr: ("value",),
+    BinaryExpr: ("left", "right"),
+    GroupingExpr: ("expression",),
+    LogicalExpr: ("left", "right"),
+    UnaryExpr: ("right",),
+}
+
+
+def count_nodes(node: Optional[BaseExpr | BaseStmt]) -> int:
+    """Number of expression and statement nodes in the tree rooted at `node`."""
+    count = 0
+    nodes = [] if node is None else [node]
+    while nodes:
+        node = nodes.pop()
+        count += 1
+        for field in dataclasses.fields(node):
+            value = getattr(node, field.name)
+            if isinstance(value, (BaseExpr, BaseStmt)):
+                nodes.append(value)
+            elif isinstance(value, list):
+                nodes.extend(value)
+    return count
+
+
+class Optimizer:
+    """Simplify statements before they are resolved and executed.
+
+    Constant subexpressions are folded by evaluating them with an `Interpreter`, so they get
+    exactly the runtime semantics, unless evaluating them raises a runtime error, which is then
+    left to happen at runtime. Grouping wrappers are dropped, branches on a constant condition are
+    replaced by the branch taken, and loops which never run and statements without effects are
+    removed. The number of nodes removed is counted in `removed`.
+
+    Statements with children are optimized by steps which yield the step of each child, see
+    `pylox.nesting.run_nested`, and expressions from a work list, so how deeply a program nests
+    is only limited by memory. Expression visitors are given an expression whose operands have
+    already been optimized.
+    """
+
+    def __init__(self):
+        self.removed = 0
+        self._evaluator = Interpreter(ExceptionList([]))
+
+    def optimize(self, stmts: Iterable[BaseStmt]) -> list[BaseStmt]:
+        return list(self.iter_optimize(stmts))
+
+    def iter_optimize(self, stmts: Iterable[BaseStmt]) -> Iterator[BaseStmt]:
+        """Optimize each statement as it is consumed, dropping the ones removed entirely."""
+        for stmt in stmts:
+            if (stmt := run_nested(self.statement(stmt))) is not None:
+                yield stmt
+
+    def statement(self, stmt: BaseStmt) -> Nested:
+        """Step returning what replaces `stmt`, or None if it is removed."""
+        optimized = stmt.accept(self)
+        if isinstance(optimized, GeneratorType):
+            # a statement with children
+            optimized = yield optimized
+        return optimized
+
+    def expression(self, expr: BaseExpr) -> BaseExpr:
+        # operands are pushed to be optimized first, and then their expression
+        work = [(expr, False)]
+        optimized = []
+        while work:
+            expr, ready = work.pop()
+            operands = OPERANDS.get(type(expr), ())
+            if operands and not ready:
+                work.append((expr, True))
+                work.extend((getattr(expr, name), False) for name in reversed(operands))
+                continue
+
+            for name in reversed(operands):
+                setattr(expr, name, optimized.pop())
+            optimized.append(expr.accept(self))
+        return optimized.pop()
+
+    def replace(self, node: BaseExpr | BaseStmt, replacement: Optional[BaseExpr | BaseStmt]):
+        self.removed += count_nodes(node) - count_nodes(replacement)
+        return replacement
+
+    def fold(self, expr: BaseExpr) -> BaseExpr:
+        """Replace an expression of literals by its value, if it can be evaluated."""
+        try:
+            value = self._evaluator.evaluate(expr)
+        except PyloxRuntimeError:
+            return expr
+        # literals are plain strings, never ropes
+        return self.replace(expr, LiteralExpr(flatten(value)))
+
+    @staticmethod
+    def is_truthy(expr: LiteralExpr) -> bool:
+        return expr.value is not None and expr.value is not False
+
+    def visitExpressionStmt(self, stmt: ExpressionStmt) -> Optional[BaseStmt]:
+        stmt.expression = self.expression(stmt.expression)
+        if isinstance(stmt.expression, LiteralExpr):
+            return self.replace(stmt, None)
+        return stmt
+
+    def visitPrintStmt(self, stmt: PrintStmt) -> BaseStmt:
+        stmt.expression = self.expression(stmt.expression)
+        return stmt
+
+    def visitVarStmt(self, stmt: VarStmt) -> BaseStmt:
+        if stmt.initializer is not None:
+            stmt.initializer = self.expression(stmt.initializer)
+        return stmt
+
+    def visitBlockStmt(self, stmt: BlockStmt) -> Nested:
+        statements = []
+        for s in stmt.statements:
+            if (s := (yield self.statement(s))) is not None:
+                statements.append(s)
+
+        if not statements:
+            return self.replace(stmt, None)
+        stmt.statements = statements
+        return stmt
+
+    def visitIfStmt(self, stmt: IfStmt) -> Nested:
+        stmt.condition = self.expression(stmt.condition)
+        stmt.then_branch = yield self.branch(stmt.then_branch)
+        if stmt.else_branch is not None:
+            stmt.else_branch = yield self.branch(stmt.else_branch)
+
+        if not isinstance(stmt.condition, LiteralExpr):
+            return stmt
+        branch = stmt.then_branch if self.is_truthy(stmt.condition) else stmt.else_branch
+        return self.replace(stmt, branch)
+
+    def visitWhileStmt(self, stmt: WhileStmt) -> Nested:
+        stmt.condition = self.expression(stmt.condition)
+        if isinstance(stmt.condition, LiteralExpr) and not self.is_truthy(stmt.condition):
+            return self.replace(stmt, None)
+
+        stmt.body = yield self.branch(stmt.body)
+        return stmt
+
+    def visitForStmt(self, stmt: ForStmt) -> Nested:
+        # an initializer, or increment, is kept even without effects, since the loop recovers
+        # from runtime errors differently with one
+        if stmt.initializer is not None:
+            stmt.initializer = yield self.branch(stmt.initializer)
+        stmt.condition = self.expression(stmt.condition)
+        if isinstance(stmt.condition, LiteralExpr) and not self.is_truthy(stmt.condition):
+            if stmt.initializer is None:
+                return self.replace(stmt, None)
+            return self.replace(stmt, BlockStmt([stmt.initializer], brace=stmt.keyword))
+
+        if stmt.increment is not None:
+            stmt.increment = self.expression(stmt.increment)
+        stmt.body = yield self.branch(stmt.body)
+        return stmt
+
+    def branch(self, stmt: BaseStmt) -> Nested:
+        """Optimize a statement which can't be removed from its parent, only emptied."""
+        if (optimized := (yield self.statement(stmt))) is None:
+            optimized = BlockStmt([], brace=statement_token(stmt))
+            self.removed -= 1
+        return optimized
+
+    def visitLiteralExpr(self, expr: LiteralExpr) -> BaseExpr:
+        return expr
+
+    def visitGroupingExpr(self, expr: GroupingExpr) -> BaseExpr:
+        self.removed += 1
+        return expr.expression
+
+    def visitVariableExpr(self, expr: VariableExpr) -> BaseExpr:
+        return expr
+
+    def visitAssignExpr(self, expr: AssignExpr) -> BaseExpr:
+        return expr
+
+    def visitLogicalExpr(self, expr: LogicalExpr) -> BaseExpr:
+        if not isinstance(expr.left, LiteralExpr):
+            return expr
+
+        # the right operand is only evaluated if the left one doesn't decide the result
+        if self.is_truthy(expr.left) is (expr.operator.token_type is TokenType.OR):
+            return self.replace(expr, expr.left)
+        return self.replace(expr, expr.right)
+
+    def visitUnaryExpr(self, expr: UnaryExpr) -> BaseExpr:
+        if isinstance(expr.right, LiteralExpr):
+            return self.fold(expr)
+        return expr
+
+    def visitBinaryExpr(self, expr: BinaryExpr) -> BaseExpr:
+        if isinstance(expr.left, LiteralExpr) and isinstance(expr.right, LiteralExpr):
+            return self.fold(expr)
+        return expr
@@ -0,0 +1,79 @@
+import abc
+import math
+import sys
+from typing import Optional, TextIO
+
+from pylox.constants import FlushPolicy
+
+
+def stringify(value: object) -> str:
+    """Text printed for a Lox value, as `click.echo` formats it."""
+    return "" if value is None else str(value)
+
+
+class Output(abc.ABC):
+    """Destination of the lines printed by Lox `print` statements."""
+
+    @abc.abstractmethod
+    def write(self, value: object):
+        """Print one value, on a line of its own."""
+
+    def flush(self):
+        pass
+
+
+class BufferedOutput(Output):
+    """Collect printed lines, writing them to a text stream according to a flush policy.
+
+    The stream defaults to whatever `sys.stdout` is when the buffer is flushed.
+    """
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        flush_policy: FlushPolicy = FlushPolicy.SIZE,
+        buffer_size: int = 65536,
+    ):
+        self.stream = stream
+        self.flush_policy = flush_policy
+        self._buffer: list[str] = []
+        self._size = 0
+        match flush_policy:
+            case FlushPolicy.SIZE:
+                self._limit = buffer_size
+            case FlushPolicy.LINE:
+                self._limit = 0
+            case FlushPolicy.EXIT:
+                self._limit = math.inf
+
+    def write(self, value: object):
+        text = stringify(value)
+        self._buffer.append(text)
+        self._size += len(text) + 1
+        if self._size >= self._limit:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+
+        stream = self.stream if self.stream is not None else sys.stdout
+        self._buffer.append("")
+        text = "\n".join(self._buffer)
+        self._buffer.clear()
+        self._size = 0
+        stream.write(text)
+        stream.flush()
+
+
+class ListOutput(Output):
+    """Keep printed lines in memory, for embedding the interpreter."""
+
+    def __init__(self):
+        self.lines: list[str] = []
+
+    def write(self, value: object):
+        self.lines.append(stringify(value))
+
+    def getvalue(self) -> str:
+        return "".join(f"{line}\n" for line in self.lines)
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 from pylox.exceptions import ExceptionList, SyntacticalError
 from pylox.expr import (
@@ -11,39 +11,115 @@ from pylox.expr import (
     UnaryExpr,
     VariableExpr,
 )
-from pylox.stmt import BaseStmt, BlockStmt, ExpressionStmt, IfStmt, PrintStmt, VarStmt, WhileStmt
+from pylox.nesting import Nested, run_nested
+from pylox.stmt import (
+    BaseStmt,
+    BlockStmt,
+    ExpressionStmt,
+    ForStmt,
+    IfStmt,
+    PrintStmt,
+    VarStmt,
+    WhileStmt,
+)
 from pylox.token import Token, TokenType
 
+# binding powers of infix operators, (left, right), the higher the tighter. An operand between
+# two operators goes to the one whose power on its side is higher, so the powers of a
+# left-associative operator increase to the right, and those of assignment, which is
+# right-associative, decrease.
+INFIX_BINDING_POWERS: dict[TokenType, tuple[int, int]] = {
+    TokenType.EQUAL: (2, 1),
+    TokenType.OR: (3, 4),
+    TokenType.AND: (5, 6),
+    TokenType.BANG_EQUAL: (7, 8),
+    TokenType.EQUAL_EQUAL: (7, 8),
+    TokenType.GREATER: (9, 10),
+    TokenType.GREATER_EQUAL: (9, 10),
+    TokenType.LESS: (9, 10),
+    TokenType.LESS_EQUAL: (9, 10),
+    TokenType.MINUS: (11, 12),
+    TokenType.PLUS: (11, 12),
+    TokenType.SLASH: (13, 14),
+    TokenType.STAR: (13, 14),
+}
+# any other token ends an expression
+NO_POWER = (0, 0)
+# the operand of a prefix operator is only a primary, or another prefix operation
+PREFIX_OPERATORS = frozenset([TokenType.BANG, TokenType.MINUS])
+PREFIX_BINDING_POWER = 15
+
+
+class TokenStream:
+    """Lookahead buffer over a lazily produced sequence of tokens.
+
+    Supports the indexing `Parser` does on a list of tokens, while only holding on to the
+    tokens which haven't been released yet.
+    """
+
+    def __init__(self, tokens: Iterable[Token]):
+        self._tokens = iter(tokens)
+        self._buffer: list[Token] = []
+        self._offset = 0  # index of the first buffered token
+
+    def __getitem__(self, idx: int) -> Token:
+        if (idx := idx - self._offset) < 0:
+            raise IndexError("token has already been released")
+
+        while idx >= len(self._buffer):
+            try:
+                self._buffer.append(next(self._tokens))
+            except StopIteration:
+                raise IndexError("token stream exhausted") from None
+        return self._buffer[idx]
+
+    def release(self, idx: int):
+        """Drop every buffered token before index `idx`."""
+        if (n := idx - self._offset) > 0:
+            del self._buffer[:n]
+            self._offset = idx
+
 
 class Parser:
-    def __init__(self, tokens: list[Token], exception_list: ExceptionList):
+    def __init__(self, tokens: list[Token] | TokenStream, exception_list: ExceptionList):
         self.tokens = tokens
         self.exception_list = exception_list
 
         self._current = 0
 
     def parse(self) -> list[BaseStmt]:
-        statements: list[BaseStmt] = []
-        while self.peek().token_type is not TokenType.EOF:
-            statements.append(self.declaration())
+        return list(self.iter_parse())
 
-        return statements
+    def iter_parse(self) -> Iterator[BaseStmt]:
+        """Parse and yield one top-level declaration at a time."""
+        release = getattr(self.tokens, "release", None)
+        while self.peek().token_type is not TokenType.EOF:
+            yield run_nested(self.declaration())
+            if release is not None:
+                # keep the previous token around for `synchronize`
+                release(self._current - 1)
 
     def peek(self, n: int = 0) -> Optional[Token]:
-        if (idx := self._current + n) >= 0 and idx < len(self.tokens):
-            return self.tokens[idx]
+        if (idx := self._current + n) >= 0:
+            try:
+                return self.tokens[idx]
+            except IndexError:
+                pass
         return None
 
     def consume(self) -> Token:
         self._current += 1
         return self.peek(-1)
 
-    def declaration(self) -> BaseStmt:
+    # statements can nest arbitrarily deep, so the ones which contain statements are parsed by
+    # steps which yield the step parsing each nested statement, see `pylox.nesting.run_nested`
+
+    def declaration(self) -> Nested:
         try:
             if (token := self.consume()).token_type is TokenType.VAR:
                 return self.var_declaration(self.consume())
             else:
-                return self.statement(token)
+                return (yield self.statement(token))
         except SyntacticalError as e:
             self.exception_list.append(e)
             self.synchronize()
@@ -62,25 +138,25 @@ class Parser:
         self._current += 1  # consume ';'
         return VarStmt(name_token, initializer)
 
-    def statement(self, token: Token) -> BaseStmt:
+    def statement(self, token: Token) -> Nested:
         if token.token_type is TokenType.FOR:
-            return self.for_statement()
+            return (yield self.for_statement(token))
 
         if token.token_type is TokenType.IF:
-            return self.if_statement()
+            return (yield self.if_statement(token))
 
         if token.token_type is TokenType.PRINT:
-            return self.print_statement(self.consume())
+            return self.print_statement(token)
 
         if token.token_type is TokenType.WHILE:
-            return self.while_statement()
+            return (yield self.while_statement(token))
 
         if token.token_type is TokenType.LEFT_BRACE:
-            return BlockStmt(self.block_statement())
+            return BlockStmt((yield self.block_statement()), brace=token)
 
         return self.expression_statement(token)
 
-    def for_statement(self) -> BaseStmt:
+    def for_statement(self, keyword: Token) -> Nested:
         if (token := self.peek()).token_type is not TokenType.LEFT_PAREN:
             raise SyntacticalError(token, "Expected '(' after 'for'.")
         else:
@@ -109,21 +185,13 @@ class Parser:
                 raise SyntacticalError(token, "Expected ')' after expression.")
             self._current += 1
 
-        body = self.statement(self.consume())
-
-        if increment is not None:
-            body = BlockStmt([body, increment])
+        body = yield self.statement(self.consume())
 
         if condition is None:
             condition = LiteralExpr(True)
-        body = WhileStmt(condition, body)
-
-        if initializer is not None:
-            body = BlockStmt([initializer, body])
+        return ForStmt(initializer, condition, increment, body, keyword=keyword)
 
-        return body
-
-    def while_statement(self) -> BaseStmt:
+    def while_statement(self, keyword: Token) -> Nested:
         if (token := self.peek()).token_type is not TokenType.LEFT_PAREN:
             raise SyntacticalError(token, "Expected '(' after 'while'.")
         else:
@@ -136,11 +204,11 @@ class Parser:
         else:
             self._current += 1
 
-        body = self.statement(self.consume())
+        body = yield self.statement(self.consume())
 
-        return WhileStmt(condition, body)
+        return WhileStmt(condition, body, keyword)
 
-    def if_statement(self) -> BaseStmt:
+    def if_statement(self, keyword: Token) -> Nested:
         if (token := self.peek()).token_type is not TokenType.LEFT_PAREN:
             raise SyntacticalError(token, "Expected '(' after 'if'.")
         self._current += 1  # consume
@@ -151,19 +219,19 @@ class Parser:
             raise SyntacticalError(token, "Expected '(' after 'if'.")
         self._current += 1  # consume
 
-        then_branch = self.statement(self.consume())
+        then_branch = yield self.statement(self.consume())
         else_branch = None
         if (token := self.peek()).token_type is TokenType.ELSE:
             self._current += 1
-            else_branch = self.statement(self.consume())
+            else_branch = yield self.statement(self.consume())
 
-        return IfStmt(condition, then_branch, else_branch)
+        return IfStmt(condition, then_branch, else_branch, keyword)
 
-    def block_statement(self) -> list[BaseStmt]:
+    def block_statement(self) -> Nested:
         statements = []
 
         while self.peek().token_type is not TokenType.RIGHT_BRACE:
-            statements.append(self.declaration())
+            statements.append((yield self.declaration()))
 
         if (token := self.peek()).token_type is not TokenType.RIGHT_BRACE:
             raise SyntacticalError(token, "Expected '}' after block.")
@@ -171,13 +239,13 @@ class Parser:
         self._current += 1  # consume '}'
         return statements
 
-    def print_statement(self, token: Token) -> BaseStmt:
-        value = self.expression(token)
+    def print_statement(self, keyword: Token) -> BaseStmt:
+        value = self.expression(self.consume())
         if (next_token := self.peek()).token_type is not TokenType.SEMICOLON:
             raise SyntacticalError(next_token, "Expected ';' after value.")
         else:
             self._current += 1  # consume the semicolon
-        return PrintStmt(value)
+        return PrintStmt(value, keyword)
 
     def expression_statement(self, token: Token) -> BaseStmt:
         value = self.expression(token)
@@ -185,101 +253,66 @@ class Parser:
             raise SyntacticalError(next_token, "Expected ';' after value.")
         else:
             self._current += 1  # consume the semicolon
-        return ExpressionStmt(value)
+        return ExpressionStmt(value, token)
 
     def expression(self, token: Token) -> BaseExpr:
-        return self.assignment(token)
-
-    def assignment(self, token: Token) -> BaseExpr:
-        expr = self.or_(token)
-
-        if (next_token := self.peek()).token_type is TokenType.EQUAL:
-            equals = self.consume()
-            value = self.assignment(self.consume())
-
-            if isinstance(expr, VariableExpr):
-                name = expr.name
-                return AssignExpr(name, value)
-
-            raise SyntacticalError(equals, "Invalid assignment target.")
-
-        return expr
-
-    def or_(self, token: Token) -> BaseExpr:
-        expr = self.and_(token)
-
-        while (self.peek()).token_type is TokenType.OR:
-            operator = self.consume()
-            right = self.and_(self.consume())
-            expr = LogicalExpr(expr, operator, right)
-
-        return expr
-
-    def and_(self, token: Token) -> BaseExpr:
-        expr = self.equality(token)
-
-        while (self.peek()).token_type is TokenType.AND:
-            operator = self.consume()
-            right = self.equality(self.consume())
-            expr = LogicalExpr(expr, operator, right)
-
-        return expr
-
-    def equality(self, token: Token) -> BaseExpr:
-        expr = self.comparison(token)
-
-        while self.peek().token_type in [TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL]:
-            operator = self.consume()
-            right = self.comparison(self.consume())
-            expr = BinaryExpr(expr, operator, right)
-
-        return expr
-
-    def comparison(self, token: Token) -> BaseExpr:
-        expr = self.term(token)
-
-        while self.peek().token_type in [
-            TokenType.GREATER,
-            TokenType.GREATER_EQUAL,
-            TokenType.LESS,
-            TokenType.LESS_EQUAL,
-        ]:
-            operator = self.consume()
-            right = self.term(self.consume())
-            expr = BinaryExpr(expr, operator, right)
-
-        return expr
-
-    def term(self, token: Token) -> BaseExpr:
-        expr = self.factor(token)  # 4
-
-        while self.peek().token_type in [TokenType.MINUS, TokenType.PLUS]:
-            # token under the cursor is a '+' or '-' operator
-            operator = self.consume()
-            right = self.factor(self.consume())
-            expr = BinaryExpr(expr, operator, right)
-
-        return expr
-
-    def factor(self, token: Token) -> BaseExpr:
-        expr = self.unary(token)
-
-        while self.peek().token_type in [TokenType.SLASH, TokenType.STAR]:
-            # token under the cursor is a '/' or '*' operator
-            operator = self.consume()
-            right = self.unary(self.consume())
-            expr = BinaryExpr(expr, operator, right)
-
-        return expr
-
-    def unary(self, token: Token) -> BaseExpr:
-        if token.token_type in [TokenType.BANG, TokenType.MINUS]:
-            # token is an '!' or '-' operator
-            right = self.unary(self.consume())
-            return UnaryExpr(token, right)
-
-        # token is not an operator so must be a primary
-        return self.primary(token)
+        """Parse the expression starting at `token`, by precedence climbing.
+
+        Operators still waiting for their right operand, and open parentheses, are kept on a stack
+        along with the binding power to go back to once they are complete, so nesting doesn't use
+        up the Python stack.
+        """
+        pending: list[tuple[Optional[BaseExpr], Token, int]] = []
+        min_power = 0
+        while True:
+            # prefix operators and open parentheses before an operand
+            while True:
+                if token.token_type in PREFIX_OPERATORS:
+                    pending.append((None, token, min_power))
+                    min_power = PREFIX_BINDING_POWER
+                elif token.token_type is TokenType.LEFT_PAREN:
+                    pending.append((None, token, min_power))
+                    min_power = 0
+                else:
+                    break
+                token = self.consume()
+
+            expr = self.primary(token)
+
+            # infix operators after the operand, or else the pending operators it completes
+            while True:
+                operator = self.peek()
+                left_power, right_power = INFIX_BINDING_POWERS.get(operator.token_type, NO_POWER)
+                if left_power > min_power:
+                    self._current += 1  # consume the operator
+                    pending.append((expr, operator, min_power))
+                    min_power = right_power
+                    token = self.consume()
+                    break
+
+                if not pending:
+                    return expr
+                left, operator, min_power = pending.pop()
+                expr = self.complete(left, operator, expr)
+
+    def complete(self, left: Optional[BaseExpr], operator: Token, right: BaseExpr) -> BaseExpr:
+        """Node for `operator` once its right operand has been parsed, None `left` if prefix."""
+        match operator.token_type:
+            case TokenType.EQUAL:
+                if isinstance(left, VariableExpr):
+                    return AssignExpr(left.name, right)
+                raise SyntacticalError(operator, "Invalid assignment target.")
+            case TokenType.OR | TokenType.AND:
+                return LogicalExpr(left, operator, right)
+            case TokenType.LEFT_PAREN:
+                if (next_token := self.peek()).token_type is not TokenType.RIGHT_PAREN:
+                    raise SyntacticalError(next_token, "Expected ')' after expression.")
+                self._current += 1  # consume the ')'
+                return GroupingExpr(right)
+            case _ if left is None:
+                return UnaryExpr(operator, right)
+            case _:
+                return BinaryExpr(left, operator, right)
 
     def primary(self, token: Token) -> BaseExpr:
         """Highest precendence, bottom of grammar productions."""
@@ -292,12 +325,6 @@ class Parser:
                 return LiteralExpr(None)
             case TokenType.NUMBER | TokenType.STRING:
                 return LiteralExpr(token.literal)
-            case TokenType.LEFT_PAREN:
-                expr = self.expression()
-                if (next_token := self.peek()).token_type is not TokenType.RIGHT_PAREN:
-                    raise SyntacticalError(next_token, "Expected ')' after expression.")
-                self._current += 1  # consume the ')'
-                return GroupingExpr(expr)
             case TokenType.IDENTIFIER:
                 return VariableExpr(token)
             case _:
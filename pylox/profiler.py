@@ -0,0 +1,136 @@
+import dataclasses
+from collections import Counter
+from time import perf_counter
+from typing import Callable, Optional
+
+from pylox.exceptions import ExceptionList
+from pylox.expr import BaseExpr
+from pylox.interpreter import Interpreter
+from pylox.output import Output
+from pylox.stmt import BaseStmt, BlockStmt, ForStmt
+from pylox.token import Token
+
+
+@dataclasses.dataclass
+class LineStats:
+    hits: int = 0
+    # time spent running the line, including the lines it runs, e.g. a loop's body
+    cumulative: float = 0.0
+    # time spent running the line, excluding other lines
+    own: float = 0.0
+
+
+def find_line(node: BaseExpr | BaseStmt) -> Optional[int]:
+    """Line of the first token in a node, without looking into nested statements.
+
+    A for loop's initializer is on the same line as its condition, so it is looked into. Nodes
+    without a token, such as a literal, have no line.
+    """
+    for field in dataclasses.fields(node):
+        value = getattr(node, field.name)
+        if isinstance(value, Token):
+            return value.lineno
+        elif isinstance(value, BaseExpr) or (
+            isinstance(node, ForStmt) and field.name == "initializer" and value is not None
+        ):
+            if (line := find_line(value)) is not None:
+                return line
+    return None
+
+
+class ProfilingInterpreter(Interpreter):
+    """Tree-walking interpreter which records hits and time per source line.
+
+    Every statement executed with a known line counts as a hit of that line. Time is attributed to
+    a line from when a statement or expression on it starts until it finishes, and the time spent
+    in nested lines is subtracted for its own time. Statements without a line count towards the
+    enclosing line. Only this subclass pays for the bookkeeping, `Interpreter` is unchanged.
+    """
+
+    def __init__(self, exception_list: ExceptionList, output: Optional[Output] = None):
+        super().__init__(exception_list, output)
+        self.stats: dict[int, LineStats] = {}
+        # nodes are kept alongside their line so their ids can't be reused
+        self._lines: dict[int, tuple[BaseExpr | BaseStmt, Optional[int]]] = {}
+        # a line, and the time spent in nested lines, for each line being run
+        self._stack: list[list] = []
+        self._active: Counter[int] = Counter()
+
+    def execute(self, stmt: BaseStmt):
+        line = self.line_of(stmt)
+        if line is None:
+            return super().execute(stmt)
+
+        self.stats[line].hits += 1
+        return self.measure(line, super().execute, stmt)
+
+    def evaluate(self, expr: BaseExpr) -> object:
+        line = self.line_of(expr)
+        if line is None or (self._stack and self._stack[-1][0] == line):
+            return super().evaluate(expr)
+        return self.measure(line, super().evaluate, expr)
+
+    def line_of(self, node: BaseExpr | BaseStmt) -> Optional[int]:
+        try:
+            return self._lines[id(node)][1]
+        except KeyError:
+            line = None if isinstance(node, BlockStmt) else find_line(node)
+            self._lines[id(node)] = (node, line)
+            if line is not None and line not in self.stats:
+                self.stats[line] = LineStats()
+            return line
+
+    def measure(self, line: int, run: Callable, node: BaseExpr | BaseStmt) -> object:
+        frame = [line, 0.0]
+        self._stack.append(frame)
+        self._active[line] += 1
+        start = perf_counter()
+        try:
+            return run(node)
+        finally:
+            elapsed = perf_counter() - start
+            self._stack.pop()
+            self._active[line] -= 1
+
+            stats = self.stats[line]
+            stats.own += elapsed - frame[1]
+            # a line running itself, e.g. a loop on one line, is only counted once
+            if not self._active[line]:
+                stats.cumulative += elapsed
+            if self._stack:
+                self._stack[-1][1] += elapsed
+
+
+def profile_to_dict(stats: dict[int, LineStats]) -> dict:
+    """Profile as JSON-serialisable data, hottest lines first."""
+    lines = sorted(stats.items(), key=lambda item: item[1].own, reverse=True)
+    return {
+        "total": sum(line_stats.own for line_stats in stats.values()),
+        "lines": [
+            {
+                "line": line,
+                "hits": line_stats.hits,
+                "cumulative": line_stats.cumulative,
+                "self": line_stats.own,
+            }
+            for line, line_stats in lines
+        ],
+    }
+
+
+def format_profile(
+    stats: dict[int, LineStats], source: Optional[str] = None, limit: Optional[int] = 20
+) -> str:
+    """Table of the hottest lines by own time, with their source if given."""
+    source_lines = source.splitlines() if source is not None else []
+    total = sum(line_stats.own for line_stats in stats.values()) or 1.0
+    lines = sorted(stats.items(), key=lambda item: item[1].own, reverse=True)[:limit]
+
+    rows = [f"{'Line':>6} {'Hits':>10} {'Self (s)':>10} {'Self %':>7} {'Cumul. (s)':>10}  Source"]
+    for line, line_stats in lines:
+        text = source_lines[line - 1].strip() if 0 < line <= len(source_lines) else ""
+        rows.append(
+            f"{line:>6} {line_stats.hits:>10} {line_stats.own:>10.4f} "
+            f"{line_stats.own / total:>7.1%} {line_stats.cumulative:>10.4f}  {text}"
+        )
+    return "\n".join(rows)
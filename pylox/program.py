@@ -0,0 +1,47 @@
+from typing import Callable, Optional
+
+from pylox.exceptions import ExceptionList
+from pylox.output import BufferedOutput, Output
+from pylox.rope import flatten
+from pylox.stmt import BaseStmt
+
+
+class Program:
+    """Statements scanned, parsed, optimized and resolved once, to be run any number of times.
+
+    Created by `pylox.lox.Lox.compile`. Each run uses a fresh instance of `engine`, so runs don't
+    share any state unless they are given the same globals. Engines which translate statements
+    before running them, and can reuse the translation, do so once up front with `prepare`.
+    """
+
+    def __init__(self, stmts: list[BaseStmt], engine: Callable):
+        self.stmts = stmts
+        self.engine = engine
+        prepare = getattr(engine, "prepare", None)
+        self.prepared = prepare(stmts) if prepare is not None else None
+
+    def run(self, globals: Optional[dict[str, object]] = None, output: Optional[Output] = None):
+        """Execute the program, raising any runtime errors once it has finished.
+
+        `globals` are the global variables the program starts with, which it then updates in
+        place, holding Lox values: floats, strings, booleans or None. By default the program starts
+        without any. Printed lines go to `output`, which is flushed at the end.
+        """
+        exception_list = ExceptionList([])
+        output = output or BufferedOutput()
+        interpreter = self.engine(exception_list, output)
+        if globals is not None:
+            interpreter.set_globals(globals)
+
+        try:
+            if self.prepared is None:
+                interpreter.interpret(self.stmts)
+            else:
+                interpreter.interpret_prepared(self.prepared)
+        finally:
+            output.flush()
+            if globals is not None:
+                # strings the program built may be ropes, the caller gets plain strings
+                for name, value in globals.items():
+                    globals[name] = flatten(value)
+        exception_list.raise_if_not_empty()
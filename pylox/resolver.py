@@ -0,0 +1,174 @@
+from typing import Iterable, Iterator, Optional
+
+from pylox.expr import (
+    AssignExpr,
+    BaseExpr,
+    BinaryExpr,
+    GroupingExpr,
+    LiteralExpr,
+    LogicalExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from pylox.nesting import Nested, run_nested
+from pylox.stmt import (
+    BaseStmt,
+    BlockStmt,
+    ExpressionStmt,
+    ForStmt,
+    IfStmt,
+    PrintStmt,
+    VarStmt,
+    WhileStmt,
+)
+
+
+class Scope:
+    """Variables declared so far in a block, mapped to their slot in the block's frame."""
+
+    __slots__ = ("slots", "allocates", "frames")
+
+    def __init__(self, allocates: bool, frames: int):
+        self.slots: dict[str, int] = {}
+        # whether the block declares anything at all, and so gets a frame at runtime
+        self.allocates = allocates
+        # frames allocated at runtime by this block and the blocks enclosing it
+        self.frames = frames
+
+
+class Resolver:
+    """Give every block-local variable a fixed (depth, slot) address ahead of execution.
+
+    Declarations at the top level stay in the global `Environment` and are looked up by name.
+    Declarations in a block are numbered into the slots of the block's `Frame`, and every
+    reference to them records how many frames up the chain the declaration lives. Blocks which
+    declare nothing don't get a frame, and so don't count towards the depth.
+
+    Lox has no closures, so a name refers to whatever is declared textually before it, which is
+    exactly what the dynamic lookup through nested environments finds.
+
+    Nothing is resolved recursively, so deeply nested programs don't run out of Python stack.
+    Statements with children are resolved by steps which yield the step of each child, see
+    `pylox.nesting.run_nested`. Expressions declare nothing, so the order their variables are
+    looked up in doesn't matter, and their visitors return the children left to visit instead.
+    """
+
+    def __init__(self):
+        self.scopes: list[Scope] = []
+        # the scopes declaring each name, innermost last, so a lookup doesn't walk every scope
+        self.declarations: dict[str, list[Scope]] = {}
+
+    def resolve(self, stmts: Iterable[BaseStmt]):
+        for stmt in stmts:
+            run_nested(stmt.accept(self))
+
+    def iter_resolve(self, stmts: Iterable[BaseStmt]) -> Iterator[BaseStmt]:
+        """Resolve and yield one statement at a time."""
+        for stmt in stmts:
+            run_nested(stmt.accept(self))
+            yield stmt
+
+    def resolve_expression(self, expr: BaseExpr):
+        work = [expr]
+        while work:
+            work.extend(work.pop().accept(self))
+
+    def lookup(self, name: str) -> tuple[Optional[int], Optional[int]]:
+        """Find the (depth, slot) of `name`, or (None, None) if it is a global."""
+        if declared := self.declarations.get(name):
+            scope = declared[-1]
+            return self.scopes[-1].frames - scope.frames, scope.slots[name]
+        return None, None
+
+    def begin_scope(self, allocates: bool) -> Scope:
+        frames = self.scopes[-1].frames if self.scopes else 0
+        self.scopes.append(scope := Scope(allocates, frames + allocates))
+        return scope
+
+    def end_scope(self):
+        for name in self.scopes.pop().slots:
+            self.declarations[name].pop()
+
+    def visitBlockStmt(self, stmt: BlockStmt) -> Nested:
+        # declarations can only appear directly in a block, so this is known up front
+        allocates = any(isinstance(s, VarStmt) for s in stmt.statements)
+
+        scope = self.begin_scope(allocates)
+        try:
+            for s in stmt.statements:
+                yield s.accept(self)
+        finally:
+            self.end_scope()
+        stmt.slots = len(scope.slots)
+
+    def visitVarStmt(self, stmt: VarStmt):
+        if stmt.initializer is not None:
+            self.resolve_expression(stmt.initializer)
+
+        if not self.scopes:
+            return
+
+        # redeclaring a variable in the same block reuses its slot
+        scope, name = self.scopes[-1], stmt.name.lexeme
+        if (slot := scope.slots.get(name)) is None:
+            slot = scope.slots[name] = len(scope.slots)
+            self.declarations.setdefault(name, []).append(scope)
+        stmt.slot = slot
+
+    def visitExpressionStmt(self, stmt: ExpressionStmt):
+        self.resolve_expression(stmt.expression)
+
+    def visitPrintStmt(self, stmt: PrintStmt):
+        self.resolve_expression(stmt.expression)
+
+    def visitIfStmt(self, stmt: IfStmt) -> Nested:
+        self.resolve_expression(stmt.condition)
+        yield stmt.then_branch.accept(self)
+        if stmt.else_branch is not None:
+            yield stmt.else_branch.accept(self)
+
+    def visitWhileStmt(self, stmt: WhileStmt) -> Nested:
+        self.resolve_expression(stmt.condition)
+        yield stmt.body.accept(self)
+
+    def visitForStmt(self, stmt: ForStmt) -> Nested:
+        if stmt.initializer is None:
+            yield self.resolve_loop(stmt)
+            return
+
+        scope = self.begin_scope(isinstance(stmt.initializer, VarStmt))
+        try:
+            yield stmt.initializer.accept(self)
+            yield self.resolve_loop(stmt)
+        finally:
+            self.end_scope()
+        stmt.slots = len(scope.slots)
+
+    def resolve_loop(self, stmt: ForStmt) -> Nested:
+        self.resolve_expression(stmt.condition)
+        yield stmt.body.accept(self)
+        if stmt.increment is not None:
+            self.resolve_expression(stmt.increment)
+
+    def visitVariableExpr(self, expr: VariableExpr) -> tuple[BaseExpr, ...]:
+        expr.depth, expr.slot = self.lookup(expr.name.lexeme)
+        return ()
+
+    def visitAssignExpr(self, expr: AssignExpr) -> tuple[BaseExpr, ...]:
+        expr.depth, expr.slot = self.lookup(expr.name.lexeme)
+        return (expr.value,)
+
+    def visitBinaryExpr(self, expr: BinaryExpr) -> tuple[BaseExpr, ...]:
+        return expr.left, expr.right
+
+    def visitLogicalExpr(self, expr: LogicalExpr) -> tuple[BaseExpr, ...]:
+        return expr.left, expr.right
+
+    def visitGroupingExpr(self, expr: GroupingExpr) -> tuple[BaseExpr, ...]:
+        return (expr.expression,)
+
+    def visitUnaryExpr(self, expr: UnaryExpr) -> tuple[BaseExpr, ...]:
+        return (expr.right,)
+
+    def visitLiteralExpr(self, expr: LiteralExpr) -> tuple[BaseExpr, ...]:
+        return ()
@@ -0,0 +1,77 @@
+from typing import Optional
+
+# shorter results of concatenation are plain strings, copying them is cheaper than a rope
+MIN_ROPE_LENGTH = 128
+
+
+class Rope:
+    """String value built by concatenation, whose pieces are only joined once it is needed.
+
+    Ropes appended to share one list of pieces: a rope is a prefix of it, `count` pieces long, so
+    appending to the most recent rope is amortised O(1). Appending to an older rope, which another
+    append has already extended the list past, copies its own pieces first. A rope is joined when
+    it is printed, compared or hashed, and then keeps the joined string. It behaves exactly like
+    the string it stands for everywhere else in Lox: it is truthy, and equal only to that string.
+    """
+
+    __slots__ = ("pieces", "count", "length")
+
+    def __init__(self, pieces: list[str], count: int, length: int):
+        self.pieces = pieces
+        self.count = count
+        self.length = length
+
+    def append(self, piece: str) -> "Rope":
+        pieces = self.pieces
+        if len(pieces) != self.count:
+            pieces = pieces[: self.count]
+        pieces.append(piece)
+        return Rope(pieces, self.count + 1, self.length + len(piece))
+
+    def __str__(self) -> str:
+        if self.count > 1:
+            # a new list, so ropes sharing the pieces keep them
+            self.pieces = ["".join(self.pieces[: self.count])]
+            self.count = 1
+        return self.pieces[0]
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Rope):
+            return self.length == other.length and str(self) == str(other)
+        if isinstance(other, str):
+            return self.length == len(other) and str(self) == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __repr__(self) -> str:
+        return f"Rope({str(self)!r})"
+
+
+def concat(a: object, b: object) -> Optional[str | Rope]:
+    """Lox `+` of two strings, or ropes, and nil if either is anything else."""
+    if type(a) is Rope:
+        if type(b) is str:
+            return a.append(b)
+        if type(b) is Rope:
+            return a.append(str(b))
+        return None
+
+    if type(a) is not str:
+        return None
+    if type(b) is str:
+        if len(a) + len(b) < MIN_ROPE_LENGTH:
+            return a + b
+        return Rope([a, b], 2, len(a) + len(b))
+    if type(b) is Rope:
+        return Rope([a, str(b)], 2, len(a) + len(b))
+    return None
+
+
+def flatten(value: object) -> object:
+    """The Lox value `value` stands for, as a string if it is a rope."""
+    return str(value) if type(value) is Rope else value
@@ -0,0 +1,296 @@
+import math
+
+from pylox.environment import Frame
+from pylox.exceptions import PyloxRuntimeError
+from pylox.expr import (
+    AssignExpr,
+    BinaryExpr,
+    GroupingExpr,
+    LiteralExpr,
+    LogicalExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from pylox.interpreter import Interpreter
+from pylox.rope import concat
+from pylox.stmt import (
+    BaseStmt,
+    BlockStmt,
+    ExpressionStmt,
+    ForStmt,
+    IfStmt,
+    PrintStmt,
+    VarStmt,
+    WhileStmt,
+)
+from pylox.token import Token, TokenType
+
+# work is a stack of (operation, argument) pairs, most operations take the node they belong to
+(
+    EXECUTE,  # run a statement
+    EVALUATE,  # push the value of an expression
+    UNARY,  # apply a unary operator to the value on top
+    BINARY,  # apply a binary operator to the two values on top
+    LOGICAL,  # keep the left operand on top, or replace it with the right one
+    ASSIGN,  # assign the value on top, which is also the value of the assignment
+    DEFINE,  # pop a value into a declared variable
+    PRINT,  # pop a value and print it
+    DISCARD,  # pop a value
+    IF,  # pop a condition and push a branch
+    WHILE,  # pop a condition and push the body and the next test
+    LOOP,  # the same for a `for` loop, along with its increment
+    # the operations from here on end a block or loop: they restore the scopes from before it,
+    # or nothing for an iteration, and a runtime error inside it is recovered from by them
+    RESTORE_ENVIRONMENT,
+    RESTORE_FRAME,
+    RESTORE_SCOPES,
+    NEXT_ITERATION,
+) = range(16)
+
+NUMERIC_OPERATORS = frozenset(
+    [
+        TokenType.GREATER,
+        TokenType.GREATER_EQUAL,
+        TokenType.LESS,
+        TokenType.LESS_EQUAL,
+        TokenType.MINUS,
+        TokenType.SLASH,
+        TokenType.STAR,
+    ]
+)
+
+
+class StackInterpreter(Interpreter):
+    """Tree-walking interpreter which keeps its own stacks rather than recursing.
+
+    A statement is executed by popping work off an explicit stack, and expressions are evaluated
+    onto a stack of values, so how deeply a program nests is only limited by memory. A runtime
+    error unwinds the work to the innermost block or loop, which carries on exactly where the
+    recursive `Interpreter` would have.
+    """
+
+    def execute(self, stmt: BaseStmt):
+        work = [(EXECUTE, stmt)]
+        values = []
+        # scopes are restored by the work which ends blocks, unless an exception from Python,
+        # like a KeyboardInterrupt, stops the run
+        environment, frame = self.environment, self.frame
+        try:
+            self.run(work, values)
+        finally:
+            self.environment, self.frame = environment, frame
+
+    def run(self, work: list, values: list):
+        while work:
+            op, node = work.pop()
+            try:
+                if op is EVALUATE:
+                    kind = type(node)
+                    if kind is VariableExpr:
+                        values.append(self.visitVariableExpr(node))
+                    elif kind is LiteralExpr:
+                        values.append(node.value)
+                    elif kind is BinaryExpr:
+                        work.append((BINARY, node))
+                        work.append((EVALUATE, node.right))
+                        work.append((EVALUATE, node.left))
+                    elif kind is AssignExpr:
+                        work.append((ASSIGN, node))
+                        work.append((EVALUATE, node.value))
+                    elif kind is LogicalExpr:
+                        work.append((LOGICAL, node))
+                        work.append((EVALUATE, node.left))
+                    elif kind is UnaryExpr:
+                        work.append((UNARY, node))
+                        work.append((EVALUATE, node.right))
+                    elif kind is GroupingExpr:
+                        work.append((EVALUATE, node.expression))
+                    else:
+                        values.append(node.accept(self))
+                elif op is BINARY:
+                    right = values.pop()
+                    values[-1] = self.binary(node.operator, values[-1], right)
+                elif op is EXECUTE:
+                    kind = type(node)
+                    if kind is ExpressionStmt:
+                        work.append((DISCARD, None))
+                        work.append((EVALUATE, node.expression))
+                    elif kind is IfStmt:
+                        work.append((IF, node))
+                        work.append((EVALUATE, node.condition))
+                    elif kind is BlockStmt:
+                        self.enter_block(node, work)
+                    elif kind is PrintStmt:
+                        work.append((PRINT, None))
+                        work.append((EVALUATE, node.expression))
+                    elif kind is VarStmt and node.initializer is not None:
+                        work.append((DEFINE, node))
+                        work.append((EVALUATE, node.initializer))
+                    elif kind is WhileStmt:
+                        work.append((WHILE, node))
+                        work.append((EVALUATE, node.condition))
+                    elif kind is ForStmt:
+                        self.enter_for(node, work)
+                    else:
+                        # a declaration without an initializer, or a None left by a syntax error
+                        # which fails just like in `Interpreter`
+                        node.accept(self)
+                elif op is ASSIGN:
+                    self.assign(node, values[-1])
+                elif op is DISCARD:
+                    values.pop()
+                elif op is LOGICAL:
+                    # only nil and false are falsey
+                    truthy = values[-1] is not None and values[-1] is not False
+                    if truthy is (node.operator.token_type is TokenType.AND):
+                        values.pop()
+                        work.append((EVALUATE, node.right))
+                elif op is IF:
+                    if (condition := values.pop()) is not None and condition is not False:
+                        work.append((EXECUTE, node.then_branch))
+                    elif node.else_branch is not None:
+                        work.append((EXECUTE, node.else_branch))
+                elif op is WHILE:
+                    if (condition := values.pop()) is not None and condition is not False:
+                        work.append((WHILE, node))
+                        work.append((EVALUATE, node.condition))
+                        work.append((EXECUTE, node.body))
+                elif op is LOOP:
+                    if (condition := values.pop()) is not None and condition is not False:
+                        work.append((LOOP, node))
+                        work.append((EVALUATE, node.condition))
+                        if node.increment is not None:
+                            # a runtime error in the body skips the increment, but not the next
+                            # iteration
+                            work.append((NEXT_ITERATION, None))
+                            work.append((DISCARD, None))
+                            work.append((EVALUATE, node.increment))
+                        work.append((EXECUTE, node.body))
+                elif op is UNARY:
+                    values[-1] = self.unary(node.operator, values[-1])
+                elif op is PRINT:
+                    self.output.write(values.pop())
+                elif op is DEFINE:
+                    self.define(node, values.pop())
+                elif op is RESTORE_ENVIRONMENT:
+                    self.environment = node
+                elif op is RESTORE_FRAME:
+                    self.frame = node
+                elif op is RESTORE_SCOPES:
+                    self.environment, self.frame = node
+            except PyloxRuntimeError as e:
+                # statements only start once the values of the ones before have been used up
+                values.clear()
+                self.unwind(work, e)
+
+    def enter_block(self, stmt: BlockStmt, work: list):
+        if stmt.slots is None:
+            work.append((RESTORE_ENVIRONMENT, self.environment))
+            self.environment = self.environment_class(self.environment)
+        elif stmt.slots:
+            work.append((RESTORE_FRAME, self.frame))
+            self.frame = Frame(self.frame, stmt.slots)
+        else:
+            # nothing is declared in the block, so it shares the enclosing frame
+            work.append((RESTORE_FRAME, self.frame))
+        work.extend((EXECUTE, s) for s in reversed(stmt.statements))
+
+    def enter_for(self, stmt: ForStmt, work: list):
+        if stmt.initializer is None:
+            work.append((LOOP, stmt))
+            work.append((EVALUATE, stmt.condition))
+            return
+
+        # the initializer is scoped to the loop, and a runtime error ends the loop only
+        work.append((RESTORE_SCOPES, (self.environment, self.frame)))
+        if stmt.slots is None:
+            self.environment = self.environment_class(self.environment)
+        elif stmt.slots:
+            self.frame = Frame(self.frame, stmt.slots)
+        work.append((LOOP, stmt))
+        work.append((EVALUATE, stmt.condition))
+        work.append((EXECUTE, stmt.initializer))
+
+    def unwind(self, work: list, error: PyloxRuntimeError):
+        """Drop work up to the innermost block or loop, restoring its scopes, and recover there.
+
+        Raises `error` if nothing in the statement recovers from it.
+        """
+        while work:
+            op, state = work.pop()
+            if op is RESTORE_ENVIRONMENT:
+                self.environment = state
+            elif op is RESTORE_FRAME:
+                self.frame = state
+            elif op is RESTORE_SCOPES:
+                self.environment, self.frame = state
+            elif op is not NEXT_ITERATION:
+                continue
+
+            try:
+                self.recover(error)
+                return
+            except PyloxRuntimeError as e:
+                # ends the enclosing blocks and loops as well
+                error = e
+        raise error
+
+    def define(self, stmt: VarStmt, value: object):
+        if stmt.slot is None:
+            self.environment.define(stmt.name.lexeme, value)
+        else:
+            self.frame.values[stmt.slot] = value
+
+    def assign(self, expr: AssignExpr, value: object):
+        if expr.slot is None:
+            self.environment.assign(expr.name, value)
+            return
+
+        frame = self.frame
+        for _ in range(expr.depth):
+            frame = frame.enclosing
+        frame.values[expr.slot] = value
+
+    def unary(self, operator: Token, right: object) -> object:
+        match operator.token_type:
+            case TokenType.MINUS:
+                self.check_number_operands(operator, right)
+                return -right
+            case TokenType.BANG:
+                return not self.is_truthy(right)
+            case _:
+                return None
+
+    def binary(self, operator: Token, left: object, right: object) -> object:
+        if operator.token_type in NUMERIC_OPERATORS:
+            self.check_number_operands(operator, left, right)
+
+        match operator.token_type:
+            case TokenType.BANG_EQUAL:
+                return left != right
+            case TokenType.EQUAL_EQUAL:
+                return left == right
+            case TokenType.GREATER:
+                return left > right
+            case TokenType.GREATER_EQUAL:
+                return left >= right
+            case TokenType.LESS:
+                return left < right
+            case TokenType.LESS_EQUAL:
+                return left <= right
+            case TokenType.MINUS:
+                return left - right
+            case TokenType.PLUS:
+                if isinstance(left, float) and isinstance(right, float):
+                    return left + right
+                return concat(left, right)
+            case TokenType.SLASH:
+                # need to handle division by zero
+                try:
+                    return left / right
+                except ZeroDivisionError:
+                    return math.inf * left * right
+            case TokenType.STAR:
+                return left * right
+            case _:
+                return None
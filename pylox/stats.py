@@ -0,0 +1,129 @@
+import dataclasses
+from collections import Counter
+from functools import partial
+from typing import Optional
+
+from pylox.environment import Environment
+from pylox.exceptions import ExceptionList, PyloxRuntimeError
+from pylox.expr import AssignExpr, BaseExpr, VariableExpr
+from pylox.interpreter import Interpreter
+from pylox.output import Output
+from pylox.stmt import BaseStmt, BlockStmt, ForStmt
+from pylox.token import Token
+
+
+@dataclasses.dataclass
+class RuntimeStats:
+    # statements executed and expressions evaluated, by node class name
+    nodes: Counter[str] = dataclasses.field(default_factory=Counter)
+    # scopes created, `Environment`s for unresolved variables and `Frame`s for resolved ones
+    environments: int = 0
+    frames: int = 0
+    # `Environment.get` and `Environment.assign` calls
+    gets: int = 0
+    assigns: int = 0
+    # reads and writes of variables resolved to a frame slot
+    slot_gets: int = 0
+    slot_assigns: int = 0
+    # number of enclosing scopes walked, for every variable read or written
+    depths: Counter[int] = dataclasses.field(default_factory=Counter)
+    errors: int = 0
+
+
+class CountingEnvironment(Environment):
+    """Environment which counts its creation and its lookups into `stats`."""
+
+    def __init__(self, enclosing: Optional["CountingEnvironment"] = None, *, stats: RuntimeStats):
+        super().__init__(enclosing)
+        self.stats = stats
+        stats.environments += 1
+
+    def get(self, name: Token) -> object:
+        self.stats.gets += 1
+        return Environment.get(self.find(name), name)
+
+    def assign(self, name: Token, value: object):
+        self.stats.assigns += 1
+        Environment.assign(self.find(name), name, value)
+
+    def find(self, name: Token) -> Environment:
+        """Innermost environment defining `name`, or the global one, recording the depth walked."""
+        environment, depth = self, 0
+        while name.lexeme not in environment.values and environment.enclosing is not None:
+            environment, depth = environment.enclosing, depth + 1
+        self.stats.depths[depth] += 1
+        return environment
+
+
+class CountingInterpreter(Interpreter):
+    """Tree-walking interpreter which counts what it does into `stats`.
+
+    Only this subclass pays for the counting, `Interpreter` is unchanged.
+    """
+
+    def __init__(self, exception_list: ExceptionList, output: Optional[Output] = None):
+        self.stats = RuntimeStats()
+        self.environment_class = partial(CountingEnvironment, stats=self.stats)
+        super().__init__(exception_list, output)
+        # an error is seen by every node it propagates through, but only counted once
+        self._last_error: Optional[PyloxRuntimeError] = None
+
+    def execute(self, stmt: BaseStmt):
+        self.stats.nodes[stmt.__class__.__name__] += 1
+        try:
+            return super().execute(stmt)
+        except PyloxRuntimeError as e:
+            self.count_error(e)
+            raise
+
+    def evaluate(self, expr: BaseExpr) -> object:
+        self.stats.nodes[expr.__class__.__name__] += 1
+        try:
+            return super().evaluate(expr)
+        except PyloxRuntimeError as e:
+            self.count_error(e)
+            raise
+
+    def count_error(self, error: PyloxRuntimeError):
+        if error is not self._last_error:
+            self._last_error = error
+            self.stats.errors += 1
+
+    def visitBlockStmt(self, stmt: BlockStmt):
+        if stmt.slots:
+            self.stats.frames += 1
+        super().visitBlockStmt(stmt)
+
+    def visitForStmt(self, stmt: ForStmt):
+        if stmt.initializer is not None and stmt.slots:
+            self.stats.frames += 1
+        super().visitForStmt(stmt)
+
+    def visitVariableExpr(self, expr: VariableExpr) -> object:
+        if expr.slot is not None:
+            self.stats.slot_gets += 1
+            self.stats.depths[expr.depth] += 1
+        return super().visitVariableExpr(expr)
+
+    def visitAssignExpr(self, expr: AssignExpr) -> object:
+        if expr.slot is not None:
+            self.stats.slot_assigns += 1
+            self.stats.depths[expr.depth] += 1
+        return super().visitAssignExpr(expr)
+
+
+def format_stats(stats: RuntimeStats) -> str:
+    rows = [
+        f"Scopes created: {stats.environments} environments, {stats.frames} frames",
+        f"Environment lookups: {stats.gets} gets, {stats.assigns} assigns",
+        f"Slot lookups: {stats.slot_gets} gets, {stats.slot_assigns} assigns",
+        f"Runtime errors: {stats.errors}",
+        "Lookup depth:",
+    ]
+    lookups = sum(stats.depths.values()) or 1
+    for depth, count in sorted(stats.depths.items()):
+        rows.append(f"  {depth:>4}: {count:>10} ({count / lookups:.1%})")
+    rows.append(f"Nodes evaluated: {sum(stats.nodes.values())}")
+    for name, count in stats.nodes.most_common():
+        rows.append(f"  {name:>14}: {count:>10}")
+    return "\n".join(rows)
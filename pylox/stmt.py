@@ -1,34 +1,51 @@
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Optional
 
+from pylox.dispatch import DispatchTable
 from pylox.expr import BaseExpr
 from pylox.token import Token
 
 
 class BaseStmt:
+    _dispatch: DispatchTable
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = DispatchTable(cls.__name__)
+
     def accept(self, visitor: type) -> Any:
-        return getattr(visitor, f"visit{self.__class__.__name__}")(self)
+        return self._dispatch[visitor.__class__](visitor, self)
 
 
 @dataclass(slots=True)
 class ExpressionStmt(BaseStmt):
     expression: BaseExpr
+    # the first token of the expression, for reporting the line of the statement
+    token: Optional[Token] = None
 
 
 @dataclass(slots=True)
 class PrintStmt(BaseStmt):
     expression: BaseExpr
+    # the `print` token, for reporting the line of the statement
+    keyword: Optional[Token] = None
 
 
 @dataclass(slots=True)
 class VarStmt(BaseStmt):
     name: Token
     initializer: BaseExpr
+    # set by the resolver for declarations inside a block, see `pylox.resolver.Resolver`
+    slot: Optional[int] = None
 
 
 @dataclass(slots=True)
 class BlockStmt(BaseStmt):
     statements: list[BaseStmt]
+    # number of variables declared in the block, set by the resolver
+    slots: Optional[int] = None
+    # the `{` token, for reporting the line of the block
+    brace: Optional[Token] = None
 
 
 @dataclass(slots=True)
@@ -36,9 +53,38 @@ class IfStmt(BaseStmt):
     condition: BaseExpr
     then_branch: BaseStmt
     else_branch: BaseStmt
+    # the `if` token, for reporting the line of the statement
+    keyword: Optional[Token] = None
 
 
 @dataclass(slots=True)
 class WhileStmt(BaseStmt):
     condition: BaseExpr
     body: BaseStmt
+    # the `while` token, for reporting the line of the loop
+    keyword: Optional[Token] = None
+
+
+@dataclass(slots=True)
+class ForStmt(BaseStmt):
+    initializer: Optional[BaseStmt]
+    condition: BaseExpr
+    increment: Optional[BaseExpr]
+    body: BaseStmt
+    # number of variables the initializer declares, set by the resolver
+    slots: Optional[int] = None
+    # the `for` token, for reporting the line of the loop
+    keyword: Optional[Token] = None
+
+
+def statement_token(stmt: BaseStmt) -> Optional[Token]:
+    """Token the parser recorded for reporting the line of a statement."""
+    match stmt:
+        case VarStmt():
+            return stmt.name
+        case ExpressionStmt():
+            return stmt.token
+        case BlockStmt():
+            return stmt.brace
+        case _:
+            return stmt.keyword
@@ -1,5 +1,10 @@
-import dataclasses
 import enum
+import re
+import sys
+import types
+from array import array
+from bisect import bisect_left
+from typing import Optional
 
 ONE_CHAR_TOKENS = (
     "LEFT_BRACE",
@@ -53,10 +58,197 @@ ALL_TOKENS = ONE_CHAR_TOKENS + ONE_OR_TWO_CHAR_TOKENS + LITERAL_TOKENS + RESERVE
 
 TokenType = enum.Enum("TokenType", ALL_TOKENS)
 
+# frozen mapping of reserved words to their token type, e.g. "and" -> TokenType.AND
+KEYWORDS = types.MappingProxyType({word.lower(): TokenType[word] for word in RESERVED_TOKENS})
+
+
+NEWLINE = re.compile("\n")
+BYTES_NEWLINE = re.compile(b"\n")
+
+
+class LineIndex:
+    """Line numbers of offsets into a source, found with `bisect` among the offsets of its newlines.
+
+    The newlines of a string are only searched for the first time a line number is needed, for
+    example by an error message or the profiler, and the string is let go of then. Bytes, which
+    include a memory-mapped file, are searched right away, so the index doesn't keep the mapping
+    in use. Lines are counted from `first_line`, for a source which is part of a longer one.
+    """
+
+    __slots__ = ("source", "first_line", "_newlines")
+
+    def __init__(self, source: str | bytes, first_line: int = 1):
+        self.source: Optional[str | bytes] = source
+        self.first_line = first_line
+        self._newlines: Optional[array] = None
+        if not isinstance(source, str):
+            self.newlines()
+
+    def newlines(self) -> array:
+        """Offsets of the newlines in the source, in order."""
+        if self._newlines is None:
+            pattern = NEWLINE if isinstance(self.source, str) else BYTES_NEWLINE
+            self._newlines = array("Q", map(re.Match.start, pattern.finditer(self.source)))
+            self.source = None
+        return self._newlines
+
+    def lineno(self, offset: int) -> int:
+        """Line of the character at `offset`, or of the end of the source."""
+        return self.first_line + bisect_left(self.newlines(), offset)
+
 
-@dataclasses.dataclass
 class Token:
-    token_type: TokenType
-    lexeme: str
-    literal: object
-    lineno: int
+    """A lexeme scanned from the source, with its type and literal value.
+
+    The line number is either given, or found in the `LineIndex` of the source from `offset`,
+    where the lexeme starts, the first time it is needed, so scanning doesn't count lines. One
+    slot holds the index until then, and the line number after, to keep tokens small.
+    """
+
+    __slots__ = ("token_type", "lexeme", "literal", "offset", "_line")
+
+    def __init__(
+        self,
+        token_type: TokenType,
+        lexeme: str,
+        literal: object,
+        lineno: Optional[int] = None,
+        offset: int = 0,
+        lines: Optional[LineIndex] = None,
+    ):
+        self.token_type = token_type
+        self.lexeme = lexeme
+        self.literal = literal
+        self.offset = offset
+        self._line: int | LineIndex = lines if lineno is None else lineno
+
+    @property
+    def lineno(self) -> int:
+        line = self._line
+        if type(line) is LineIndex:
+            # a string spanning several lines is on the line it ends on, counted in the lexeme
+            # as its offsets may be in bytes rather than chars
+            line = self._line = line.lineno(self.offset) + self.lexeme.count("\n")
+        return line
+
+    def _key(self) -> tuple:
+        return self.token_type, self.lexeme, self.literal, self.lineno
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._key() == other._key()
+
+    # mutable, and compared by value
+    __hash__ = None
+
+    def __reduce__(self) -> tuple:
+        # pickled with its line number rather than the index of the whole source
+        return self.__class__, (self.token_type, self.lexeme, self.literal, self.lineno)
+
+    def __repr__(self) -> str:
+        return (
+            f"Token(token_type={self.token_type!r}, lexeme={self.lexeme!r}, "
+            f"literal={self.literal!r}, lineno={self.lineno!r})"
+        )
+
+
+class Interner:
+    """Shared lexemes and literal values for the tokens scanned from one source.
+
+    Every occurrence of a name, keyword or operator gets the same `sys.intern`-ed lexeme, so
+    variables are looked up by a key which is the very object they were defined with, and every
+    occurrence of a number or string constant gets the same lexeme and value.
+    """
+
+    def __init__(self):
+        self.names: dict[str, str] = {}
+        self.numbers: dict[str, tuple[str, float]] = {}
+        self.strings: dict[str, tuple[str, str]] = {}
+
+    def name(self, lexeme: str) -> str:
+        if (shared := self.names.get(lexeme)) is None:
+            shared = self.names[lexeme] = sys.intern(lexeme)
+        return shared
+
+    def number(self, lexeme: str) -> tuple[str, float]:
+        """The shared lexeme and value of a number."""
+        if (shared := self.numbers.get(lexeme)) is None:
+            shared = self.numbers[lexeme] = (lexeme, float(lexeme))
+        return shared
+
+    def string(self, lexeme: str) -> tuple[str, str]:
+        """The shared lexeme and value of a string, given its lexeme including the quotes."""
+        if (shared := self.strings.get(lexeme)) is None:
+            shared = self.strings[lexeme] = (lexeme, lexeme[1:-1])
+        return shared
+
+
+class BytesInterner(Interner):
+    """Interner for tokens scanned from UTF-8 bytes, which decodes each distinct lexeme once."""
+
+    def name(self, lexeme: bytes) -> str:
+        if (shared := self.names.get(lexeme)) is None:
+            shared = self.names[lexeme] = sys.intern(lexeme.decode())
+        return shared
+
+    def number(self, lexeme: bytes) -> tuple[str, float]:
+        if (shared := self.numbers.get(lexeme)) is None:
+            text = lexeme.decode()
+            shared = self.numbers[lexeme] = (text, float(text))
+        return shared
+
+    def string(self, lexeme: bytes) -> tuple[str, str]:
+        if (shared := self.strings.get(lexeme)) is None:
+            text = lexeme.decode()
+            shared = self.strings[lexeme] = (text, text[1:-1])
+        return shared
+
+
+class TokenArray:
+    """Compact store of the tokens scanned from `source`.
+
+    Token types and offsets are kept in parallel arrays, lexemes and literals are only sliced out
+    of the source when a `Token` is materialised by indexing, and line numbers are only looked
+    up when one is needed.
+    """
+
+    def __init__(self, source: str, interner: Optional[Interner] = None):
+        self.source = source
+        self.interner = interner or Interner()
+
+        offset_typecode = "I" if len(source) < 2**32 else "Q"
+        self.types = array("B")
+        self.starts = array(offset_typecode)
+        self.ends = array(offset_typecode)
+        self.lines = LineIndex(source)
+
+        # no index is None, while -1 is the last token
+        self._cached: tuple[Optional[int], Optional[Token]] = (None, None)
+
+    def append(self, token_type: TokenType, start: int, end: int):
+        self.types.append(token_type.value)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, idx: int) -> Token:
+        # the parser peeks at the same token several times in a row
+        if self._cached[0] == idx:
+            return self._cached[1]
+
+        token_type = TokenType(self.types[idx])
+        start = self.starts[idx]
+        lexeme = self.source[start : self.ends[idx]]
+        match token_type:
+            case TokenType.NUMBER:
+                lexeme, literal = self.interner.number(lexeme)
+            case TokenType.STRING:
+                lexeme, literal = self.interner.string(lexeme)
+            case _:
+                lexeme, literal = self.interner.name(lexeme), None
+        token = Token(token_type, lexeme, literal, None, start, self.lines)
+        self._cached = (idx, token)
+        return token
@@ -0,0 +1,426 @@
+import math
+from types import CodeType
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from pylox.closure import ClosureInterpreter
+from pylox.environment import Environment
+from pylox.exceptions import ExceptionList, PyloxRuntimeError
+from pylox.expr import (
+    AssignExpr,
+    BinaryExpr,
+    GroupingExpr,
+    LiteralExpr,
+    LogicalExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from pylox.output import BufferedOutput, FlushPolicy, Output
+from pylox.rope import concat
+from pylox.stmt import (
+    BaseStmt,
+    BlockStmt,
+    ExpressionStmt,
+    ForStmt,
+    IfStmt,
+    PrintStmt,
+    VarStmt,
+    WhileStmt,
+)
+from pylox.token import Token, TokenType
+
+INDENT = "    "
+# Python operators for the Lox operators which only apply to numbers
+ARITHMETIC = {
+    TokenType.GREATER: ">",
+    TokenType.GREATER_EQUAL: ">=",
+    TokenType.LESS: "<",
+    TokenType.LESS_EQUAL: "<=",
+    TokenType.MINUS: "-",
+    TokenType.STAR: "*",
+}
+COMPARISONS = {TokenType.GREATER, TokenType.GREATER_EQUAL, TokenType.LESS, TokenType.LESS_EQUAL}
+
+
+class Code(NamedTuple):
+    """Python source of an expression."""
+
+    source: str
+    # whether the source is free of side effects, and cheap enough to evaluate twice
+    simple: bool = False
+    # type of the value if it is known statically
+    type_: Optional[type] = None
+    # whether evaluating the source may assign to a local
+    assigns: bool = False
+
+
+class Transpiler:
+    """Translate statements into the source of a Python function named `_lox`.
+
+    Block-scoped variables become Python locals, renamed so that shadowing declarations get
+    distinct names, globals live in the dict `_g`. Tokens to report runtime errors with are
+    indices into `_T`, and constants with no Python literal (inf, nan) indices into `_C`.
+    """
+
+    def __init__(self):
+        self.tokens: list[Token] = []
+        self.constants: list[object] = []
+        self.lines: list[str] = []
+        # Python name of each variable declared so far in each enclosing block
+        self.scopes: list[dict[str, str]] = []
+        self._names = 0
+        self._temps = 0
+        self._depth = 1
+
+    def transpile(self, stmts: Iterable[BaseStmt]) -> str:
+        self.lines.append("def _lox():")
+        for stmt in stmts:
+            stmt.accept(self)
+        if len(self.lines) == 1:
+            self.emit("pass")
+        return "\n".join(self.lines) + "\n"
+
+    def emit(self, line: str):
+        self.lines.append(INDENT * self._depth + line)
+
+    def emit_body(self, stmt: BaseStmt):
+        self._depth += 1
+        start = len(self.lines)
+        stmt.accept(self)
+        if len(self.lines) == start:
+            self.emit("pass")
+        self._depth -= 1
+
+    def token(self, token: Token) -> str:
+        self.tokens.append(token)
+        return f"_T[{len(self.tokens) - 1}]"
+
+    def temp(self) -> str:
+        self._temps += 1
+        return f"_t{self._temps}"
+
+    def truthy(self, code: Code) -> str:
+        if code.type_ is bool:
+            return code.source
+        if code.type_ is not None:
+            # only nil and false are falsey
+            truthy = str(code.type_ is not type(None) and code.source != "False")
+            return truthy if code.simple else f"({code.source}, {truthy})[1]"
+        if code.simple:
+            return f"{code.source} is not None and {code.source} is not False"
+        temp = self.temp()
+        return f"({temp} := {code.source}) is not None and {temp} is not False"
+
+    def evaluate(self, expr) -> Code:
+        return expr.accept(self)
+
+    def lookup(self, name: str) -> Optional[str]:
+        for scope in reversed(self.scopes):
+            if (local := scope.get(name)) is not None:
+                return local
+        return None
+
+    def visitExpressionStmt(self, stmt: ExpressionStmt):
+        self.emit(self.evaluate(stmt.expression).source)
+
+    def visitPrintStmt(self, stmt: PrintStmt):
+        self.emit(f"_print({self.evaluate(stmt.expression).source})")
+
+    def visitVarStmt(self, stmt: VarStmt):
+        value = "None" if stmt.initializer is None else self.evaluate(stmt.initializer).source
+        name = stmt.name.lexeme
+
+        if not self.scopes:
+            self.emit(f"_g[{name!r}] = {value}")
+            return
+
+        # redeclaring a variable in the same block reuses its Python name
+        if (local := self.scopes[-1].get(name)) is None:
+            self._names += 1
+            local = self.scopes[-1][name] = f"l{self._names}_{name}"
+        self.emit(f"{local} = {value}")
+
+    def visitBlockStmt(self, stmt: BlockStmt):
+        if not stmt.statements:
+            return
+
+        # a runtime error is recorded and execution resumes after the block, as
+        # `Interpreter.execute_block` does
+        self.emit("try:")
+        self._depth += 1
+        self.scopes.append({})
+        for s in stmt.statements:
+            s.accept(self)
+        self.scopes.pop()
+        self._depth -= 1
+        self.emit_handler()
+
+    def visitIfStmt(self, stmt: IfStmt):
+        self.emit(f"if {self.truthy(self.evaluate(stmt.condition))}:")
+        self.emit_body(stmt.then_branch)
+        if stmt.else_branch is not None:
+            self.emit("else:")
+            self.emit_body(stmt.else_branch)
+
+    def visitWhileStmt(self, stmt: WhileStmt):
+        self.emit(f"while {self.truthy(self.evaluate(stmt.condition))}:")
+        self.emit_body(stmt.body)
+
+    def visitForStmt(self, stmt: ForStmt):
+        # an error in the initializer or condition ends the loop only if there is an
+        # initializer, an error in the body or increment ends the iteration only if there is
+        # an increment
+        if stmt.initializer is not None:
+            self.emit("try:")
+            self._depth += 1
+        self.scopes.append({})
+        if stmt.initializer is not None:
+            stmt.initializer.accept(self)
+
+        self.emit(f"while {self.truthy(self.evaluate(stmt.condition))}:")
+        if stmt.increment is None:
+            self.emit_body(stmt.body)
+        else:
+            self._depth += 1
+            self.emit("try:")
+            self.emit_body(stmt.body)
+            self.emit(INDENT + self.evaluate(stmt.increment).source)
+            self.emit_handler()
+            self._depth -= 1
+        self.scopes.pop()
+
+        if stmt.initializer is not None:
+            self._depth -= 1
+            self.emit_handler()
+
+    def emit_handler(self):
+        self.emit("except _RuntimeError as _e:")
+        self.emit(INDENT + "_errors.append(_e)")
+
+    def visitLiteralExpr(self, expr: LiteralExpr) -> Code:
+        value = expr.value
+        if isinstance(value, float) and not math.isfinite(value):
+            self.constants.append(value)
+            return Code(f"_C[{len(self.constants) - 1}]", True, float)
+        return Code(repr(value), True, type(value))
+
+    def visitGroupingExpr(self, expr: GroupingExpr) -> Code:
+        return self.evaluate(expr.expression)
+
+    def visitVariableExpr(self, expr: VariableExpr) -> Code:
+        name = expr.name.lexeme
+        if (local := self.lookup(name)) is not None:
+            return Code(local, True)
+        return Code(f"(_g[{name!r}] if {name!r} in _g else _undefined({self.token(expr.name)}))")
+
+    def visitAssignExpr(self, expr: AssignExpr) -> Code:
+        value = self.evaluate(expr.value)
+        name = expr.name.lexeme
+        if (local := self.lookup(name)) is not None:
+            return Code(f"({local} := {value.source})", False, value.type_, True)
+        source = f"_assign({name!r}, {value.source}, {self.token(expr.name)})"
+        return Code(source, False, value.type_, value.assigns)
+
+    def visitLogicalExpr(self, expr: LogicalExpr) -> Code:
+        left, right = self.evaluate(expr.left), self.evaluate(expr.right)
+        if left.simple:
+            value, condition = left.source, self.truthy(left)
+        else:
+            value = self.temp()
+            condition = f"({value} := {left.source})"
+            if left.type_ is not bool:
+                condition += f" is not None and {value} is not False"
+
+        type_ = left.type_ if left.type_ is right.type_ else None
+        assigns = left.assigns or right.assigns
+        if expr.operator.token_type is TokenType.OR:
+            return Code(f"({value} if {condition} else {right.source})", False, type_, assigns)
+        return Code(f"({right.source} if {condition} else {value})", False, type_, assigns)
+
+    def visitUnaryExpr(self, expr: UnaryExpr) -> Code:
+        right = self.evaluate(expr.right)
+
+        match expr.operator.token_type:
+            case TokenType.MINUS:
+                if right.type_ is float:
+                    return Code(f"(-{right.source})", False, float, right.assigns)
+                value, operand = self.operands(right)[0]
+                error = f"_operands({self.token(expr.operator)})"
+                source = f"(-{operand} if type({value}) is float else {error})"
+                return Code(source, False, float, right.assigns)
+            case TokenType.BANG:
+                return Code(f"(not ({self.truthy(right)}))", False, bool, right.assigns)
+            case _:
+                return Code(f"({right.source} and None)", False, None, right.assigns)
+
+    def visitBinaryExpr(self, expr: BinaryExpr) -> Code:
+        left, right = self.evaluate(expr.left), self.evaluate(expr.right)
+        token_type = expr.operator.token_type
+        assigns = left.assigns or right.assigns
+
+        match token_type:
+            case TokenType.EQUAL_EQUAL:
+                return Code(f"({left.source} == {right.source})", False, bool, assigns)
+            case TokenType.BANG_EQUAL:
+                return Code(f"({left.source} != {right.source})", False, bool, assigns)
+
+        known = left.type_ is right.type_ and left.type_ in (float, str)
+        if token_type is TokenType.PLUS and known:
+            return Code(f"({left.source} + {right.source})", False, left.type_, assigns)
+        if token_type in ARITHMETIC and known and left.type_ is float:
+            source = f"({left.source} {ARITHMETIC[token_type]} {right.source})"
+            return Code(source, False, bool if token_type in COMPARISONS else float, assigns)
+
+        # both operands are evaluated, once, before either is checked
+        (a, a_operand), (b, b_operand) = self.operands(left, right)
+        evaluate = "" if a == a_operand and b == b_operand else f"({a}, {b}) and "
+
+        if token_type is TokenType.PLUS:
+            # a string may be a `pylox.rope.Rope`, so only numbers are added inline
+            maybe_float = left.type_ in (float, None) and right.type_ in (float, None)
+            maybe_str = left.type_ in (str, None) and right.type_ in (str, None)
+            if not maybe_float:
+                source = f"_concat({a}, {b})" if maybe_str else f"({evaluate}None)"
+                return Code(source, False, None, assigns)
+            check = " and ".join(
+                f"type({x}) is float"
+                for x, c in ((a_operand, left), (b_operand, right))
+                if c.type_ is None
+            )
+            concat = f"_concat({a_operand}, {b_operand})" if maybe_str else "None"
+            source = f"({a_operand} + {b_operand} if {evaluate}{check} else {concat})"
+            return Code(source, False, None, assigns)
+
+        if token_type is TokenType.SLASH:
+            # dividing by zero gives nan, like `Interpreter`, since inf * x * 0 is always nan
+            value = (
+                f"({a_operand} / {b_operand} if {b_operand} else _inf * {a_operand} * {b_operand})"
+            )
+            type_ = float
+        elif token_type in ARITHMETIC:
+            value = f"{a_operand} {ARITHMETIC[token_type]} {b_operand}"
+            type_ = bool if token_type in COMPARISONS else float
+        else:
+            return Code(f"({evaluate}None)", False, None, assigns)
+
+        checks = [
+            f"type({x}) is float"
+            for x, c in ((a_operand, left), (b_operand, right))
+            if c.type_ is not float
+        ]
+        if not checks:
+            return Code(f"({evaluate}{value})", False, type_, assigns)
+        error = f"_operands({self.token(expr.operator)})"
+        source = f"({value} if {evaluate}{' and '.join(checks)} else {error})"
+        return Code(source, False, type_, assigns)
+
+    def operands(self, *codes: Code) -> list[tuple[str, str]]:
+        """Python evaluating each operand, and Python referring to its value afterwards.
+
+        Anything but a literal, or a local not assigned by a later operand, is stored in a
+        temporary.
+        """
+        operands = []
+        for i, code in enumerate(codes):
+            # a local's type is never known statically, a literal's always is
+            local = code.type_ is None
+            if code.simple and not (local and any(c.assigns for c in codes[i + 1 :])):
+                operands.append((code.source, code.source))
+            else:
+                temp = self.temp()
+                operands.append((f"({temp} := {code.source})", temp))
+        return operands
+
+
+def undefined(token: Token):
+    raise PyloxRuntimeError(token, f"Undefined variable '{token.lexeme}'.")
+
+
+def operands(token: Token):
+    raise PyloxRuntimeError(token, "Operand must be a number.")
+
+
+def assigner(globals_: dict[str, object]) -> Callable[[str, object, Token], object]:
+    """Assignment to an existing global in `globals_`."""
+
+    def assign(name: str, value: object, token: Token) -> object:
+        if name not in globals_:
+            undefined(token)
+        globals_[name] = value
+        return value
+
+    return assign
+
+
+class Translation(NamedTuple):
+    code: CodeType
+    tokens: list[Token]
+    constants: list[object]
+
+
+def translate(stmt: BaseStmt) -> Optional[Translation]:
+    """Compiled Python for a top-level statement, or None if CPython can't compile it."""
+    transpiler = Transpiler()
+    try:
+        code = compile(transpiler.transpile([stmt]), "<lox>", "exec")
+    except (SyntaxError, RecursionError, MemoryError):
+        # too many nested blocks or parentheses for CPython
+        return None
+    return Translation(code, transpiler.tokens, transpiler.constants)
+
+
+class PythonInterpreter:
+    """Execute statements by translating them to Python and running the compiled code objects.
+
+    Behaves exactly like `pylox.interpreter.Interpreter`. Statements nested too deeply for
+    CPython's compiler are run by a `ClosureInterpreter` sharing the same globals instead.
+    """
+
+    def __init__(self, exception_list: ExceptionList, output: Optional[Output] = None):
+        self.environment = Environment()
+        self.exception_list = exception_list
+        self.output = output or BufferedOutput(flush_policy=FlushPolicy.LINE)
+
+        self.namespace = {
+            "_g": self.environment.values,
+            "_print": self.output.write,
+            "_errors": exception_list,
+            "_RuntimeError": PyloxRuntimeError,
+            "_undefined": undefined,
+            "_operands": operands,
+            "_assign": assigner(self.environment.values),
+            "_inf": math.inf,
+            "_concat": concat,
+        }
+        self.fallback = ClosureInterpreter(exception_list, self.output)
+        self.fallback.environment = self.environment
+
+    def set_globals(self, values: dict[str, object]):
+        # the namespace and assignment helper refer to the globals directly
+        self.environment.values = values
+        self.namespace.update(_g=values, _assign=assigner(values))
+
+    @staticmethod
+    def prepare(
+        stmts: Iterable[BaseStmt],
+    ) -> list[tuple[BaseStmt, Optional[Translation]]]:
+        """Translate statements once, for `interpret_prepared` to run any number of times."""
+        return [(stmt, translate(stmt)) for stmt in stmts]
+
+    def interpret(self, stmts: Iterable[BaseStmt]):
+        self.interpret_prepared((stmt, translate(stmt)) for stmt in stmts)
+
+    def interpret_prepared(self, prepared: Iterable[tuple[BaseStmt, Optional[Translation]]]):
+        try:
+            for stmt, translation in prepared:
+                self.execute(stmt, translation)
+        except PyloxRuntimeError as e:
+            self.exception_list.append(e)
+
+    def execute(self, stmt: BaseStmt, translation: Optional[Translation]):
+        if translation is None:
+            self.fallback.compile(stmt)()
+            return
+
+        namespace = dict(self.namespace, _T=translation.tokens, _C=translation.constants)
+        exec(translation.code, namespace)
+        namespace["_lox"]()
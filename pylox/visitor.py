@@ -1,9 +1,30 @@
-from pylox.expr import BaseExpr, BinaryExpr, GroupingExpr, LiteralExpr, UnaryExpr
+from typing import Optional
+
+from pylox.expr import (
+    AssignExpr,
+    BaseExpr,
+    BinaryExpr,
+    GroupingExpr,
+    LiteralExpr,
+    LogicalExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from pylox.stmt import (
+    BaseStmt,
+    BlockStmt,
+    ExpressionStmt,
+    ForStmt,
+    IfStmt,
+    PrintStmt,
+    VarStmt,
+    WhileStmt,
+)
 
 
 class ASTPrinter:
-    def print(self, expr: BaseExpr) -> str:
-        return expr.accept(self)
+    def print(self, node: BaseExpr | BaseStmt) -> str:
+        return node.accept(self)
 
     def visitBinaryExpr(self, expr: BinaryExpr) -> str:
         return self.parenthesize(expr.operator.lexeme, expr.left, expr.right)
@@ -19,5 +40,46 @@ class ASTPrinter:
     def visitUnaryExpr(self, expr: UnaryExpr) -> str:
         return self.parenthesize(expr.operator.lexeme, expr.right)
 
-    def parenthesize(self, name: str, *exprs: list[BaseExpr]) -> str:
-        return f"({name} {' '.join((expr.accept(self) for expr in exprs))})"
+    def visitVariableExpr(self, expr: VariableExpr) -> str:
+        return expr.name.lexeme
+
+    def visitAssignExpr(self, expr: AssignExpr) -> str:
+        return self.parenthesize(f"= {expr.name.lexeme}", expr.value)
+
+    def visitLogicalExpr(self, expr: LogicalExpr) -> str:
+        return self.parenthesize(expr.operator.lexeme, expr.left, expr.right)
+
+    def visitExpressionStmt(self, stmt: ExpressionStmt) -> str:
+        return self.parenthesize(";", stmt.expression)
+
+    def visitPrintStmt(self, stmt: PrintStmt) -> str:
+        return self.parenthesize("print", stmt.expression)
+
+    def visitVarStmt(self, stmt: VarStmt) -> str:
+        return self.parenthesize(f"var {stmt.name.lexeme}", stmt.initializer)
+
+    def visitBlockStmt(self, stmt: BlockStmt) -> str:
+        return self.parenthesize("block", *stmt.statements)
+
+    def visitIfStmt(self, stmt: IfStmt) -> str:
+        return self.parenthesize("if", stmt.condition, stmt.then_branch, stmt.else_branch)
+
+    def visitWhileStmt(self, stmt: WhileStmt) -> str:
+        return self.parenthesize("while", stmt.condition, stmt.body)
+
+    def visitForStmt(self, stmt: ForStmt) -> str:
+        return self.parenthesize(
+            "for", stmt.initializer, stmt.condition, stmt.increment, stmt.body, keep_missing=True
+        )
+
+    def parenthesize(
+        self, name: str, *nodes: Optional[BaseExpr | BaseStmt], keep_missing: bool = False
+    ) -> str:
+        # missing optional parts are left out, unless their position matters
+        parts = [name]
+        for node in nodes:
+            if node is not None:
+                parts.append(node.accept(self))
+            elif keep_missing:
+                parts.append("()")
+        return f"({' '.join(parts)})"
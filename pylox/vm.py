@@ -0,0 +1,255 @@
+import math
+from typing import Iterable, Optional
+
+from pylox.chunk import Chunk, OpCode
+from pylox.compiler import Compiler
+from pylox.exceptions import ExceptionList, PyloxRuntimeError
+from pylox.output import BufferedOutput, FlushPolicy, Output
+from pylox.rope import concat
+from pylox.stmt import BaseStmt
+from pylox.token import Token, TokenType
+
+# plain int copies of the opcodes, enum attribute access is too slow for the dispatch loop
+CONSTANT = OpCode.CONSTANT.value
+NIL = OpCode.NIL.value
+TRUE = OpCode.TRUE.value
+FALSE = OpCode.FALSE.value
+POP = OpCode.POP.value
+DEFINE_GLOBAL = OpCode.DEFINE_GLOBAL.value
+GET_GLOBAL = OpCode.GET_GLOBAL.value
+SET_GLOBAL = OpCode.SET_GLOBAL.value
+DEFINE_LOCAL = OpCode.DEFINE_LOCAL.value
+GET_LOCAL = OpCode.GET_LOCAL.value
+SET_LOCAL = OpCode.SET_LOCAL.value
+EQUAL = OpCode.EQUAL.value
+NOT_EQUAL = OpCode.NOT_EQUAL.value
+GREATER = OpCode.GREATER.value
+GREATER_EQUAL = OpCode.GREATER_EQUAL.value
+LESS = OpCode.LESS.value
+LESS_EQUAL = OpCode.LESS_EQUAL.value
+ADD = OpCode.ADD.value
+SUBTRACT = OpCode.SUBTRACT.value
+MULTIPLY = OpCode.MULTIPLY.value
+DIVIDE = OpCode.DIVIDE.value
+NOT = OpCode.NOT.value
+NEGATE = OpCode.NEGATE.value
+PRINT = OpCode.PRINT.value
+JUMP = OpCode.JUMP.value
+JUMP_IF_FALSE = OpCode.JUMP_IF_FALSE.value
+JUMP_IF_TRUE = OpCode.JUMP_IF_TRUE.value
+POP_JUMP_IF_FALSE = OpCode.POP_JUMP_IF_FALSE.value
+LOOP = OpCode.LOOP.value
+RETURN = OpCode.RETURN.value
+
+# the operator token an instruction was compiled from, to report runtime errors with
+OPERATOR_TOKENS = {
+    GREATER: (TokenType.GREATER, ">"),
+    GREATER_EQUAL: (TokenType.GREATER_EQUAL, ">="),
+    LESS: (TokenType.LESS, "<"),
+    LESS_EQUAL: (TokenType.LESS_EQUAL, "<="),
+    SUBTRACT: (TokenType.MINUS, "-"),
+    MULTIPLY: (TokenType.STAR, "*"),
+    DIVIDE: (TokenType.SLASH, "/"),
+    NEGATE: (TokenType.MINUS, "-"),
+}
+
+
+class VM:
+    """Execute statements compiled to bytecode by `pylox.compiler.Compiler`.
+
+    Each top-level statement is compiled into its own chunk and run by a single dispatch loop
+    over a value stack. Behaves exactly like `pylox.interpreter.Interpreter`.
+    """
+
+    def __init__(self, exception_list: ExceptionList, output: Optional[Output] = None):
+        self.globals: dict[str, object] = {}
+        self.exception_list = exception_list
+        self.output = output or BufferedOutput(flush_policy=FlushPolicy.LINE)
+
+    @staticmethod
+    def prepare(stmts: Iterable[BaseStmt]) -> list[Chunk]:
+        """Compile statements once, for `interpret_prepared` to run any number of times."""
+        return [Compiler().compile([stmt]) for stmt in stmts]
+
+    def interpret(self, stmts: Iterable[BaseStmt]):
+        self.interpret_prepared(Compiler().compile([stmt]) for stmt in stmts)
+
+    def interpret_prepared(self, chunks: Iterable[Chunk]):
+        try:
+            for chunk in chunks:
+                self.run(chunk)
+        except PyloxRuntimeError as e:
+            self.exception_list.append(e)
+
+    def set_globals(self, values: dict[str, object]):
+        self.globals = values
+
+    def run(self, chunk: Chunk):
+        code, constants, globals_ = chunk.code, chunk.constants, self.globals
+        locals_: list[object] = [None] * chunk.local_count
+        stack: list[object] = []
+        push, pop = stack.append, stack.pop
+        write = self.output.write
+
+        ip = 0
+        while True:
+            try:
+                while True:
+                    op = code[ip]
+                    if op == GET_LOCAL:
+                        push(locals_[code[ip + 1] << 8 | code[ip + 2]])
+                        ip += 3
+                    elif op == CONSTANT:
+                        push(constants[code[ip + 1] << 8 | code[ip + 2]])
+                        ip += 3
+                    elif op == GET_GLOBAL:
+                        name = constants[code[ip + 1] << 8 | code[ip + 2]]
+                        if name not in globals_:
+                            raise self.undefined_variable(chunk, ip, name)
+                        push(globals_[name])
+                        ip += 3
+                    elif op == POP_JUMP_IF_FALSE:
+                        if (value := pop()) is None or value is False:
+                            ip += 3 + (code[ip + 1] << 8 | code[ip + 2])
+                        else:
+                            ip += 3
+                    elif op == SET_LOCAL:
+                        locals_[code[ip + 1] << 8 | code[ip + 2]] = stack[-1]
+                        ip += 3
+                    elif op == POP:
+                        pop()
+                        ip += 1
+                    elif op == ADD:
+                        b, a = pop(), pop()
+                        if type(a) is float and type(b) is float:
+                            push(a + b)
+                        else:
+                            push(concat(a, b))
+                        ip += 1
+                    elif op == LESS:
+                        b, a = pop(), pop()
+                        if type(a) is not float or type(b) is not float:
+                            raise self.operand_error(chunk, ip)
+                        push(a < b)
+                        ip += 1
+                    elif op == SUBTRACT:
+                        b, a = pop(), pop()
+                        if type(a) is not float or type(b) is not float:
+                            raise self.operand_error(chunk, ip)
+                        push(a - b)
+                        ip += 1
+                    elif op == MULTIPLY:
+                        b, a = pop(), pop()
+                        if type(a) is not float or type(b) is not float:
+                            raise self.operand_error(chunk, ip)
+                        push(a * b)
+                        ip += 1
+                    elif op == LOOP:
+                        ip -= code[ip + 1] << 8 | code[ip + 2]
+                        ip += 3
+                    elif op == DEFINE_LOCAL:
+                        locals_[code[ip + 1] << 8 | code[ip + 2]] = pop()
+                        ip += 3
+                    elif op == SET_GLOBAL:
+                        name = constants[code[ip + 1] << 8 | code[ip + 2]]
+                        if name not in globals_:
+                            raise self.undefined_variable(chunk, ip, name)
+                        globals_[name] = stack[-1]
+                        ip += 3
+                    elif op == GREATER:
+                        b, a = pop(), pop()
+                        if type(a) is not float or type(b) is not float:
+                            raise self.operand_error(chunk, ip)
+                        push(a > b)
+                        ip += 1
+                    elif op == GREATER_EQUAL:
+                        b, a = pop(), pop()
+                        if type(a) is not float or type(b) is not float:
+                            raise self.operand_error(chunk, ip)
+                        push(a >= b)
+                        ip += 1
+                    elif op == LESS_EQUAL:
+                        b, a = pop(), pop()
+                        if type(a) is not float or type(b) is not float:
+                            raise self.operand_error(chunk, ip)
+                        push(a <= b)
+                        ip += 1
+                    elif op == DIVIDE:
+                        b, a = pop(), pop()
+                        if type(a) is not float or type(b) is not float:
+                            raise self.operand_error(chunk, ip)
+                        try:
+                            push(a / b)
+                        except ZeroDivisionError:
+                            push(math.inf * a * b)
+                        ip += 1
+                    elif op == EQUAL:
+                        b, a = pop(), pop()
+                        push(a == b)
+                        ip += 1
+                    elif op == NOT_EQUAL:
+                        b, a = pop(), pop()
+                        push(a != b)
+                        ip += 1
+                    elif op == JUMP:
+                        ip += 3 + (code[ip + 1] << 8 | code[ip + 2])
+                    elif op == JUMP_IF_FALSE:
+                        if (value := stack[-1]) is None or value is False:
+                            ip += 3 + (code[ip + 1] << 8 | code[ip + 2])
+                        else:
+                            ip += 3
+                    elif op == JUMP_IF_TRUE:
+                        if (value := stack[-1]) is None or value is False:
+                            ip += 3
+                        else:
+                            ip += 3 + (code[ip + 1] << 8 | code[ip + 2])
+                    elif op == NOT:
+                        push((value := pop()) is None or value is False)
+                        ip += 1
+                    elif op == NEGATE:
+                        if type(value := stack[-1]) is not float:
+                            raise self.operand_error(chunk, ip)
+                        stack[-1] = -value
+                        ip += 1
+                    elif op == TRUE:
+                        push(True)
+                        ip += 1
+                    elif op == FALSE:
+                        push(False)
+                        ip += 1
+                    elif op == NIL:
+                        push(None)
+                        ip += 1
+                    elif op == PRINT:
+                        write(pop())
+                        ip += 1
+                    elif op == DEFINE_GLOBAL:
+                        globals_[constants[code[ip + 1] << 8 | code[ip + 2]]] = pop()
+                        ip += 3
+                    elif op == RETURN:
+                        return
+                    else:
+                        raise RuntimeError(f"Unknown opcode {op} at {ip}.")
+            except PyloxRuntimeError as e:
+                # resume after the innermost block the error was raised in, as
+                # `Interpreter.execute_block` does, the first containing handler is innermost
+                for start, end in chunk.handlers:
+                    if start <= ip < end:
+                        break
+                else:
+                    raise
+
+                self.exception_list.append(e)
+                stack.clear()
+                ip = end
+
+    @staticmethod
+    def operand_error(chunk: Chunk, ip: int) -> PyloxRuntimeError:
+        token_type, lexeme = OPERATOR_TOKENS[chunk.code[ip]]
+        token = Token(token_type, lexeme, None, chunk.lineno(ip))
+        return PyloxRuntimeError(token, "Operand must be a number.")
+
+    @staticmethod
+    def undefined_variable(chunk: Chunk, ip: int, name: str) -> PyloxRuntimeError:
+        token = Token(TokenType.IDENTIFIER, name, None, chunk.lineno(ip))
+        return PyloxRuntimeError(token, f"Undefined variable '{name}'.")